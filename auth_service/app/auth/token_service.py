@@ -2,6 +2,8 @@
 Сервис для управления JWT токенами и их инвалидацией через Redis
 """
 
+import hashlib
+import json
 from datetime import datetime, timezone
 
 from jose import jwt
@@ -48,6 +50,16 @@ class TokenService:
             await self.redis.setex(key, ttl, "1")
             logger.info(f"Токен добавлен в blacklist: {key} (TTL: {ttl}s)")
 
+            # BFF проверяет access-токены сам и узнает об отзыве из ленты
+            if token_type == "access":
+                digest = token_hash(token)
+                await self._publish_revocation(
+                    settings.REVOKED_TOKENS_KEY,
+                    digest,
+                    exp,
+                    {"token_hash": digest, "exp": exp},
+                )
+
             return True
 
         except Exception as e:
@@ -87,7 +99,16 @@ class TokenService:
         """
         try:
             key = f"blacklist:user:{str(user_id)}:all"
-            await self.redis.setex(key, 7 * 24 * 60 * 60, "1")
+            ttl = 7 * 24 * 60 * 60
+            await self.redis.setex(key, ttl, "1")
+
+            until = int(datetime.now(timezone.utc).timestamp()) + ttl
+            await self._publish_revocation(
+                settings.REVOKED_USERS_KEY,
+                str(user_id),
+                until,
+                {"user_id": str(user_id), "until": until},
+            )
 
             logger.info(f"Все токены пользователя {user_id} инвалидированы")
             return True
@@ -167,3 +188,22 @@ class TokenService:
         except Exception as e:
             logger.error(f"Ошибка при удалении refresh token: {e}")
             return False
+
+    async def _publish_revocation(
+        self, key: str, member: str, until: int, event: dict
+    ) -> None:
+        """
+        Отзыв попадает в множество, которое BFF читает при подписке, и в канал
+        Истекшие записи из множества выбрасываются здесь же
+        """
+        now = int(datetime.now(timezone.utc).timestamp())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(key, {member: until})
+            pipe.zremrangebyscore(key, "-inf", now)
+            pipe.publish(settings.REVOCATION_CHANNEL, json.dumps(event))
+            await pipe.execute()
+
+
+def token_hash(token: str) -> str:
+    """Идентификатор токена в ленте отзывов: сам токен за пределы сервиса не уходит"""
+    return hashlib.sha256(token.encode()).hexdigest()
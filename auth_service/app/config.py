@@ -23,6 +23,11 @@ class Settings(BaseSettings):
 
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
+    # Лента отзывов токенов для BFF: канал pub/sub и множества Redis
+    # с отозванными access-токенами (по sha256) и пользователями
+    REVOCATION_CHANNEL: str = "auth:revocations"
+    REVOKED_TOKENS_KEY: str = "auth:revoked_tokens"
+    REVOKED_USERS_KEY: str = "auth:revoked_users"
 
     TEST_DATABASE_URL: str = "sqlite+aiosqlite:///:memory:"
 
@@ -1,9 +1,11 @@
 from app.api.api import router as api_router
 from app.api.auth import router as auth_router
+from app.api.diagnostics import router as diagnostics_router
 from fastapi import APIRouter
 
 router = APIRouter()
 router.include_router(api_router)
 router.include_router(auth_router)
+router.include_router(diagnostics_router)
 
 __all__ = ["router"]
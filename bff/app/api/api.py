@@ -1,145 +1,723 @@
+import asyncio
+import base64
 import json
+from datetime import datetime
+from functools import partial
+from typing import AsyncIterator
 from uuid import UUID
 
-from app.core.http_client import HTTPXClient
-from app.dao.database import get_async_session
+from app.core.downstream import llm_service_client
+from app.core.single_flight import SingleFlight
+from app.core.summary_cache import SummaryCache
+from app.core.task_events import FINAL_STATUSES, TaskStatusHub, TaskSubscription
+from app.dao.database import async_session_maker, get_async_session
 from app.dao.models import Article, UserArticles
-from app.dependencies.auth_dep import get_current_user
-from app.dependencies.redis_dep import get_redis_client
-from app.services.auth.schemas import SUserInfo
-from app.services.habr_adapter.api import get_article_from_habr
-from app.services.habr_adapter.schemas import SArticleParseRequest
-from app.services.llm_service.api import send_article_to_queue
+from app.dependencies.auth_dep import get_current_claims
+from app.dependencies.redis_dep import get_redis_client, get_summary_cache
+from app.services.auth.schemas import SUserClaims
+from app.services.habr_adapter.api import get_article_from_habr, get_articles_from_habr
+from app.services.habr_adapter.content import content_diff_ratio
+from app.services.habr_adapter.schemas import (
+    SArticleBatchRequest,
+    SArticleParsed,
+    SArticleProcessRequest,
+)
+from app.services.habr_adapter.urls import canonical_url
+from app.services.llm_service.api import send_article_to_queue, send_articles_to_queue
 from config import settings
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import exists, literal, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/api", tags=["bff"])
 
+# Поля статьи, доступные в списке через fields=; block_hashes — служебные
+ARTICLE_LIST_FIELDS = (
+    "id",
+    "url",
+    "task_id",
+    "created_at",
+    "updated_at",
+    "parsed_content",
+    "content_hash",
+    "content_diff_ratio",
+)
+
+# Одновременные отправки одной статьи в процессе
+article_flight = SingleFlight()
+
+# Статья пакета не создана из-за сбоя Redis, очереди или базы, а не из-за текста
+BATCH_RETRY_ERROR = "Не удалось поставить статью в очередь, повторите запрос"
+
 
 @router.post("/articles/process")
 async def process_article(
-    body: SArticleParseRequest,
-    current_user: SUserInfo = Depends(get_current_user),
+    body: SArticleProcessRequest,
+    current_user: SUserClaims = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
     redis_client=Depends(get_redis_client),
+    summary_cache: SummaryCache = Depends(get_summary_cache),
 ):
     try:
         user_uuid = UUID(current_user.id)
-        url_str = str(body.url)
+        # Все формы ссылки на статью сводятся к одной записи и ключу кэша
+        url_str = canonical_url(str(body.url))
+
+        # Статья и связь с пользователем — один запрос к базе
+        row = await _link_article(session, user_uuid, url_str)
+        existed = row is not None
+        if not existed:
+            # Одна загрузка и одна задача LLM на все одновременные отправки ссылки
+            await article_flight.run(
+                url_str, lambda: _create_article_once(redis_client, url_str)
+            )
+            row = await _link_article(session, user_uuid, url_str)
+        await session.commit()
+
+        task_id, summary = row.task_id, row.parsed_content
+        changes = {}
+        # Только что загруженную статью перечитывать незачем
+        if body.refresh and existed:
+            article_db = await session.get(Article, row.id)
+            changes = await _refresh_article(session, summary_cache, article_db)
+            task_id, summary = article_db.task_id, article_db.parsed_content
+
+        if summary:
+            return {"task_id": task_id, "status": "done", "summary": summary, **changes}
+        return {"task_id": task_id, "status": "queued", **changes}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Ошибка при обработке статьи")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/articles/process/batch")
+async def process_articles_batch(
+    body: SArticleBatchRequest,
+    current_user: SUserClaims = Depends(get_current_claims),
+    session: AsyncSession = Depends(get_async_session),
+    redis_client=Depends(get_redis_client),
+):
+    """
+    Отправка списка статей: существующие записи находятся одним запросом,
+    новые разбираются одним пакетом в habr_adapter, ставятся в очередь одной
+    серией и вставляются вместе со связями многострочными INSERT. Создание
+    идет под теми же блокировками Redis, что и у одиночной отправки
+    Возвращает статус по каждому URL из запроса
+    """
+    if len(body.urls) > settings.BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не больше {settings.BATCH_MAX_URLS} URL в одном запросе",
+        )
+    user_uuid = UUID(current_user.id)
+    # Исходный URL -> канонический; повторы в списке сводятся к одной статье
+    requested = {str(url): canonical_url(str(url)) for url in body.urls}
+    urls = list(dict.fromkeys(requested.values()))
+
+    rows = await _article_rows(session, urls)
+    missing = [url for url in urls if url not in rows]
+
+    contended = []
+    # URL -> причина, по которой статья не создана; остальные статьи пакета
+    # все равно привязываются к пользователю
+    errors: dict[str, str] = {}
+    if missing:
+        # Те же блокировки, что у одиночной отправки: статью, которую сейчас
+        # создает другой запрос, второй раз не разбираем и не публикуем
+        try:
+            locks, contended = await _try_lock_articles(redis_client, missing)
+        except Exception as e:
+            logger.error(f"Не удалось взять блокировки статей пакета: {e}")
+            locks = {}
+            errors.update(dict.fromkeys(missing, BATCH_RETRY_ERROR))
+        try:
+            created = await _create_batch_articles(session, redis_client, list(locks))
+            await session.commit()
+            rows.update(created)
+        except Exception as e:
+            logger.error(f"Не удалось создать статьи пакета: {e}")
+            await session.rollback()
+            errors.update(dict.fromkeys(locks, BATCH_RETRY_ERROR))
+        finally:
+            await _release_locks(locks)
+
+    if contended:
+        # Свои блокировки уже отпущены: два пакета не ждут друг друга по кругу
+        await asyncio.gather(
+            *(
+                article_flight.run(
+                    url, partial(_create_article_once, redis_client, url)
+                )
+                for url in contended
+            ),
+            return_exceptions=True,
+        )
+        rows.update(await _article_rows(session, contended))
+
+    if rows:
+        links = [{"user_id": user_uuid, "article_id": row.id} for row in rows.values()]
+        await session.execute(
+            pg_insert(UserArticles)
+            .values(links)
+            .on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+        )
+    await session.commit()
+
+    items = {}
+    for url, canonical in requested.items():
+        row = rows.get(canonical)
+        if row is None:
+            items[url] = {
+                "url": canonical,
+                "status": "failed",
+                "error": errors.get(canonical, "Не удалось получить текст статьи"),
+            }
+        elif row.parsed_content:
+            items[url] = {"url": canonical, "task_id": row.task_id, "status": "done"}
+        else:
+            items[url] = {"url": canonical, "task_id": row.task_id, "status": "queued"}
+    return {"items": items}
+
+
+async def _article_rows(session: AsyncSession, urls: list[str]) -> dict:
+    result = await session.execute(
+        select(Article.id, Article.url, Article.task_id, Article.parsed_content).where(
+            Article.url.in_(urls)
+        )
+    )
+    return {row.url: row for row in result.all()}
+
+
+async def _create_batch_articles(
+    session: AsyncSession, redis_client, urls: list[str]
+) -> dict:
+    """Создает записи статей, блокировки которых взял пакетный запрос"""
+    if not urls:
+        return {}
+    # Пока брали блокировки, часть статей мог создать другой запрос
+    rows = await _article_rows(session, urls)
+    missing = [url for url in urls if url not in rows]
+    if not missing:
+        return rows
+
+    new_rows = []
+    # Статьи, заранее поставленные обходчиком лент habr_adapter
+    prewarm = await redis_client.mget([f"habr:prewarm:{url}" for url in missing])
+    to_parse = []
+    for url, task_id in zip(missing, prewarm):
+        if task_id:
+            new_rows.append(_article_row(url, task_id))
+        else:
+            to_parse.append(url)
+    new_rows.extend(await _queue_parsed_articles(session, to_parse))
+
+    if new_rows:
+        # Строку, вставленную параллельным запросом, ON CONFLICT вернет как есть
+        insert_stmt = pg_insert(Article).values(new_rows)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Article.url], set_={"url": insert_stmt.excluded.url}
+        ).returning(Article.id, Article.url, Article.task_id, Article.parsed_content)
+        inserted = await session.execute(insert_stmt)
+        rows.update({row.url: row for row in inserted.all()})
+    return rows
+
+
+def _article_lock(redis_client, url_str: str, timeout: float):
+    return redis_client.lock(
+        f"lock:article:{url_str}",
+        timeout=timeout,
+        blocking_timeout=settings.ARTICLE_LOCK_WAIT,
+    )
+
+
+async def _try_lock_articles(redis_client, urls: list[str]) -> tuple[dict, list[str]]:
+    """Берет блокировки создания статей без ожидания; занятые URL — отдельно"""
+    locks = {
+        url: _article_lock(redis_client, url, settings.ARTICLE_BATCH_LOCK_TIMEOUT)
+        for url in urls
+    }
+    acquired = await asyncio.gather(
+        *(lock.acquire(blocking=False) for lock in locks.values())
+    )
+    owned = {url: lock for (url, lock), ok in zip(locks.items(), acquired) if ok}
+    return owned, [url for url in urls if url not in owned]
+
+
+async def _release_locks(locks: dict) -> None:
+    results = await asyncio.gather(
+        *(lock.release() for lock in locks.values()), return_exceptions=True
+    )
+    for url, result in zip(locks, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Блокировка статьи {url} истекла раньше времени: {result}")
+
+
+async def _queue_parsed_articles(session: AsyncSession, urls: list[str]) -> list[dict]:
+    """Разбирает статьи и ставит в очередь те, чей текст еще не суммаризирован"""
+    parsed = await get_articles_from_habr(urls)
+    articles = {url: article for url, article in parsed.items() if article.text}
+
+    hashes = {
+        article.content_hash for article in articles.values() if article.content_hash
+    }
+    same_content = {}
+    if hashes:
+        result = await session.execute(
+            select(Article.content_hash, Article.task_id, Article.parsed_content).where(
+                Article.content_hash.in_(hashes), Article.parsed_content.is_not(None)
+            )
+        )
+        same_content = {row.content_hash: row for row in result.all()}
+
+    to_queue = [
+        url
+        for url, article in articles.items()
+        if article.content_hash not in same_content
+    ]
+    task_ids = {}
+    if to_queue:
+        tasks = await send_articles_to_queue([articles[url] for url in to_queue])
+        task_ids = {url: task.task_id for url, task in zip(to_queue, tasks)}
+
+    rows = []
+    for url, article in articles.items():
+        reused = same_content.get(article.content_hash)
+        rows.append(
+            _article_row(
+                url,
+                task_ids[url] if reused is None else reused.task_id,
+                parsed_content=None if reused is None else reused.parsed_content,
+                article=article,
+            )
+        )
+    return rows
+
+
+def _article_row(
+    url: str,
+    task_id: str,
+    parsed_content: dict | None = None,
+    article: SArticleParsed | None = None,
+) -> dict:
+    # В многострочном INSERT у всех строк одинаковые колонки; None в JSON —
+    # это 'null', а не NULL, поэтому пустые значения передаются как null()
+    return {
+        "url": url,
+        "task_id": task_id,
+        "parsed_content": null() if parsed_content is None else parsed_content,
+        "content_hash": article.content_hash if article else None,
+        "block_hashes": article.block_hashes if article else null(),
+    }
+
+
+async def _get_article(session: AsyncSession, url_str: str) -> Article | None:
+    result = await session.execute(select(Article).where(Article.url == url_str))
+    return result.scalar_one_or_none()
+
+
+async def _link_article(session: AsyncSession, user_uuid: UUID, url_str: str):
+    """
+    Находит статью и привязывает ее к пользователю одним запросом (CTE с
+    INSERT ... ON CONFLICT DO NOTHING); None, если статьи еще нет
+    """
+    article = (
+        select(Article.id, Article.task_id, Article.parsed_content)
+        .where(Article.url == url_str)
+        .cte("article")
+    )
+    link = (
+        pg_insert(UserArticles)
+        .from_select(
+            ["user_id", "article_id"],
+            select(literal(user_uuid, PG_UUID(as_uuid=True)), article.c.id),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "article_id"])
+        .returning(UserArticles.article_id)
+        .cte("link")
+    )
+    stmt = select(
+        article.c.id,
+        article.c.task_id,
+        article.c.parsed_content,
+        exists(select(link.c.article_id)).label("linked"),
+    )
+    return (await session.execute(stmt)).one_or_none()
+
 
-        stmt = select(Article).where(Article.url == url_str)
-        result = await session.execute(stmt)
-        article_db = result.scalar_one_or_none()
+async def _create_article_once(redis_client, url_str: str) -> None:
+    """
+    Создает запись статьи под блокировкой Redis, общей для всех экземпляров BFF
+    Работает в своей сессии: ее результат ждут запросы с разными сессиями
+    """
+    lock = _article_lock(redis_client, url_str, settings.ARTICLE_LOCK_TIMEOUT)
+    async with lock, async_session_maker() as session:
+        # Пока ждали блокировку, статью мог создать другой экземпляр
+        if await _get_article(session, url_str):
+            return
 
-        if not article_db:
+        # Статью мог заранее поставить в очередь обходчик лент habr_adapter
+        prewarm_task_id = await redis_client.get(f"habr:prewarm:{url_str}")
+        if prewarm_task_id:
+            row = _article_row(url_str, prewarm_task_id)
+        else:
             article = await get_article_from_habr(url_str)
             if not article or not article.text:
                 raise HTTPException(
                     status_code=400, detail="Не удалось получить текст статьи"
                 )
+            row = await _new_article_row(session, url_str, article)
+        await session.execute(
+            pg_insert(Article)
+            .values(row)
+            .on_conflict_do_nothing(index_elements=[Article.url])
+        )
+        await session.commit()
+
 
-            task = await send_article_to_queue(article)
-            article_db = Article(url=url_str, task_id=task.task_id)
-            session.add(article_db)
-            await session.flush()
+async def _new_article_row(
+    session: AsyncSession, url_str: str, article: SArticleParsed
+) -> dict:
+    """Новая статья; если такой же текст уже суммаризирован, LLM не вызывается"""
+    same_content = None
+    if article.content_hash:
+        same_content = (
+            await session.execute(
+                select(Article.task_id, Article.parsed_content)
+                .where(
+                    Article.content_hash == article.content_hash,
+                    Article.parsed_content.is_not(None),
+                )
+                .limit(1)
+            )
+        ).one_or_none()
 
-        link_stmt = select(UserArticles).where(
-            UserArticles.user_id == user_uuid,
-            UserArticles.article_id == article_db.id,
+    if same_content:
+        return _article_row(
+            url_str,
+            same_content.task_id,
+            parsed_content=same_content.parsed_content,
+            article=article,
         )
-        link_res = await session.execute(link_stmt)
-        link = link_res.scalar_one_or_none()
+    task = await send_article_to_queue(article)
+    return _article_row(url_str, task.task_id, article=article)
 
-        if not link:
-            link = UserArticles(user_id=user_uuid, article_id=article_db.id)
-            session.add(link)
-            await session.commit()
 
-        cached_result = await redis_client.get(f"article:{url_str}")
-        if cached_result:
-            return {
-                "task_id": article_db.task_id,
-                "status": "done",
-                "summary": json.loads(cached_result),
-            }
+async def _refresh_article(
+    session: AsyncSession, summary_cache: SummaryCache, article_db: Article
+) -> dict:
+    """
+    Перечитывает статью и решает, нужна ли новая суммаризация
+    Хэши в записи относятся к версии, по которой сделано резюме, поэтому
+    мелкие правки копятся и в сумме тоже приводят к пересчету
+    """
+    article = await get_article_from_habr(article_db.url)
+    if not article or not article.text:
+        raise HTTPException(status_code=400, detail="Не удалось получить текст статьи")
 
-        if article_db.parsed_content:
-            await redis_client.setex(
-                f"article:{url_str}", 3600, json.dumps(article_db.parsed_content)
-            )
-            return {
-                "task_id": article_db.task_id,
-                "status": "done",
-                "summary": article_db.parsed_content,
-            }
+    if article.content_hash and article.content_hash == article_db.content_hash:
+        return {"content_changed": False, "diff_ratio": 0.0}
 
-        return {"task_id": article_db.task_id, "status": "queued"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception("Ошибка при обработке статьи")
-        raise HTTPException(status_code=500, detail=str(e))
+    diff_ratio = content_diff_ratio(article_db.block_hashes or [], article.block_hashes)
+    article_db.content_diff_ratio = diff_ratio
+    if diff_ratio < settings.RESUMMARIZE_MIN_DIFF_RATIO:
+        await session.commit()
+        return {"content_changed": True, "diff_ratio": diff_ratio}
+
+    task = await send_article_to_queue(article)
+    previous_task_id = article_db.task_id
+    article_db.task_id = task.task_id
+    article_db.parsed_content = None
+    article_db.content_hash = article.content_hash
+    article_db.block_hashes = article.block_hashes
+    await session.commit()
+    if previous_task_id:
+        # Старое резюме больше не относится к статье
+        await summary_cache.invalidate(previous_task_id)
+    logger.info(
+        "Статья {} изменилась на {:.0%}, резюме пересчитывается", article_db.url, diff_ratio
+    )
+    return {"content_changed": True, "diff_ratio": diff_ratio}
 
 
 @router.get("/articles/result/{task_id}")
 async def get_article_result(
     task_id: str,
-    current_user: SUserInfo = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
-    redis_client=Depends(get_redis_client),
+    current_user: SUserClaims = Depends(get_current_claims),
+    summary_cache: SummaryCache = Depends(get_summary_cache),
 ):
     """Получить результат обработки статьи по task_id"""
+    return await summary_cache.get(task_id, lambda: _load_task_result(task_id))
 
-    stmt = select(Article).where(Article.task_id == task_id)
-    db_res = await session.execute(stmt)
-    article_db = db_res.scalar_one_or_none()
 
-    if article_db and article_db.parsed_content:
-        await redis_client.setex(
-            f"article:{article_db.url}",
-            3600,
-            json.dumps(article_db.parsed_content),
-        )
-        return {"status": "done", "summary": article_db.parsed_content}
+async def _load_task_result(task_id: str) -> dict:
+    """Результат задачи из записи статьи, а если резюме там еще нет — из llm_service"""
+    summary = await _stored_summary(task_id)
+    if summary:
+        return {"status": "done", "summary": summary}
+
+    result = await _fetch_task_result(task_id)
+    if result.get("status") == "done" and result.get("summary"):
+        await _save_summary(task_id, result["summary"])
+    return result
+
+
+async def _fetch_task_result(task_id: str) -> dict:
+    """Результат задачи в llm_service"""
+    resp = await llm_service_client.request("GET", f"/api/gemini/tasks/{task_id}")
+
+    if resp.status_code == 404:
+        raise HTTPException(status_code=404, detail="Результат не найден")
+
+    resp.raise_for_status()
+    return resp.json()
+
+
+@router.get("/articles/result/{task_id}/stream")
+async def stream_article_result(
+    task_id: str,
+    request: Request,
+    current_user: SUserClaims = Depends(get_current_claims),
+):
+    """
+    Поток статусов задачи (SSE) вместо опроса /articles/result/{task_id}
+    Сначала текущий статус, затем каждый переход до done или failed
+    """
+    hub: TaskStatusHub = request.app.state.task_events
+    summary_cache: SummaryCache = request.app.state.summary_cache
+    return StreamingResponse(
+        _sse_task_events(hub, summary_cache, task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    async with HTTPXClient() as client:
-        resp = await client.request(
-            "GET",
-            f"{settings.LLM_SERVICE_BASE_URL}/api/gemini/tasks/{task_id}",
+
+async def _sse_task_events(
+    hub: TaskStatusHub, summary_cache: SummaryCache, task_id: str
+) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.TASK_STREAM_TIMEOUT
+    async with hub.subscribe([task_id]) as subscription:
+        snapshot = await _task_snapshot(hub, summary_cache, task_id)
+        if snapshot:
+            subscription.queue.put_nowait(snapshot)
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.TASK_STREAM_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                # Комментарий SSE не дает прокси закрыть молчащее соединение
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: status\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            if event.get("status") in FINAL_STATUSES:
+                return
+
+
+@router.websocket("/articles/ws")
+async def article_status_ws(
+    websocket: WebSocket,
+    current_user: SUserClaims = Depends(get_current_claims),
+):
+    """
+    Статусы многих задач по одному соединению
+    Клиент шлет {"subscribe": [task_id, ...]} и {"unsubscribe": [...]},
+    сервер — текущий статус каждой новой задачи и затем ее переходы.
+    На команду другой формы сервер закрывает соединение с кодом 1003
+    """
+    hub: TaskStatusHub = websocket.app.state.task_events
+    summary_cache: SummaryCache = websocket.app.state.summary_cache
+    await websocket.accept()
+    async with hub.subscribe() as subscription:
+        receiver = asyncio.create_task(
+            _receive_ws_commands(websocket, hub, summary_cache, subscription)
         )
+        try:
+            while True:
+                getter = asyncio.create_task(subscription.queue.get())
+                await asyncio.wait(
+                    {receiver, getter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    # Клиент отключился
+                    getter.cancel()
+                    break
+                event = getter.result()
+                await websocket.send_json(event)
+                if event.get("status") in FINAL_STATUSES:
+                    subscription.remove([event["task_id"]])
+        finally:
+            receiver.cancel()
 
-        if resp.status_code == 404:
-            raise HTTPException(status_code=404, detail="Результат не найден")
 
-        resp.raise_for_status()
-        result = resp.json()
+async def _receive_ws_commands(
+    websocket: WebSocket,
+    hub: TaskStatusHub,
+    summary_cache: SummaryCache,
+    subscription: TaskSubscription,
+) -> None:
+    async for frame in websocket.iter_text():
+        command = _parse_ws_command(frame)
+        if command is None:
+            # 1003: сервер не принимает такие данные
+            await websocket.close(code=1003, reason="Некорректная команда")
+            return
+        subscribe, unsubscribe = command
+        subscription.add(subscribe)
+        for task_id in subscribe:
+            snapshot = await _task_snapshot(hub, summary_cache, task_id)
+            if snapshot:
+                subscription.queue.put_nowait(snapshot)
+        subscription.remove(unsubscribe)
+
+
+def _parse_ws_command(frame: str) -> tuple[list[str], list[str]] | None:
+    """Списки task_id из команды клиента; None, если команда не такой формы"""
+    try:
+        command = json.loads(frame)
+    except ValueError:
+        return None
+    if not isinstance(command, dict):
+        return None
+    lists = []
+    for key in ("subscribe", "unsubscribe"):
+        task_ids = command.get(key, [])
+        if not isinstance(task_ids, list) or not all(
+            isinstance(task_id, (str, int)) and not isinstance(task_id, bool)
+            for task_id in task_ids
+        ):
+            return None
+        lists.append([str(task_id) for task_id in task_ids])
+    return lists[0], lists[1]
+
+
+async def _task_snapshot(
+    hub: TaskStatusHub, summary_cache: SummaryCache, task_id: str
+) -> dict | None:
+    """Статус задачи на момент подписки: из кэша, записи статьи или Redis llm_service"""
+    cached = await summary_cache.peek(task_id)
+    if cached:
+        return {"task_id": task_id, **cached}
+    summary = await _stored_summary(task_id)
+    if summary:
+        return {"task_id": task_id, "status": "done", "summary": summary}
+    return await hub.current(task_id)
 
-        if result.get("status") == "done" and article_db:
-            article_db.parsed_content = result.get("summary")
-            await session.commit()
 
-            await redis_client.setex(
-                f"article:{article_db.url}",
-                3600,
-                json.dumps(result.get("summary")),
+async def store_task_result(summary_cache: SummaryCache, event: dict) -> None:
+    """
+    Готовое резюме из уведомления сохраняется так же, как при опросе
+    Вызывается хабом статусов один раз на событие (см. main.py), а не
+    каждым подписчиком: клиенты потока только получают событие
+    """
+    if event.get("status") != "done" or not event.get("summary"):
+        return
+    await _save_summary(event["task_id"], event["summary"])
+    await summary_cache.set(
+        event["task_id"], {"status": "done", "summary": event["summary"]}
+    )
+
+
+async def _stored_summary(task_id: str) -> dict | None:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Article.parsed_content).where(
+                Article.task_id == task_id, Article.parsed_content.is_not(None)
             )
+        )
+        return result.scalars().first()
 
-        return result
+
+async def _save_summary(task_id: str, summary: dict) -> None:
+    """Записывает резюме во все статьи задачи, где его еще нет"""
+    async with async_session_maker() as session:
+        await session.execute(
+            update(Article)
+            .where(Article.task_id == task_id, Article.parsed_content.is_(None))
+            .values(parsed_content=summary)
+        )
+        await session.commit()
 
 
 @router.get("/articles")
 async def get_user_articles(
-    current_user: SUserInfo = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=settings.ARTICLES_PAGE_MAX),
+    cursor: str | None = Query(None, description="next_cursor предыдущей страницы"),
+    fields: str | None = Query(
+        None,
+        description="Поля статьи через запятую; без parsed_content список легче",
+    ),
+    current_user: SUserClaims = Depends(get_current_claims),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Получить все статьи пользователя"""
+    """
+    Статьи пользователя от последних добавленных, страницами по limit
+    Страницы режутся по ключу (время добавления, id связи), а не OFFSET,
+    поэтому глубокие страницы не дороже первой
+    """
     user_uuid = UUID(current_user.id)
+    columns = [getattr(Article, name) for name in _list_fields(fields)]
     stmt = (
-        select(Article).join(UserArticles).where(UserArticles.user_id == user_uuid)
+        select(
+            UserArticles.id.label("link_id"),
+            UserArticles.created_at.label("added_at"),
+            *columns,
+        )
+        .join(Article, Article.id == UserArticles.article_id)
+        .where(UserArticles.user_id == user_uuid)
     )
-    result = await session.execute(stmt)
-    articles = result.scalars().all()
-    return articles
+    if cursor:
+        added_at, link_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(UserArticles.created_at, UserArticles.id) < (added_at, link_id)
+        )
+    stmt = stmt.order_by(UserArticles.created_at.desc(), UserArticles.id.desc())
+
+    # Лишняя строка показывает, есть ли следующая страница
+    rows = (await session.execute(stmt.limit(limit + 1))).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(page[-1].added_at, page[-1].link_id)
+
+    items = []
+    for row in page:
+        item = {column.key: getattr(row, column.key) for column in columns}
+        item["added_at"] = row.added_at
+        items.append(item)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _list_fields(fields: str | None) -> tuple[str, ...]:
+    if fields is None:
+        return ARTICLE_LIST_FIELDS
+    names = tuple(
+        dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())
+    )
+    unknown = [name for name in names if name not in ARTICLE_LIST_FIELDS]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Допустимые поля: {', '.join(ARTICLE_LIST_FIELDS)}",
+        )
+    return names
+
+
+def _encode_cursor(added_at: datetime, link_id: int) -> str:
+    raw = json.dumps([added_at.isoformat(), link_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        added_at, link_id = json.loads(raw)
+        return datetime.fromisoformat(added_at), int(link_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
@@ -54,8 +54,23 @@ async def login_user(
 
 
 @router.post("/logout/")
-async def logout(response: Response):
-    """Выход пользователя из системы"""
+async def logout(
+    response: Response,
+    user_access_token: str = Cookie(None),
+    user_refresh_token: str = Cookie(None),
+    auth_service: AuthServiceProxy = Depends(get_auth_service_proxy),
+):
+    """
+    Выход пользователя из системы
+    BFF проверяет токены сам, поэтому выход обязан пройти через auth-service:
+    иначе отзыв не попадет в ленту и access-токен будет действовать до exp
+    """
+    if user_access_token:
+        try:
+            await auth_service.logout_user(user_access_token, user_refresh_token)
+        except Exception as e:
+            # Куки все равно удаляем, как и сам auth-service при сбое Redis
+            logger.error(f"Logout failed with error: {e}")
     response.delete_cookie("user_access_token")
     response.delete_cookie("user_refresh_token")
     return {"message": "Пользователь успешно вышел из системы"}
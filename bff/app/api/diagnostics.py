@@ -0,0 +1,54 @@
+from app.api.api import article_flight
+from app.core.downstream import DOWNSTREAM_CLIENTS
+from app.dependencies.auth_dep import get_current_admin_user
+from fastapi import APIRouter, Depends, Request
+from publisher import publisher
+
+# Внутренние адреса, размеры пулов и очередей — только администраторам
+router = APIRouter(
+    prefix="/api/diagnostics",
+    tags=["diagnostics"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+
+@router.get("/redis-pool")
+async def redis_pool_stats(request: Request):
+    """Соединения общего пула Redis и ожидание свободного соединения"""
+    return request.app.state.redis_pool.stats()
+
+
+@router.get("/publisher")
+async def publisher_stats():
+    """Опубликованные сообщения и ожидание подтверждений RabbitMQ"""
+    return publisher.stats()
+
+
+@router.get("/downstream")
+async def downstream_stats():
+    """Запросы, повторы и гистограммы задержек по сервисам за BFF"""
+    return {name: client.stats() for name, client in DOWNSTREAM_CLIENTS.items()}
+
+
+@router.get("/single-flight")
+async def single_flight_stats():
+    """Сколько одновременных отправок статей склеено с уже идущими"""
+    return {"articles": article_flight.stats()}
+
+
+@router.get("/task-events")
+async def task_events_stats(request: Request):
+    """Подписки клиентов на статусы задач и полученные из Redis уведомления"""
+    return request.app.state.task_events.stats()
+
+
+@router.get("/summary-cache")
+async def summary_cache_stats(request: Request):
+    """Попадания в LRU процесса и в Redis, ранние обновления и устаревшие ответы"""
+    return request.app.state.summary_cache.stats()
+
+
+@router.get("/token-verifier")
+async def token_verifier_stats(request: Request):
+    """Попадания в кэш проверенных токенов и полученные отзывы"""
+    return request.app.state.token_verifier.stats()
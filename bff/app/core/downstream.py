@@ -0,0 +1,46 @@
+import httpx
+from app.core.http_client import HTTPXClient
+from config import settings
+
+
+def _client(base_url: str, timeout: float, max_connections: int) -> HTTPXClient:
+    return HTTPXClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(timeout, connect=settings.DOWNSTREAM_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=settings.DOWNSTREAM_KEEPALIVE_EXPIRY,
+        ),
+        retries=settings.DOWNSTREAM_RETRIES,
+        retry_backoff=settings.DOWNSTREAM_RETRY_BACKOFF,
+    )
+
+
+# По одному keep-alive клиенту на сервис за BFF; закрываются в lifespan
+habr_adapter_client = _client(
+    settings.HABR_ADAPTER_BASE_URL,
+    settings.HABR_ADAPTER_TIMEOUT,
+    settings.HABR_ADAPTER_MAX_CONNECTIONS,
+)
+llm_service_client = _client(
+    settings.LLM_SERVICE_BASE_URL,
+    settings.LLM_SERVICE_TIMEOUT,
+    settings.LLM_SERVICE_MAX_CONNECTIONS,
+)
+auth_service_client = _client(
+    settings.AUTH_SERVICE_BASE_URL,
+    settings.AUTH_SERVICE_TIMEOUT,
+    settings.AUTH_SERVICE_MAX_CONNECTIONS,
+)
+
+DOWNSTREAM_CLIENTS = {
+    "habr_adapter": habr_adapter_client,
+    "llm_service": llm_service_client,
+    "auth_service": auth_service_client,
+}
+
+
+async def close_downstream_clients() -> None:
+    for client in DOWNSTREAM_CLIENTS.values():
+        await client.close()
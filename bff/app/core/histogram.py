@@ -0,0 +1,51 @@
+import bisect
+
+# Границы корзин в секундах, как у гистограмм Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с фиксированными корзинами"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self._sum += seconds
+        self._max = max(self._max, seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """Верхняя граница корзины, в которую попадает квантиль"""
+        count = sum(self._counts)
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self._max
+
+    def snapshot(self) -> dict:
+        count = sum(self._counts)
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = count
+        return {
+            "count": count,
+            "sum": self._sum,
+            "avg": self._sum / count if count else 0.0,
+            "max": self._max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
@@ -1,25 +1,66 @@
-from typing import Any
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar
+from typing import Any, AsyncIterator
 
 import httpx
+from app.core.cassette import cassette_transport
+from app.core.histogram import LatencyHistogram
 from config import settings
 
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {502, 503, 504}
+# Ошибки, при которых запрос заведомо не дошел до сервиса или соединение
+# оборвалось без ответа. ReadTimeout сюда не входит: сервис мог уже
+# выполнять запрос, и повтор удвоил бы и нагрузку, и время ожидания
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class _DiscardCookieJar(CookieJar):
+    """
+    Клиент общий для всех пользователей: куки из ответов (например, токены
+    после логина) не должны сохраняться и уходить в чужие запросы
+    """
+
+    def extract_cookies(self, response, request) -> None:
+        return None
+
 
 class HTTPXClient:
     def __init__(
         self,
         headers: dict | None = None,
         proxy: str | None = None,
-        timeout: int = 60,
+        timeout: float | httpx.Timeout = 60,
         base_url: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limits: httpx.Limits | None = None,
+        retries: int = 0,
+        retry_backoff: float = 0.1,
     ) -> None:
-        if proxy:
-            transport = httpx.AsyncHTTPTransport(proxy=proxy)
-            self._client = httpx.AsyncClient(timeout=timeout, transport=transport)
-        else:
-            self._client = httpx.AsyncClient(timeout=timeout)
+        limits = limits or httpx.Limits()
+        # Кассета (HTTP_CASSETTE_MODE) пишет или подменяет ответы сети
+        transport = cassette_transport(
+            transport or httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+        )
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            transport=transport,
+            cookies=_DiscardCookieJar(),
+        )
         self._headers = headers or {}
         self._proxy = proxy
         self._base_url = base_url
+        self._limits = limits
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+
+        # Статистика
+        self._latency = LatencyHistogram()
+        self._requests_total = 0
+        self._errors_total = 0
+        self._retries_total = 0
 
     async def __aenter__(self):
         return self
@@ -28,16 +69,75 @@ class HTTPXClient:
         await self.close()
 
     async def request(
-        self, method: str, path: str, **kwargs: Any
+        self, method: str, path: str, idempotent: bool | None = None, **kwargs: Any
     ) -> httpx.Response:
+        """
+        Повторяет запрос при ошибке соединения и 502/503/504, если он идемпотентен:
+        по методу или по явному idempotent=True (например, разбор статьи)
+        """
+        method = method.upper()
         url = self._build_url(path)
         if "headers" not in kwargs:
             kwargs["headers"] = self._headers
-        return await self._client.request(method.upper(), url, **kwargs)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = 1 + (self._retries if idempotent else 0)
+
+        for attempt in range(attempts):
+            last = attempt + 1 == attempts
+            started = time.perf_counter()
+            self._requests_total += 1
+            try:
+                resp = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self._errors_total += 1
+                self._latency.observe(time.perf_counter() - started)
+                if last or not isinstance(e, RETRY_ERRORS):
+                    raise
+            else:
+                self._latency.observe(time.perf_counter() - started)
+                if last or resp.status_code not in RETRY_STATUSES:
+                    return resp
+                await resp.aclose()
+            self._retries_total += 1
+            await asyncio.sleep(self._retry_backoff * 2**attempt)
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, path: str, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Запрос без чтения тела и без повторов: тело читается по кускам,
+        а обрыв на середине не должен заново запускать всю работу сервиса
+        """
+        url = self._build_url(path)
+        if "headers" not in kwargs:
+            kwargs["headers"] = self._headers
+        started = time.perf_counter()
+        self._requests_total += 1
+        try:
+            async with self._client.stream(method.upper(), url, **kwargs) as resp:
+                yield resp
+        except httpx.TransportError:
+            self._errors_total += 1
+            raise
+        finally:
+            self._latency.observe(time.perf_counter() - started)
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    def stats(self) -> dict:
+        return {
+            "base_url": self._base_url,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "retries_total": self._retries_total,
+            "latency": self._latency.snapshot(),
+        }
+
     def _build_url(self, path: str) -> str:
         # Если абсолютный URL — вернуть как есть
         if path.startswith("http://") or path.startswith("https://"):
@@ -0,0 +1,92 @@
+import time
+
+from config import settings
+from loguru import logger
+from redis import asyncio as aioredis
+
+
+class _MeasuredConnectionPool(aioredis.BlockingConnectionPool):
+    """Пул, который ждет свободное соединение и считает время ожидания"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquired_total = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        connection = await super().get_connection(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.acquired_total += 1
+        self.wait_time_total += elapsed
+        self.wait_time_max = max(self.wait_time_max, elapsed)
+        return connection
+
+
+class RedisPool:
+    """
+    Общий на процесс BFF пул соединений с Redis
+    Создается в lifespan; зависимости берут из него готовый клиент,
+    поэтому запрос не открывает соединение и не шлет лишний PING
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 50,
+        pool_timeout: float = 5.0,
+        health_check_interval: int = 30,
+        socket_timeout: float = 5.0,
+        socket_connect_timeout: float = 2.0,
+    ) -> None:
+        self.pool = _MeasuredConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+            # Простоявшее дольше интервала соединение проверяется PING перед выдачей
+            health_check_interval=health_check_interval,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_connect_timeout,
+            decode_responses=True,
+        )
+        self.client = aioredis.Redis(connection_pool=self.pool)
+
+    @classmethod
+    def from_settings(cls) -> "RedisPool":
+        return cls(
+            url=settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            pool_timeout=settings.REDIS_POOL_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        )
+
+    async def ping(self) -> bool:
+        """Проверка при старте: без Redis BFF работает, но без кэша"""
+        try:
+            await self.client.ping()
+            logger.info("Подключение к Redis успешно установлено.")
+            return True
+        except Exception as e:
+            logger.error(f"Не удалось подключиться к Redis: {e}")
+            return False
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+    def stats(self) -> dict:
+        in_use = len(self.pool._in_use_connections)
+        idle = len(self.pool._available_connections)
+        acquired = self.pool.acquired_total or 1
+        return {
+            "max_connections": self.pool.max_connections,
+            "connections": in_use + idle,
+            "connections_in_use": in_use,
+            "connections_idle": idle,
+            "acquired_total": self.pool.acquired_total,
+            "wait_time_avg": self.pool.wait_time_total / acquired,
+            "wait_time_max": self.pool.wait_time_max,
+        }
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Склеивает одновременные вызовы с одним ключом в один в пределах процесса
+    Отмена одного из ожидающих не прерывает общий вызов для остальных
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._calls = 0
+        self._shared = 0
+
+    async def run(self, key: str, load: Callable[[], Awaitable[T]]) -> T:
+        self._calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(load())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self._calls,
+            "shared": self._shared,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Ошибку забирают ожидающие; если все ушли, она не должна шуметь в логе
+        if not task.cancelled():
+            task.exception()
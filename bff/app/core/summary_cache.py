@@ -0,0 +1,278 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.core.single_flight import SingleFlight
+from config import settings
+from loguru import logger
+
+
+@dataclass
+class _Entry:
+    value: dict
+    # До expires_at запись свежая, до stale_until ее можно отдать при сбое загрузки
+    expires_at: float
+    stale_until: float
+    # Сколько длилась загрузка: от нее зависит, как рано начинать обновление
+    delta: float
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "value": self.value,
+                "expires_at": self.expires_at,
+                "stale_until": self.stale_until,
+                "delta": self.delta,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "_Entry":
+        return cls(**json.loads(raw))
+
+
+class SummaryCache:
+    """
+    Двухуровневый кэш готовых результатов задач LLM: LRU в процессе перед Redis
+    Готовое резюме задачи не меняется, поэтому процесс держит его у себя и в Redis
+    не ходит; сброс записи (пересчет резюме) рассылается всем процессам через
+    pub/sub. Незадолго до истечения запись с вероятностью обновляется в фоне
+    (XFetch), а при недоступной базе или llm_service отдается устаревшая копия
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        channel: str,
+        local_size: int = 2048,
+        ttl: float = 3600,
+        stale_ttl: float = 86400,
+        early_refresh_beta: float = 1.0,
+        key_prefix: str = "summary:",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.redis = redis_client
+        self.channel = channel
+        self.local_size = local_size
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.early_refresh_beta = early_refresh_beta
+        self.key_prefix = key_prefix
+        self.reconnect_delay = reconnect_delay
+        self._local: OrderedDict[str, _Entry] = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshes: set[asyncio.Task] = set()
+        self._reader: asyncio.Task | None = None
+
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._load_errors = 0
+        self._redis_errors = 0
+        self._early_refreshes = 0
+        self._stale_served = 0
+        self._invalidations_sent = 0
+        self._invalidations_received = 0
+
+    @classmethod
+    def from_settings(cls, redis_client) -> "SummaryCache":
+        return cls(
+            redis_client,
+            channel=settings.SUMMARY_CACHE_CHANNEL,
+            local_size=settings.SUMMARY_CACHE_LOCAL_SIZE,
+            ttl=settings.SUMMARY_CACHE_TTL,
+            stale_ttl=settings.SUMMARY_CACHE_STALE_TTL,
+            early_refresh_beta=settings.SUMMARY_CACHE_EARLY_REFRESH_BETA,
+        )
+
+    def start(self) -> None:
+        self._reader = asyncio.create_task(self._read_forever())
+
+    async def close(self) -> None:
+        tasks = list(self._refreshes)
+        if self._reader:
+            tasks.append(self._reader)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def get(self, key: str, load: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Результат задачи из кэша или из load
+        Кэшируется только готовый результат (status == done); промежуточные
+        статусы каждый раз берутся из load, одновременные загрузки склеиваются
+        """
+        now = time.time()
+        entry = await self._lookup(key)
+        if entry is not None and now < entry.expires_at:
+            if self._should_refresh_early(entry, now):
+                self._refresh_in_background(key, load)
+            return entry.value
+
+        self._misses += entry is None
+        try:
+            return await self._flight.run(key, lambda: self._load(key, load))
+        except Exception:
+            if entry is not None and now < entry.stale_until:
+                self._stale_served += 1
+                logger.warning(f"Загрузка {key} не удалась, отдан устаревший результат")
+                return entry.value
+            raise
+
+    async def peek(self, key: str) -> dict | None:
+        """Результат из кэша без загрузки, в том числе устаревший"""
+        entry = await self._lookup(key)
+        return entry.value if entry is not None else None
+
+    async def set(self, key: str, value: dict, delta: float = 0.0) -> None:
+        now = time.time()
+        entry = _Entry(
+            value=value,
+            expires_at=now + self.ttl,
+            stale_until=now + self.stale_ttl,
+            delta=delta,
+        )
+        self._put_local(key, entry)
+        try:
+            await self.redis.set(
+                self.key_prefix + key, entry.to_json(), ex=math.ceil(self.stale_ttl)
+            )
+        except Exception as e:
+            self._redis_errors += 1
+            logger.warning(f"Не удалось записать {key} в Redis: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        """Сбрасывает запись в Redis и в LRU всех процессов BFF"""
+        self._local.pop(key, None)
+        self._invalidations_sent += 1
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(self.key_prefix + key)
+                pipe.publish(self.channel, key)
+                await pipe.execute()
+        except Exception as e:
+            # Статья уже обновлена в базе; копии в Redis доживут до конца TTL
+            self._redis_errors += 1
+            logger.warning(f"Не удалось сбросить {key} в Redis: {e}")
+
+    def stats(self) -> dict:
+        lookups = self._local_hits + self._redis_hits + self._misses
+        redis_lookups = self._redis_hits + self._misses
+        return {
+            "local": {
+                "entries": len(self._local),
+                "max_entries": self.local_size,
+                "hits": self._local_hits,
+                "hit_ratio": self._local_hits / lookups if lookups else 0.0,
+            },
+            "redis": {
+                "hits": self._redis_hits,
+                "hit_ratio": self._redis_hits / redis_lookups if redis_lookups else 0.0,
+                "errors": self._redis_errors,
+            },
+            "lookups": lookups,
+            "misses": self._misses,
+            "loads": self._loads,
+            "load_errors": self._load_errors,
+            "early_refreshes": self._early_refreshes,
+            "stale_served": self._stale_served,
+            "invalidations_sent": self._invalidations_sent,
+            "invalidations_received": self._invalidations_received,
+            "connected": bool(self._reader and not self._reader.done()),
+            "single_flight": self._flight.stats(),
+        }
+
+    async def _lookup(self, key: str) -> _Entry | None:
+        entry = self._local.get(key)
+        if entry is not None:
+            self._local.move_to_end(key)
+            self._local_hits += 1
+            return entry
+        try:
+            raw = await self.redis.get(self.key_prefix + key)
+        except Exception as e:
+            # Без Redis кэш работает на одном уровне в процессе
+            self._redis_errors += 1
+            logger.warning(f"Не удалось прочитать {key} из Redis: {e}")
+            return None
+        if raw is None:
+            return None
+        entry = _Entry.from_json(raw)
+        self._put_local(key, entry)
+        self._redis_hits += 1
+        return entry
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[dict]]) -> dict:
+        self._loads += 1
+        started = time.perf_counter()
+        try:
+            value = await load()
+        except Exception:
+            self._load_errors += 1
+            raise
+        if value.get("status") == "done":
+            await self.set(key, value, delta=time.perf_counter() - started)
+        return value
+
+    def _should_refresh_early(self, entry: _Entry, now: float) -> bool:
+        # XFetch: чем дольше загрузка и ближе истечение, тем вероятнее обновление;
+        # частые запросы популярной записи обновят ее заранее, а не все сразу
+        if self.early_refresh_beta <= 0 or entry.delta <= 0:
+            return False
+        jitter = -entry.delta * self.early_refresh_beta * math.log(random.random())
+        return now + jitter >= entry.expires_at
+
+    def _refresh_in_background(
+        self, key: str, load: Callable[[], Awaitable[dict]]
+    ) -> None:
+        self._early_refreshes += 1
+        task = asyncio.create_task(self._refresh_quietly(key, load))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh_quietly(
+        self, key: str, load: Callable[[], Awaitable[dict]]
+    ) -> None:
+        try:
+            await self._flight.run(key, lambda: self._load(key, load))
+        except Exception as e:
+            logger.warning(f"Фоновое обновление {key} не удалось: {e}")
+
+    def _put_local(self, key: str, entry: _Entry) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def _read_forever(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message:
+                        self._invalidations_received += 1
+                        self._local.pop(message["data"], None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Подписка на сброс кэша резюме прервана: {e}")
+                # Пропущенные сбросы не отследить: LRU начинает заново
+                self._local.clear()
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                with suppress(Exception):
+                    await pubsub.aclose()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+from config import settings
+from loguru import logger
+
+# Статусы, после которых задача больше не меняется
+FINAL_STATUSES = {"done", "failed"}
+
+
+class TaskSubscription:
+    """Очередь статусов для набора задач одного клиента"""
+
+    def __init__(self, hub: "TaskStatusHub") -> None:
+        self._hub = hub
+        self.task_ids: set[str] = set()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue()
+
+    def add(self, task_ids: Iterable[str]) -> None:
+        for task_id in task_ids:
+            if task_id not in self.task_ids:
+                self.task_ids.add(task_id)
+                self._hub._watchers.setdefault(task_id, set()).add(self)
+
+    def remove(self, task_ids: Iterable[str]) -> None:
+        for task_id in list(task_ids):
+            self.task_ids.discard(task_id)
+            watchers = self._hub._watchers.get(task_id)
+            if watchers is not None:
+                watchers.discard(self)
+                if not watchers:
+                    del self._hub._watchers[task_id]
+
+
+class TaskStatusHub:
+    """
+    Раздает переходы статусов задач LLM ожидающим клиентам
+    На процесс BFF одна подписка на канал Redis; уведомления публикует
+    consumer llm_service при каждой смене статуса
+    """
+
+    def __init__(
+        self, redis_client, channel: str, reconnect_delay: float = 1.0
+    ) -> None:
+        self.redis = redis_client
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._watchers: dict[str, set[TaskSubscription]] = {}
+        self._listeners: list[Callable[[dict], Awaitable[None]]] = []
+        self._listener_tasks: set[asyncio.Task] = set()
+        self._reader: asyncio.Task | None = None
+        self._received = 0
+        self._delivered = 0
+
+    @classmethod
+    def from_settings(cls, redis_client) -> "TaskStatusHub":
+        return cls(redis_client, channel=settings.TASK_STATUS_CHANNEL)
+
+    def add_listener(self, listener: Callable[[dict], Awaitable[None]]) -> None:
+        """
+        Обработчик каждого уведомления процесса: вызывается один раз на событие,
+        сколько бы клиентов его ни ждали (например, сохранение резюме в базу)
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        self._reader = asyncio.create_task(self._read_forever())
+
+    async def close(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader
+        for task in list(self._listener_tasks):
+            task.cancel()
+        await asyncio.gather(*self._listener_tasks, return_exceptions=True)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, task_ids: Iterable[str] = ()
+    ) -> AsyncIterator[TaskSubscription]:
+        subscription = TaskSubscription(self)
+        subscription.add(task_ids)
+        try:
+            yield subscription
+        finally:
+            subscription.remove(subscription.task_ids)
+
+    async def current(self, task_id: str) -> dict | None:
+        """
+        Статус, записанный до подписки: llm_service хранит его в том же Redis
+        Читать нужно после подписки, иначе переход между чтением и подпиской потеряется
+        """
+        raw = await self.redis.get(task_id)
+        return {"task_id": task_id, **json.loads(raw)} if raw else None
+
+    def stats(self) -> dict:
+        return {
+            "connected": bool(self._reader and not self._reader.done()),
+            "tasks_watched": len(self._watchers),
+            "subscriptions": len(
+                {sub for watchers in self._watchers.values() for sub in watchers}
+            ),
+            "received": self._received,
+            "delivered": self._delivered,
+        }
+
+    async def _read_forever(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                while True:
+                    # Ожидание с таймаутом: listen() упирается в socket_timeout пула
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message:
+                        self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Подписка на статусы задач прервана: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                with suppress(Exception):
+                    await pubsub.aclose()
+
+    def _dispatch(self, data: str) -> None:
+        self._received += 1
+        try:
+            event = json.loads(data)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            logger.warning(f"Некорректное уведомление о статусе: {data!r}")
+            return
+        for listener in self._listeners:
+            task = asyncio.create_task(self._notify(listener, event))
+            self._listener_tasks.add(task)
+            task.add_done_callback(self._listener_tasks.discard)
+        for subscription in self._watchers.get(event.get("task_id"), ()):
+            subscription.queue.put_nowait(event)
+            self._delivered += 1
+
+    async def _notify(
+        self, listener: Callable[[dict], Awaitable[None]], event: dict
+    ) -> None:
+        try:
+            await listener(event)
+        except Exception as e:
+            logger.warning(f"Обработчик статуса задачи {event.get('task_id')}: {e}")
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from contextlib import suppress
+
+from config import settings
+from jose import JWTError, jwt
+from loguru import logger
+
+
+class TokenRevokedError(JWTError):
+    """Токен или все токены пользователя отозваны в auth-service"""
+
+
+def token_hash(token: str) -> str:
+    """Ключ токена в кэше и в ленте отзывов: сам токен нигде не хранится"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenVerifier:
+    """
+    Проверяет access-токены на месте: подпись и срок общим с auth-service ключом
+    Проверенные claims лежат в LRU по хэшу токена. Отзывы auth-service
+    публикует в канал Redis; при каждой (пере)подписке читаются и множества
+    с уже отозванными токенами и пользователями, чтобы не пропустить разрыв
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        secret_key: str,
+        algorithm: str,
+        channel: str,
+        revoked_tokens_key: str,
+        revoked_users_key: str,
+        cache_size: int = 10000,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.redis = redis_client
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.channel = channel
+        self.revoked_tokens_key = revoked_tokens_key
+        self.revoked_users_key = revoked_users_key
+        self.cache_size = cache_size
+        self.reconnect_delay = reconnect_delay
+        self._claims: OrderedDict[str, dict] = OrderedDict()
+        # Хэш токена или id пользователя -> до какого момента отзыв в силе
+        self._revoked_tokens: dict[str, float] = {}
+        self._revoked_users: dict[str, float] = {}
+        self._reader: asyncio.Task | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+        self._revoked = 0
+        self._revocations_received = 0
+
+    @classmethod
+    def from_settings(cls, redis_client) -> "TokenVerifier":
+        return cls(
+            redis_client,
+            secret_key=settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+            channel=settings.AUTH_REVOCATION_CHANNEL,
+            revoked_tokens_key=settings.AUTH_REVOKED_TOKENS_KEY,
+            revoked_users_key=settings.AUTH_REVOKED_USERS_KEY,
+            cache_size=settings.AUTH_CLAIMS_CACHE_SIZE,
+        )
+
+    def start(self) -> None:
+        self._reader = asyncio.create_task(self._read_forever())
+
+    async def close(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader
+
+    def verify(self, token: str) -> dict:
+        """
+        Claims действующего access-токена
+        ExpiredSignatureError — срок истек, TokenRevokedError — отозван,
+        JWTError — остальные ошибки токена
+        """
+        digest = token_hash(token)
+        now = time.time()
+        claims = self._claims.get(digest)
+        if claims is not None and claims["exp"] > now:
+            self._claims.move_to_end(digest)
+            self._hits += 1
+        else:
+            self._misses += 1
+            try:
+                claims = self._decode(token)
+            except JWTError:
+                self._claims.pop(digest, None)
+                self._rejected += 1
+                raise
+            self._put(digest, claims)
+
+        if self._is_revoked(digest, claims["sub"], now):
+            self._claims.pop(digest, None)
+            self._revoked += 1
+            raise TokenRevokedError("Токен отозван")
+        return claims
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "connected": bool(self._reader and not self._reader.done()),
+            "cached_claims": len(self._claims),
+            "max_cached_claims": self.cache_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "rejected": self._rejected,
+            "revoked": self._revoked,
+            "revoked_tokens": len(self._revoked_tokens),
+            "revoked_users": len(self._revoked_users),
+            "revocations_received": self._revocations_received,
+        }
+
+    def _decode(self, token: str) -> dict:
+        claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        # refresh-токен подписан тем же ключом, но доступа к API не дает
+        if claims.get("type") != "access":
+            raise JWTError("Ожидался access-токен")
+        if not claims.get("sub") or not claims.get("exp"):
+            raise JWTError("В токене нет sub или exp")
+        return {"sub": str(claims["sub"]), "exp": int(claims["exp"])}
+
+    def _put(self, digest: str, claims: dict) -> None:
+        self._claims[digest] = claims
+        self._claims.move_to_end(digest)
+        while len(self._claims) > self.cache_size:
+            self._claims.popitem(last=False)
+
+    def _is_revoked(self, digest: str, user_id: str, now: float) -> bool:
+        for revoked, key in (
+            (self._revoked_tokens, digest),
+            (self._revoked_users, user_id),
+        ):
+            until = revoked.get(key)
+            if until is not None:
+                if until > now:
+                    return True
+                del revoked[key]
+        return False
+
+    def _apply(self, event: dict) -> None:
+        self._revocations_received += 1
+        if "token_hash" in event:
+            self._revoked_tokens[event["token_hash"]] = float(event["exp"])
+            self._claims.pop(event["token_hash"], None)
+        elif "user_id" in event:
+            self._revoked_users[str(event["user_id"])] = float(event["until"])
+
+    async def _load_revoked(self) -> None:
+        now = time.time()
+        tokens = await self.redis.zrangebyscore(
+            self.revoked_tokens_key, now, "+inf", withscores=True
+        )
+        users = await self.redis.zrangebyscore(
+            self.revoked_users_key, now, "+inf", withscores=True
+        )
+        self._revoked_tokens = dict(tokens)
+        self._revoked_users = dict(users)
+
+    async def _read_forever(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Сначала подписка, потом снимок: отзыв между ними не потеряется
+                await pubsub.subscribe(self.channel)
+                await self._load_revoked()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message:
+                        try:
+                            self._apply(json.loads(message["data"]))
+                        except (ValueError, KeyError, TypeError):
+                            logger.warning(f"Некорректный отзыв: {message['data']!r}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Подписка на отзывы токенов прервана: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                with suppress(Exception):
+                    await pubsub.aclose()
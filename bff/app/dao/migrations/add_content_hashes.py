@@ -0,0 +1,41 @@
+"""
+Добавляет в articles колонки хэшей содержимого
+
+create_all в lifespan создает только недостающие таблицы, а не колонки,
+поэтому у существующей базы их нужно добавить отдельно. Повторный запуск
+ничего не меняет.
+
+Запуск из каталога bff:
+    python -m app.dao.migrations.add_content_hashes
+"""
+
+import asyncio
+import sys
+
+from app.dao.database import engine
+from loguru import logger
+from sqlalchemy import text
+
+STATEMENTS = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS block_hashes JSON",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS content_diff_ratio DOUBLE PRECISION",
+    "CREATE INDEX IF NOT EXISTS ix_articles_content_hash ON articles (content_hash)",
+]
+
+
+async def migrate() -> None:
+    async with engine.begin() as conn:
+        for statement in STATEMENTS:
+            await conn.execute(text(statement))
+    await engine.dispose()
+
+
+def main() -> int:
+    asyncio.run(migrate())
+    logger.info("Колонки хэшей содержимого добавлены")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Делает связь пользователя со статьей уникальной
+
+Без уникального индекса на (user_id, article_id) не работает
+INSERT ... ON CONFLICT пакетной отправки. Дубликаты, оставшиеся от гонок
+в process_article, удаляются: остается самая ранняя связь. Повторный
+запуск ничего не меняет.
+
+Запуск из каталога bff:
+    python -m app.dao.migrations.add_user_article_unique
+"""
+
+import asyncio
+import sys
+
+from app.dao.database import engine
+from loguru import logger
+from sqlalchemy import text
+
+STATEMENTS = [
+    """
+    DELETE FROM user_articles AS dup
+    USING user_articles AS kept
+    WHERE dup.user_id = kept.user_id
+      AND dup.article_id = kept.article_id
+      AND dup.id > kept.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_articles_user_article "
+    "ON user_articles (user_id, article_id)",
+]
+
+
+async def migrate() -> None:
+    async with engine.begin() as conn:
+        for statement in STATEMENTS:
+            await conn.execute(text(statement))
+    await engine.dispose()
+
+
+def main() -> int:
+    asyncio.run(migrate())
+    logger.info("Уникальный индекс связей пользователей со статьями создан")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Добавляет индекс постраничного списка статей пользователя
+
+GET /api/articles режет страницы по (created_at, id) связи внутри
+пользователя; без составного индекса каждая страница сортирует все
+связи пользователя. Повторный запуск ничего не меняет.
+
+Запуск из каталога bff:
+    python -m app.dao.migrations.add_user_articles_keyset_index
+"""
+
+import asyncio
+import sys
+
+from app.dao.database import engine
+from loguru import logger
+from sqlalchemy import text
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_user_articles_user_created "
+    "ON user_articles (user_id, created_at, id)",
+]
+
+
+async def migrate() -> None:
+    async with engine.begin() as conn:
+        for statement in STATEMENTS:
+            await conn.execute(text(statement))
+    await engine.dispose()
+
+
+def main() -> int:
+    asyncio.run(migrate())
+    logger.info("Индекс списка статей пользователя создан")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
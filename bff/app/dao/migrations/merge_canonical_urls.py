@@ -0,0 +1,125 @@
+"""
+Сводит дубликаты статей к каноническому URL
+
+Раньше статья хранилась под той ссылкой, которую прислал пользователь, и
+формы вроде /ru/companies/x/articles/1, /en/articles/1/?utm_source=... давали
+отдельные записи. Миграция группирует статьи по canonical_url, оставляет в
+группе запись с готовым результатом (иначе самую раннюю), переносит на нее
+привязки пользователей без повторов, удаляет остальные и переписывает url.
+Все выполняется одной транзакцией.
+
+Запуск из каталога bff:
+    python -m app.dao.migrations.merge_canonical_urls --dry-run
+    python -m app.dao.migrations.merge_canonical_urls
+"""
+
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+
+from app.dao.database import async_session_maker, engine
+from app.dao.models import Article, UserArticles
+from app.services.habr_adapter.urls import canonical_url
+from loguru import logger
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def merge_group(
+    session: AsyncSession, canonical: str, rows: list
+) -> tuple[int, int]:
+    """Сливает одну группу; возвращает число удаленных статей и привязок"""
+    # Запись с готовым результатом ценнее, среди равных — самая ранняя
+    survivor = min(rows, key=lambda row: (not row.done, row.id))
+    duplicate_ids = [row.id for row in rows if row.id != survivor.id]
+
+    removed_links = 0
+    if duplicate_ids:
+        links = (
+            await session.execute(
+                select(UserArticles.id, UserArticles.user_id, UserArticles.article_id)
+                .where(UserArticles.article_id.in_([survivor.id, *duplicate_ids]))
+                .order_by(UserArticles.article_id != survivor.id, UserArticles.id)
+            )
+        ).all()
+        linked_users = set()
+        extra_links, moved_links = [], []
+        for link in links:
+            if link.user_id in linked_users:
+                extra_links.append(link.id)
+                continue
+            linked_users.add(link.user_id)
+            if link.article_id != survivor.id:
+                moved_links.append(link.id)
+        if extra_links:
+            await session.execute(
+                delete(UserArticles).where(UserArticles.id.in_(extra_links))
+            )
+        if moved_links:
+            await session.execute(
+                update(UserArticles)
+                .where(UserArticles.id.in_(moved_links))
+                .values(article_id=survivor.id)
+            )
+        # Дубликат мог занимать канонический url — удаляем до переименования
+        await session.execute(delete(Article).where(Article.id.in_(duplicate_ids)))
+        removed_links = len(extra_links)
+
+    if survivor.url != canonical:
+        await session.execute(
+            update(Article).where(Article.id == survivor.id).values(url=canonical)
+        )
+    return len(duplicate_ids), removed_links
+
+
+async def migrate(dry_run: bool) -> dict:
+    async with async_session_maker() as session:
+        rows = (
+            await session.execute(
+                select(
+                    Article.id,
+                    Article.url,
+                    Article.parsed_content.is_not(None).label("done"),
+                ).order_by(Article.id)
+            )
+        ).all()
+        groups = defaultdict(list)
+        for row in rows:
+            groups[canonical_url(row.url)].append(row)
+
+        stats = {"articles": len(rows), "renamed": 0, "merged": 0, "links_removed": 0}
+        for canonical, group in groups.items():
+            if len(group) == 1 and group[0].url == canonical:
+                continue
+            merged, links_removed = await merge_group(session, canonical, group)
+            stats["renamed"] += 1
+            stats["merged"] += merged
+            stats["links_removed"] += links_removed
+
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+    await engine.dispose()
+    return stats
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--dry-run", action="store_true", help="посчитать изменения и откатить"
+    )
+    args = arg_parser.parse_args()
+    stats = asyncio.run(migrate(args.dry_run))
+    logger.info(
+        "{}: статей {articles}, переписано url {renamed}, удалено дубликатов "
+        "{merged}, удалено повторных привязок {links_removed}",
+        "Пробный прогон" if args.dry_run else "Миграция выполнена",
+        **stats,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
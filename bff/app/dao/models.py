@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import UUID
 
 from app.dao.database import Base
-from sqlalchemy import JSON, TIMESTAMP, ForeignKey, String, func
+from sqlalchemy import JSON, TIMESTAMP, Float, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -29,9 +29,25 @@ class Article(Base):
     )
     parsed_content: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
+    # Хэш нормализованного текста и хэши блоков из habr_adapter
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String, index=True, nullable=True
+    )
+    block_hashes: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    # Доля блоков, изменившихся при последнем обновлении статьи
+    content_diff_ratio: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True
+    )
+
 
 class UserArticles(Base):
     __tablename__ = "user_articles"
+    __table_args__ = (
+        # Одна связь на пару; по нему работает INSERT ... ON CONFLICT
+        Index("uq_user_articles_user_article", "user_id", "article_id", unique=True),
+        # Ключ постраничного списка статей пользователя: новые первыми
+        Index("ix_user_articles_user_created", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     created_at: Mapped[datetime] = mapped_column(
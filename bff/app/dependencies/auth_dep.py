@@ -2,30 +2,75 @@ import json
 from typing import Any
 
 import httpx
+from app.core.token_verifier import TokenRevokedError, TokenVerifier
 from app.dependencies.redis_dep import get_redis_client
 from app.dependencies.services_dep import get_auth_service_proxy
-from app.services.auth.schemas import SUserInfo
+from app.services.auth.schemas import SUserClaims, SUserInfo
 from app.services.auth.service import AuthServiceProxy
-from fastapi import Depends, HTTPException, Request, status
+from config import settings
+from fastapi import Depends, HTTPException, status
+from fastapi.requests import HTTPConnection
+from jose import ExpiredSignatureError, JWTError
 
+# Роли администраторов в auth-service (get_current_admin_user)
+ADMIN_ROLE_IDS = {3, 4}
 
-async def get_current_user(
-    request: Request,
-    redis_client: Any = Depends(get_redis_client),
-    auth_service: AuthServiceProxy = Depends(get_auth_service_proxy),
-) -> SUserInfo:
-    """
-    Извлекает access-токен из cookie, проверяет кэш Redis и при отсутствии —
-    валидирует пользователя через auth-сервис. Успешный результат кэшируется.
-    """
+
+async def get_token_verifier(request: HTTPConnection) -> TokenVerifier:
+    """Проверка токенов, созданная в lifespan"""
+    return request.app.state.token_verifier
+
+
+def get_access_token(request: HTTPConnection) -> str:
+    # HTTPConnection, а не Request: зависимость нужна и WebSocket-маршрутам
     token = request.cookies.get("user_access_token")
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Не авторизован",
         )
+    return token
+
+
+async def get_current_claims(
+    token: str = Depends(get_access_token),
+    verifier: TokenVerifier = Depends(get_token_verifier),
+) -> SUserClaims:
+    """
+    Проверяет access-токен на месте, без запроса к auth-сервису
+    Достаточно маршрутам, которым нужен только id пользователя
+    """
+    try:
+        claims = verifier.verify(token)
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен истек",
+        )
+    except TokenRevokedError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен отозван",
+        )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Токен невалиден",
+        )
+    return SUserClaims(id=claims["sub"])
 
-    cache_key = f"token:{token}"
+
+async def get_current_user(
+    token: str = Depends(get_access_token),
+    claims: SUserClaims = Depends(get_current_claims),
+    redis_client: Any = Depends(get_redis_client),
+    auth_service: AuthServiceProxy = Depends(get_auth_service_proxy),
+) -> SUserInfo:
+    """
+    Профиль пользователя проверенного токена: из кэша Redis по id пользователя,
+    при отсутствии — из auth-сервиса. Успешный результат кэшируется.
+    """
+    cache_key = f"user_profile:{claims.id}"
 
     try:
         cached = await redis_client.get(cache_key)
@@ -33,12 +78,12 @@ async def get_current_user(
             data = json.loads(cached)
             return SUserInfo(**data)
 
-        # Валидация через auth-сервис
         user_info = await auth_service.get_me(token)
 
-        # Кэшируем на 5 минут
         await redis_client.setex(
-            cache_key, 300, json.dumps(user_info.model_dump())
+            cache_key,
+            settings.AUTH_PROFILE_CACHE_TTL,
+            json.dumps(user_info.model_dump()),
         )
         return user_info
     except httpx.RequestError:
@@ -57,3 +102,15 @@ async def get_current_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Внутренняя ошибка при аутентификации",
         )
+
+
+async def get_current_admin_user(
+    current_user: SUserInfo = Depends(get_current_user),
+) -> SUserInfo:
+    """Проверяем права пользователя как администратора (как в auth-service)"""
+    if current_user.role and current_user.role.id in ADMIN_ROLE_IDS:
+        return current_user
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Недостаточно прав",
+    )
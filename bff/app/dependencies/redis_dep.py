@@ -1,30 +1,13 @@
-import importlib
-from typing import Any, AsyncGenerator, Optional
+from typing import Any
 
-from config import settings
-from loguru import logger
+from fastapi import Request
 
 
-async def get_redis_client() -> AsyncGenerator[Any, None]:
-    """Предоставляет асинхронный клиент Redis"""
-    redis_client: Optional[Any] = None
-    try:
-        redis_module = importlib.import_module("redis.asyncio")
-        redis_client = redis_module.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=0,
-            decode_responses=True,
-        )
-        await redis_client.ping()
-        logger.info("Подключение к Redis успешно установлено.")
-    except Exception as e:
-        logger.error(f"Не удалось подключиться к Redis: {e}")
-        raise e
+async def get_redis_client(request: Request) -> Any:
+    """Клиент Redis поверх общего пула, созданного в lifespan"""
+    return request.app.state.redis_pool.client
 
-    try:
-        yield redis_client
-    finally:
-        if redis_client is not None:
-            await redis_client.close()
-            logger.info("Подключение к Redis закрыто.")
+
+async def get_summary_cache(request: Request) -> Any:
+    """Кэш готовых резюме, созданный в lifespan"""
+    return request.app.state.summary_cache
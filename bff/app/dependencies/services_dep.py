@@ -1,10 +1,6 @@
-from typing import AsyncGenerator
-
-from config import settings
-from app.core.http_client import HTTPXClient
+from app.core.downstream import auth_service_client
 from app.services.auth.service import AuthServiceProxy
 
 
-async def get_auth_service_proxy() -> AsyncGenerator[AuthServiceProxy, None]:
-    async with HTTPXClient(base_url=settings.AUTH_SERVICE_URL) as client:
-        yield AuthServiceProxy(client)
+async def get_auth_service_proxy() -> AuthServiceProxy:
+    return AuthServiceProxy(auth_service_client)
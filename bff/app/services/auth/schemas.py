@@ -72,6 +72,17 @@ class SUserInfo(UserBase):
     id: str = Field(description="Идентификатор пользователя (UUID)")
     role: RoleModel | None = Field(default=None, exclude=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def restore_role(cls, data):
+        # auth-service и кэш профиля отдают роль только полями role_id/role_name
+        if isinstance(data, dict) and not data.get("role") and data.get("role_id"):
+            data = {
+                **data,
+                "role": {"id": data["role_id"], "name": data.get("role_name", "")},
+            }
+        return data
+
     @computed_field
     def role_name(self) -> str:
         return self.role.name if self.role else "Неизвестно"
@@ -79,3 +90,9 @@ class SUserInfo(UserBase):
     @computed_field
     def role_id(self) -> int:
         return self.role.id if self.role else 0
+
+
+class SUserClaims(BaseModel):
+    """Пользователь из проверенного access-токена, без профиля"""
+
+    id: str = Field(description="Идентификатор пользователя (UUID)")
@@ -30,10 +30,24 @@ class AuthServiceProxy:
         response.raise_for_status()
         return response
 
-    async def logout_user(self) -> dict:
-        """Выход пользователя"""
+    async def logout_user(
+        self, access_token: str, refresh_token: str | None = None
+    ) -> dict:
+        """Выход пользователя: auth-service отзывает токены и публикует отзыв"""
         logger.debug("Proxying logout request")
-        response = await self.client.request("POST", "/api/v1/auth/logout/")
+        cookies = {
+            "user_access_token": access_token,
+            "user_refresh_token": refresh_token,
+        }
+        response = await self.client.request(
+            "POST",
+            "/api/v1/auth/logout/",
+            headers={
+                "Cookie": "; ".join(
+                    f"{name}={value}" for name, value in cookies.items() if value
+                )
+            },
+        )
         response.raise_for_status()
         return response.json()
 
@@ -43,7 +57,8 @@ class AuthServiceProxy:
         response = await self.client.request(
             "GET",
             "/api/v1/auth/me/",
-            cookies={"user_access_token": access_token},
+            # Куки пользователя идут заголовком: клиент общий на все запросы
+            headers={"Cookie": f"user_access_token={access_token}"},
         )
         response.raise_for_status()
         return SUserInfo(**response.json())
@@ -54,7 +69,7 @@ class AuthServiceProxy:
         response = await self.client.request(
             "POST",
             "/api/v1/auth/refresh",
-            cookies={"user_refresh_token": refresh_token},
+            headers={"Cookie": f"user_refresh_token={refresh_token}"},
         )
         response.raise_for_status()
         return response
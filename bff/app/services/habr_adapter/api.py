@@ -1,7 +1,13 @@
+import asyncio
 from typing import Optional
 
-from app.core.http_client import HTTPXClient
-from app.services.habr_adapter.schemas import SArticleParsed, SArticleParseRequest
+from app.core.downstream import habr_adapter_client
+from app.services.habr_adapter.schemas import (
+    SArticleParseBatchItem,
+    SArticleParsed,
+    SArticleParseRequest,
+)
+from app.services.habr_adapter.urls import canonical_url
 from config import settings
 from loguru import logger
 
@@ -9,17 +15,60 @@ from loguru import logger
 async def get_article_from_habr(url: str) -> Optional[SArticleParsed]:
     """Делает HTTP-запрос к habr_adapter для парсинга статьи."""
 
-    async with HTTPXClient() as client:
-        try:
-            payload = SArticleParseRequest(url=url).model_dump(mode="json")
-            resp = await client.request(
+    try:
+        payload = SArticleParseRequest(url=url).model_dump(mode="json")
+        # Разбор ничего не меняет на стороне адаптера — его можно повторить
+        resp = await habr_adapter_client.request(
+            "POST", "/api/habr/parse", json=payload, idempotent=True
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return SArticleParsed(**data)
+    except Exception as e:
+        logger.error(f"Ошибка при запросе к habr_adapter: {e}")
+        return None
+
+
+async def get_articles_from_habr(urls: list[str]) -> dict[str, SArticleParsed]:
+    """
+    Разбирает список статей одним запросом к пакетному эндпоинту habr_adapter
+    Параллельность ограничивает сам адаптер (BATCH_CONCURRENCY); в ответе
+    только разобранные статьи по каноническим URL. NDJSON читается построчно
+    и без повторов: при обрыве остаются статьи, пришедшие до него
+    """
+    articles = {}
+    if not urls:
+        return articles
+    try:
+        # Таймаут httpx — на каждое чтение; весь пакет ограничен отдельно,
+        # и под этот срок рассчитана блокировка ARTICLE_BATCH_LOCK_TIMEOUT
+        async with asyncio.timeout(settings.HABR_ADAPTER_BATCH_TIMEOUT):
+            async with habr_adapter_client.stream(
                 "POST",
-                f"{settings.HABR_ADAPTER_BASE_URL}/api/habr/parse",
-                json=payload,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return SArticleParsed(**data)
-        except Exception as e:
-            logger.error(f"Ошибка при запросе к habr_adapter: {e}")
-            return None
+                "/api/habr/parse/batch",
+                json={"urls": urls},
+                timeout=settings.HABR_ADAPTER_BATCH_TIMEOUT,
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    _read_batch_line(line, articles)
+    except Exception as e:
+        logger.error(
+            f"Ошибка при пакетном запросе к habr_adapter, разобрано "
+            f"{len(articles)} из {len(urls)}: {e}"
+        )
+    return articles
+
+
+def _read_batch_line(line: str, articles: dict[str, SArticleParsed]) -> None:
+    if not line.strip():
+        return
+    try:
+        item = SArticleParseBatchItem.model_validate_json(line)
+    except ValueError as e:
+        logger.warning(f"Некорректная строка ответа habr_adapter: {e}")
+        return
+    if item.article is None:
+        logger.warning(f"habr_adapter не разобрал {item.url}: {item.error}")
+        return
+    articles[canonical_url(item.url)] = item.article
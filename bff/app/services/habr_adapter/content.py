@@ -0,0 +1,11 @@
+from difflib import SequenceMatcher
+
+
+def content_diff_ratio(old_blocks: list[str], new_blocks: list[str]) -> float:
+    """
+    Доля изменений между версиями статьи по хэшам блоков: 0 — тот же текст,
+    1 — ничего общего. Сравниваются короткие хэши, а не тексты
+    """
+    if not old_blocks and not new_blocks:
+        return 0.0
+    return 1.0 - SequenceMatcher(None, old_blocks, new_blocks, autojunk=False).ratio()
@@ -8,9 +8,31 @@ class SArticleParseRequest(BaseModel):
     )
 
 
+class SArticleProcessRequest(SArticleParseRequest):
+    refresh: bool = Field(
+        False,
+        description="Перечитать статью; суммаризация повторится, только если текст заметно изменился",
+    )
+
+
+class SArticleBatchRequest(BaseModel):
+    urls: list[AnyUrl] = Field(
+        ..., min_length=1, description="Список URL статей на Habr"
+    )
+
+
 class SArticleParsed(BaseModel):
     title: str
     author: str | None = None
     publish_time: str | None = None
     url: AnyUrl
+    article_id: int | None = None
     text: str
+    content_hash: str | None = None
+    block_hashes: list[str] = Field(default_factory=list)
+
+
+class SArticleParseBatchItem(BaseModel):
+    url: str
+    article: SArticleParsed | None = None
+    error: str | None = None
@@ -7,26 +7,44 @@ from app.services.llm_service.schemas import (
 )
 from config import settings
 from loguru import logger
-from publisher import Publisher
+from publisher import publisher
+
+
+def _task_body(task_id: str, article) -> str:
+    payload = SArticleForLLM(
+        title=article.title,
+        text=article.text,
+        url=str(article.url),
+        article_id=article.article_id,
+    )
+    return json.dumps({"task_id": task_id, **payload.model_dump()}, ensure_ascii=False)
 
 
 async def send_article_to_queue(article) -> SArticleTaskResponse:
     """Публикация статьи в очередь RabbitMQ для последующей обработки LLM-сервисом"""
 
     task_id = str(uuid.uuid4())
-    payload = SArticleForLLM(title=article.title, text=article.text)
-    body = json.dumps(
-        {"task_id": task_id, **payload.model_dump()}, ensure_ascii=False
+    await publisher.publish(settings.ARTICLE_QUEUE_NAME, _task_body(task_id, article))
+    logger.info(
+        "Статья отправлена в очередь '{}' (task_id={}): {}",
+        settings.ARTICLE_QUEUE_NAME,
+        task_id,
+        article.title,
     )
 
-    publisher = Publisher(settings.RABBITMQ_URL)
-    async with publisher:
-        await publisher.publish(settings.ARTICLE_QUEUE_NAME, body)
-        logger.info(
-            "Статья отправлена в очередь '{}' (task_id={}): {}",
-            settings.ARTICLE_QUEUE_NAME,
-            task_id,
-            article.title,
-        )
-
     return SArticleTaskResponse(task_id=task_id, status="queued")
+
+
+async def send_articles_to_queue(articles: list) -> list[SArticleTaskResponse]:
+    """Публикация нескольких статей одной серией с общим ожиданием подтверждений"""
+
+    task_ids = [str(uuid.uuid4()) for _ in articles]
+    await publisher.publish_many(
+        settings.ARTICLE_QUEUE_NAME,
+        [_task_body(task_id, article) for task_id, article in zip(task_ids, articles)],
+    )
+    logger.info(
+        "В очередь '{}' отправлено статей: {}", settings.ARTICLE_QUEUE_NAME, len(articles)
+    )
+
+    return [SArticleTaskResponse(task_id=task_id, status="queued") for task_id in task_ids]
@@ -4,6 +4,8 @@ from pydantic import BaseModel
 class SArticleForLLM(BaseModel):
     title: str
     text: str
+    url: str | None = None
+    article_id: int | None = None
 
 
 class SArticleTaskResponse(BaseModel):
@@ -0,0 +1,158 @@
+"""
+Список статей пользователя: полная выгрузка против страниц по ключу
+
+Заводит пользователя со --links связями (по умолчанию 100 000) в базе
+из настроек BFF и сравнивает прежнюю выгрузку всех статей с parsed_content
+с постраничным GET /api/articles: первая страница, страница в глубине
+списка и проекция без parsed_content. Запросы идут в приложение через ASGI
+без сети и без auth-сервиса. Тестовые строки удаляются, если не указан --keep.
+
+Запуск из каталога bff (нужен Postgres с примененными миграциями):
+    python -m benchmarks.articles_pagination --links 100000 --pages 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+from app.api.api import router
+from app.dao.database import async_session_maker, engine
+from app.dao.models import Article, UserArticles
+from app.dependencies.auth_dep import get_current_claims
+from app.services.auth.schemas import SUserClaims
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from sqlalchemy import select, text
+
+URL_PREFIX = "bench://articles-pagination/"
+
+# Резюме типичного размера: список вытягивает его для каждой статьи
+SUMMARY = {
+    "title": "Заголовок статьи",
+    "summary": "Краткое содержание статьи. " * 40,
+    "key_points": [f"Ключевая мысль {i}" for i in range(8)],
+}
+
+
+async def seed(user_id: uuid.UUID, links: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO articles (url, task_id, parsed_content) "
+                "SELECT CAST(:prefix AS TEXT) || g, 'bench-' || g, CAST(:summary AS JSON) "
+                "FROM generate_series(1, :links) AS g "
+                "ON CONFLICT (url) DO NOTHING"
+            ),
+            {"prefix": URL_PREFIX, "summary": json.dumps(SUMMARY), "links": links},
+        )
+        # Время добавления разнесено, чтобы порядок страниц был как в жизни
+        await conn.execute(
+            text(
+                "INSERT INTO user_articles (user_id, article_id, created_at) "
+                "SELECT CAST(:user_id AS UUID), id, now() - id * interval '1 second' "
+                "FROM articles WHERE url LIKE :pattern "
+                "ON CONFLICT (user_id, article_id) DO NOTHING"
+            ),
+            {"user_id": user_id, "pattern": URL_PREFIX + "%"},
+        )
+        await conn.execute(text("ANALYZE user_articles"))
+
+
+async def cleanup(user_id: uuid.UUID) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM user_articles WHERE user_id = :user_id"),
+            {"user_id": user_id},
+        )
+        await conn.execute(
+            text("DELETE FROM articles WHERE url LIKE :pattern"),
+            {"pattern": URL_PREFIX + "%"},
+        )
+
+
+async def full_load(user_id: uuid.UUID) -> tuple[float, int]:
+    """Прежний get_user_articles: все статьи пользователя со всеми полями"""
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        stmt = select(Article).join(UserArticles).where(UserArticles.user_id == user_id)
+        articles = (await session.execute(stmt)).scalars().all()
+        body = json.dumps(jsonable_encoder(articles))
+    return time.perf_counter() - started, len(body)
+
+
+async def walk(
+    client: httpx.AsyncClient, pages: int, limit: int, fields: str | None
+) -> list[tuple[float, int]]:
+    """Проходит pages страниц подряд; возвращает время и размер каждой"""
+    params = {"limit": limit}
+    if fields:
+        params["fields"] = fields
+    results = []
+    for _ in range(pages):
+        started = time.perf_counter()
+        resp = await client.get("/api/articles", params=params)
+        resp.raise_for_status()
+        results.append((time.perf_counter() - started, len(resp.content)))
+        cursor = resp.json()["next_cursor"]
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    return results
+
+
+def report(name: str, results: list[tuple[float, int]]) -> None:
+    latencies = [elapsed * 1000 for elapsed, _ in results]
+    sizes = [size for _, size in results]
+    print(
+        f"{name:<28}{statistics.median(latencies):>10.2f}{max(latencies):>10.2f}"
+        f"{statistics.mean(sizes) / 1024:>12.1f}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    user_id = uuid.uuid4()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_claims] = lambda: SUserClaims(id=str(user_id))
+    await seed(user_id, args.links)
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bff"
+        ) as client:
+            print(f"Связей у пользователя: {args.links}, страница {args.limit}")
+            print(f"{'вариант':<28}{'p50, мс':>10}{'max, мс':>10}{'ответ, КБ':>12}")
+            report("полная выгрузка", [await full_load(user_id)])
+            report(
+                "страницы, все поля",
+                await walk(client, args.pages, args.limit, None),
+            )
+            report(
+                "страницы, без резюме",
+                await walk(client, args.pages, args.limit, "id,url,task_id"),
+            )
+    finally:
+        if not args.keep:
+            await cleanup(user_id)
+        await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--links", type=int, default=100_000)
+    arg_parser.add_argument("--limit", type=int, default=50)
+    arg_parser.add_argument("--pages", type=int, default=50)
+    arg_parser.add_argument("--keep", action="store_true")
+    args = arg_parser.parse_args()
+    logger.remove()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Запросов в секунду с Redis-клиентом на запрос и с общим пулом
+
+Оба варианта обслуживают одинаковый маршрут: чтение и запись ключа,
+как get_current_user при промахе кэша токена. Прежняя зависимость
+открывает соединение, шлет PING и закрывает его на каждый запрос.
+Нужен запущенный Redis; запросы идут в приложение через ASGI без сети.
+
+Запуск из каталога bff:
+    python -m benchmarks.redis_dependency --redis-url redis://localhost:6379 --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from app.core.redis_pool import RedisPool
+from config import settings
+from fastapi import Depends, FastAPI, Request
+from loguru import logger
+from redis import asyncio as aioredis
+
+
+def build_app(redis_url: str, max_connections: int) -> FastAPI:
+    app = FastAPI()
+    app.state.redis_pool = RedisPool(redis_url, max_connections=max_connections)
+
+    async def per_request_client():
+        # Прежняя реализация get_redis_client
+        client = aioredis.Redis.from_url(redis_url, decode_responses=True)
+        await client.ping()
+        try:
+            yield client
+        finally:
+            await client.aclose()
+
+    async def pooled_client(request: Request):
+        return request.app.state.redis_pool.client
+
+    async def handle(client, key: str) -> dict:
+        cached = await client.get(f"bench:{key}")
+        if not cached:
+            await client.setex(f"bench:{key}", 60, key)
+        return {"ok": True}
+
+    @app.get("/per-request/{key}")
+    async def per_request(key: str, client=Depends(per_request_client)):
+        return await handle(client, key)
+
+    @app.get("/pooled/{key}")
+    async def pooled(key: str, client=Depends(pooled_client)):
+        return await handle(client, key)
+
+    return app
+
+
+async def run(app: FastAPI, route: str, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bff"
+    ) as client:
+
+        async def one(index: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                resp = await client.get(f"/{route}/{index % 100}")
+                latencies.append(time.perf_counter() - started)
+                errors += resp.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+    return {"rps": requests / elapsed, "latencies": sorted(latencies), "errors": errors}
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    app = build_app(args.redis_url, args.max_connections)
+    failed = 0
+    try:
+        print(f"Запросов: {args.requests}, параллельно {args.concurrency}")
+        print(f"{'вариант':<14}{'запр/с':>10}{'p50, мс':>10}{'p99, мс':>10}{'ошибок':>9}")
+        for route in ("per-request", "pooled"):
+            report = await run(app, route, args.requests, args.concurrency)
+            latencies = report["latencies"]
+            print(
+                f"{route:<14}{report['rps']:>10.1f}"
+                f"{statistics.median(latencies) * 1000:>10.2f}"
+                f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.2f}"
+                f"{report['errors']:>9}"
+            )
+            failed += report["errors"]
+        print(f"пул: {app.state.redis_pool.stats()}")
+    finally:
+        await app.state.redis_pool.close()
+    return 1 if failed else 0
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    arg_parser.add_argument("--requests", type=int, default=2000)
+    arg_parser.add_argument("--concurrency", type=int, default=50)
+    arg_parser.add_argument("--max-connections", type=int, default=50)
+    args = arg_parser.parse_args()
+    logger.remove()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
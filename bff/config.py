@@ -28,11 +28,71 @@ class Settings(BaseSettings):
     RABBITMQ_PORT: int = 5672
 
     ARTICLE_QUEUE_NAME: str = "article_queue"
+    # Общий издатель (publisher.py): каналы с подтверждениями и размер пачки
+    # publish_many, подтверждения которой ждутся вместе
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 4
+    RABBITMQ_CONFIRM_TIMEOUT: float = 10.0
+    RABBITMQ_PUBLISH_BATCH: int = 100
+
+    # Канал Redis pub/sub со статусами задач от llm_service (app.core.task_events),
+    # интервал комментариев-пингов в потоке SSE и предельная длина потока
+    TASK_STATUS_CHANNEL: str = "habr:task_status"
+    TASK_STREAM_KEEPALIVE: float = 15.0
+    TASK_STREAM_TIMEOUT: float = 600.0
+
+    # Проверка access-токенов в BFF (app.core.token_verifier): общий с
+    # auth-service ключ, размер LRU проверенных claims, лента отзывов от
+    # auth-service и срок кэша профиля пользователя в Redis
+    SECRET_KEY: str = "your-secret-key"
+    ALGORITHM: str = "HS256"
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+    AUTH_REVOCATION_CHANNEL: str = "auth:revocations"
+    AUTH_REVOKED_TOKENS_KEY: str = "auth:revoked_tokens"
+    AUTH_REVOKED_USERS_KEY: str = "auth:revoked_users"
+    AUTH_PROFILE_CACHE_TTL: int = 300
+
+    # Кэш готовых резюме (app.core.summary_cache): размер LRU в процессе,
+    # срок свежести, сколько еще отдавать устаревшую копию при сбое загрузки,
+    # коэффициент раннего обновления (0 — выключено) и канал сброса записей
+    SUMMARY_CACHE_LOCAL_SIZE: int = 2048
+    SUMMARY_CACHE_TTL: float = 3600.0
+    SUMMARY_CACHE_STALE_TTL: float = 86400.0
+    SUMMARY_CACHE_EARLY_REFRESH_BETA: float = 1.0
+    SUMMARY_CACHE_CHANNEL: str = "habr:summary_invalidate"
 
     HABR_ADAPTER_BASE_URL: str = "http://habr-adapter:5000"
     LLM_SERVICE_BASE_URL: str = "http://llm-service:5001"
     AUTH_SERVICE_BASE_URL: str = "http://auth-service:5002"
 
+    # Клиенты к сервисам за BFF (app.core.downstream): таймаут запроса,
+    # предел соединений и повторы идемпотентных вызовов
+    HABR_ADAPTER_TIMEOUT: float = 60.0
+    HABR_ADAPTER_MAX_CONNECTIONS: int = 50
+    LLM_SERVICE_TIMEOUT: float = 10.0
+    LLM_SERVICE_MAX_CONNECTIONS: int = 20
+    AUTH_SERVICE_TIMEOUT: float = 5.0
+    AUTH_SERVICE_MAX_CONNECTIONS: int = 50
+    DOWNSTREAM_CONNECT_TIMEOUT: float = 2.0
+    DOWNSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    DOWNSTREAM_RETRIES: int = 2
+    DOWNSTREAM_RETRY_BACKOFF: float = 0.1
+
+    # Повторная суммаризация обновленной статьи: доля измененных блоков,
+    # начиная с которой старое резюме считается устаревшим
+    RESUMMARIZE_MIN_DIFF_RATIO: float = 0.1
+
+    # Пакетная отправка статей: предел URL в запросе и общий срок пакетного
+    # разбора в habr_adapter (ответ читается построчно, без повторов)
+    BATCH_MAX_URLS: int = 500
+    # Наибольший размер страницы списка статей пользователя
+    ARTICLES_PAGE_MAX: int = 200
+    HABR_ADAPTER_BATCH_TIMEOUT: float = 300.0
+
+    # Блокировка создания статьи в Redis: время жизни выводится из таймаута
+    # habr_adapter и числа попыток (ARTICLE_LOCK_TIMEOUT), запас сверху
+    # покрывает публикацию задачи и запись в базу
+    ARTICLE_LOCK_MARGIN: float = 30.0
+
     # Database
     POSTGRES_DB: str = "app_db"
     POSTGRES_USER: str = "user"
@@ -43,6 +103,21 @@ class Settings(BaseSettings):
     # Redis
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
+    # Общий пул соединений (app.core.redis_pool): при исчерпании запрос ждет
+    # свободное соединение до REDIS_POOL_TIMEOUT секунд
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_CONNECT_TIMEOUT: float = 2.0
+
+    # Запись и воспроизведение HTTP-обменов (app.core.cassette): record, replay
+    # или пусто. Задержка при воспроизведении: recorded, none, fixed:0.05,
+    # uniform:a,b, normal:mean,std, lognormal:median,sigma
+    HTTP_CASSETTE_MODE: str | None = None
+    HTTP_CASSETTE_PATH: str = "cassettes/bff.jsonl"
+    HTTP_CASSETTE_LATENCY: str = "recorded"
+    HTTP_CASSETTE_SEED: int | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -61,6 +136,38 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
 
+    def _downstream_deadline(self, timeout: float) -> float:
+        """Сколько может длиться вызов с повторами: все попытки и паузы между ними"""
+        attempts = self.DOWNSTREAM_RETRIES + 1
+        backoff = self.DOWNSTREAM_RETRY_BACKOFF * (2**self.DOWNSTREAM_RETRIES - 1)
+        return timeout * attempts + backoff
+
+    @property
+    def ARTICLE_LOCK_TIMEOUT(self) -> float:
+        """Блокировка не должна истечь, пока статью еще разбирают"""
+        return (
+            self._downstream_deadline(self.HABR_ADAPTER_TIMEOUT)
+            + self.RABBITMQ_CONFIRM_TIMEOUT
+            + self.ARTICLE_LOCK_MARGIN
+        )
+
+    @property
+    def ARTICLE_BATCH_LOCK_TIMEOUT(self) -> float:
+        """То же для статей, которые разбираются пакетом (пакет не повторяется)"""
+        return (
+            self.HABR_ADAPTER_BATCH_TIMEOUT
+            + self.RABBITMQ_CONFIRM_TIMEOUT
+            + self.ARTICLE_LOCK_MARGIN
+        )
+
+    @property
+    def ARTICLE_LOCK_WAIT(self) -> float:
+        """Сколько ждать статью, которую создает другой запрос (одиночный или пакет)"""
+        return (
+            max(self.ARTICLE_LOCK_TIMEOUT, self.ARTICLE_BATCH_LOCK_TIMEOUT)
+            + self.ARTICLE_LOCK_MARGIN
+        )
+
     @property
     def CONSOLE_LOG_LEVEL(self):
         return ELogLevel.DEBUG if self.DEV_MODE else ELogLevel.WARNING
@@ -1,9 +1,17 @@
 from contextlib import asynccontextmanager
+from functools import partial
 
 from app.api import router
+from app.api.api import store_task_result
+from app.core.downstream import close_downstream_clients
 from app.core.logging_config import setup_logging
+from app.core.redis_pool import RedisPool
+from app.core.summary_cache import SummaryCache
+from app.core.task_events import TaskStatusHub
+from app.core.token_verifier import TokenVerifier
 from app.dao.database import Base, engine
 from fastapi import FastAPI
+from publisher import publisher
 
 setup_logging()
 
@@ -12,7 +20,24 @@ setup_logging()
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    app.state.redis_pool = RedisPool.from_settings()
+    await app.state.redis_pool.ping()
+    app.state.summary_cache = SummaryCache.from_settings(app.state.redis_pool.client)
+    app.state.summary_cache.start()
+    app.state.task_events = TaskStatusHub.from_settings(app.state.redis_pool.client)
+    app.state.task_events.add_listener(
+        partial(store_task_result, app.state.summary_cache)
+    )
+    app.state.task_events.start()
+    app.state.token_verifier = TokenVerifier.from_settings(app.state.redis_pool.client)
+    app.state.token_verifier.start()
     yield
+    await app.state.token_verifier.close()
+    await app.state.task_events.close()
+    await app.state.summary_cache.close()
+    await close_downstream_clients()
+    await publisher.close()
+    await app.state.redis_pool.close()
     await engine.dispose()
 
 
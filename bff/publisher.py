@@ -1,29 +1,108 @@
-from aio_pika import Message, connect_robust
+import asyncio
+import time
+
+from aio_pika import DeliveryMode, Message, connect_robust
+from aio_pika.pool import Pool
+from config import settings
+from loguru import logger
 
 
 class Publisher:
-    def __init__(self, rabbitmq_url: str, prefetch_count: int = 10):
+    """
+    Долгоживущий издатель RabbitMQ: одно соединение на процесс и пул каналов
+    с подтверждениями публикации. Соединение открывается при первой
+    публикации и закрывается в lifespan BFF
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        channel_pool_size: int = 4,
+        confirm_timeout: float = 10.0,
+        batch_size: int = 100,
+    ):
         self.rabbitmq_url = rabbitmq_url
+        self.channel_pool_size = channel_pool_size
+        self.confirm_timeout = confirm_timeout
+        self.batch_size = batch_size
         self.connection = None
-        self.channel = None
-        self.prefetch_count = prefetch_count
+        self._channels: Pool | None = None
+        self._lock = asyncio.Lock()
+
+        # Статистика
+        self._published = 0
+        self._batches = 0
+        self._failed = 0
+        self._confirm_time_total = 0.0
+        self._confirm_time_max = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "Publisher":
+        return cls(
+            rabbitmq_url=settings.RABBITMQ_URL,
+            channel_pool_size=settings.RABBITMQ_CHANNEL_POOL_SIZE,
+            confirm_timeout=settings.RABBITMQ_CONFIRM_TIMEOUT,
+            batch_size=settings.RABBITMQ_PUBLISH_BATCH,
+        )
 
     async def connect(self):
-        if not self.connection or self.connection.is_closed:
+        async with self._lock:
+            if self.connection and not self.connection.is_closed:
+                return
             self.connection = await connect_robust(self.rabbitmq_url)
-            self.channel = await self.connection.channel()
-            await self.channel.set_qos(prefetch_count=self.prefetch_count)
+            self._channels = Pool(self._open_channel, max_size=self.channel_pool_size)
+            logger.info("Соединение издателя с RabbitMQ установлено")
+
+    async def _open_channel(self):
+        # Канал с подтверждениями: publish возвращается после ack брокера
+        return await self.connection.channel(publisher_confirms=True)
 
     async def publish(self, queue_name: str, message: str):
-        if not self.channel or self.channel.is_closed:
+        await self.publish_many(queue_name, [message])
+
+    async def publish_many(self, queue_name: str, messages: list[str]):
+        """
+        Публикует сообщения пачками в одном канале: внутри пачки сообщения
+        уходят без ожидания, подтверждения брокера ждутся вместе
+        """
+        if not self.connection or self.connection.is_closed:
             await self.connect()
 
-        await self.channel.default_exchange.publish(
-            Message(body=message.encode()),
-            routing_key=queue_name,
-        )
+        async with self._channels.acquire() as channel:
+            for start in range(0, len(messages), self.batch_size):
+                batch = messages[start : start + self.batch_size]
+                started = time.perf_counter()
+                results = await asyncio.gather(
+                    *(
+                        channel.default_exchange.publish(
+                            self._message(message),
+                            routing_key=queue_name,
+                            timeout=self.confirm_timeout,
+                        )
+                        for message in batch
+                    ),
+                    return_exceptions=True,
+                )
+                self._record_batch(time.perf_counter() - started, results)
+                errors = [result for result in results if isinstance(result, Exception)]
+                if errors:
+                    raise errors[0]
+
+    def stats(self) -> dict:
+        batches = self._batches or 1
+        return {
+            "connected": bool(self.connection and not self.connection.is_closed),
+            "channel_pool_size": self.channel_pool_size,
+            "published": self._published,
+            "failed": self._failed,
+            "batches": self._batches,
+            "confirm_time_avg": self._confirm_time_total / batches,
+            "confirm_time_max": self._confirm_time_max,
+        }
 
     async def close(self):
+        if self._channels and not self._channels.is_closed:
+            await self._channels.close()
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
 
@@ -33,3 +112,24 @@ class Publisher:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
+
+    @staticmethod
+    def _message(message: str) -> Message:
+        # Очередь статей durable — сообщения тоже переживают рестарт брокера
+        return Message(
+            body=message.encode(),
+            content_type="application/json",
+            delivery_mode=DeliveryMode.PERSISTENT,
+        )
+
+    def _record_batch(self, elapsed: float, results: list) -> None:
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        self._batches += 1
+        self._published += len(results) - failed
+        self._failed += failed
+        self._confirm_time_total += elapsed
+        self._confirm_time_max = max(self._confirm_time_max, elapsed)
+
+
+# Общий издатель процесса BFF
+publisher = Publisher.from_settings()
@@ -1,16 +1,39 @@
+import asyncio
+from typing import AsyncIterator, Iterable
+
 from app.article_parser.parser import HabrParser
-from app.article_parser.schemas import SArticleParsed, SParseRequest
-from fastapi import APIRouter, Depends, HTTPException
+from app.article_parser.schemas import (
+    SArticleParsed,
+    SParseBatchItem,
+    SParseBatchRequest,
+    SParseRequest,
+)
+from config import settings
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from starlette.datastructures import State
 
 router = APIRouter(prefix="/api/habr", tags=["habr"])
 
+PARSE_ERROR_DETAIL = "Не удалось распарсить статью по указанному URL"
 
-async def get_parser():
-    parser = HabrParser()
-    try:
-        yield parser
-    finally:
-        await parser.aclose()
+
+def parser_from_state(state: State) -> HabrParser:
+    # Парсер использует общие пулы и кэш страниц из lifespan
+    return HabrParser(
+        client=state.http_client,
+        executor=state.parse_executor,
+        cache=state.fetch_cache,
+        reader=state.page_reader,
+        coalescer=state.coalescer,
+        guard=state.fetch_guard,
+        archive=state.page_archive,
+    )
+
+
+def get_parser(request: Request) -> HabrParser:
+    return parser_from_state(request.app.state)
 
 
 @router.post("/parse", response_model=SArticleParsed)
@@ -19,13 +42,70 @@ async def parse_article(
 ):
     data = await parser.get_article(str(body.url))
     if not data:
-        raise HTTPException(
-            status_code=400,
-            detail="Не удалось распарсить статью по указанному URL",
-        )
+        raise HTTPException(status_code=400, detail=PARSE_ERROR_DETAIL)
     try:
         return SArticleParsed(**data)
     except Exception as e:
         raise HTTPException(
             status_code=502, detail=f"Неверный формат распарсенных данных: {e}"
         )
+
+
+@router.post("/parse/batch", response_class=StreamingResponse)
+async def parse_articles_batch(
+    body: SParseBatchRequest, parser: HabrParser = Depends(get_parser)
+):
+    """
+    Парсит список статей параллельно и отдает результаты в формате NDJSON
+    Строки идут в порядке готовности, а не в порядке URL в запросе
+    """
+    if len(body.urls) > settings.BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не больше {settings.BATCH_MAX_URLS} URL в одном запросе",
+        )
+    urls = (str(url) for url in body.urls)
+    return StreamingResponse(
+        _stream_batch(parser, urls, settings.BATCH_CONCURRENCY),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _parse_batch_item(parser: HabrParser, url: str) -> SParseBatchItem:
+    data = await parser.get_article(url)
+    if not data:
+        return SParseBatchItem(url=url, error=PARSE_ERROR_DETAIL)
+    try:
+        return SParseBatchItem(url=url, article=SArticleParsed(**data))
+    except Exception as e:
+        return SParseBatchItem(
+            url=url, error=f"Неверный формат распарсенных данных: {e}"
+        )
+
+
+async def _stream_batch(
+    parser: HabrParser, urls: Iterable[str], concurrency: int
+) -> AsyncIterator[str]:
+    # Окно из concurrency задач: новый URL берется, только когда готов предыдущий,
+    # поэтому в памяти одновременно не больше concurrency результатов
+    urls = iter(urls)
+    pending: set[asyncio.Task] = set()
+    try:
+        while True:
+            for url in urls:
+                pending.add(asyncio.create_task(_parse_batch_item(parser, url)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result().model_dump_json() + "\n"
+    finally:
+        # Клиент отключился — незачем парсить оставшееся
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info(f"Пакетный парсинг прерван, отменено задач: {len(pending)}")
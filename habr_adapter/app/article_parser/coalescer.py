@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict
+
+from app.article_parser.urls import canonical_url
+from config import settings
+from loguru import logger
+
+
+class RequestCoalescer:
+    """
+    Склеивает одновременные запросы одной статьи в одну загрузку и разбор
+    Все, кто пришел за тем же URL, пока он обрабатывается, ждут общую задачу,
+    а успешный результат еще ttl секунд отдается из небольшого кэша
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._results: OrderedDict[str, tuple[float, Dict]] = OrderedDict()
+
+        # Метрики
+        self._requests = 0
+        self._unique = 0
+        self._coalesced = 0
+        self._cache_hits = 0
+
+    @classmethod
+    def from_settings(cls) -> "RequestCoalescer":
+        return cls(
+            ttl=settings.COALESCE_RESULT_TTL,
+            max_entries=settings.COALESCE_MAX_ENTRIES,
+        )
+
+    async def run(
+        self, url: str, load: Callable[[str], Awaitable[Dict]]
+    ) -> Dict:
+        self._requests += 1
+        key = canonical_url(url)
+
+        cached = self._get_cached(key)
+        if cached is not None:
+            self._cache_hits += 1
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self._unique += 1
+            task = asyncio.create_task(load(url))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+        else:
+            self._coalesced += 1
+            logger.debug(f"Запрос {url} присоединен к уже идущей загрузке")
+
+        # shield: отключение одного клиента не отменяет работу для остальных
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "requests": self._requests,
+            "unique": self._unique,
+            "coalesced": self._coalesced,
+            "cache_hits": self._cache_hits,
+            "in_flight": len(self._in_flight),
+            "cached_results": len(self._results),
+        }
+
+    def _get_cached(self, key: str) -> Dict | None:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._results[key]
+            return None
+        return result
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        # Неудачи не кэшируем: следующий запрос попробует заново
+        if not result:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
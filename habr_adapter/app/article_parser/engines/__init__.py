@@ -0,0 +1,27 @@
+import importlib
+
+from app.article_parser.engines.base import HtmlNode, ParseEngine
+
+# Модули движков импортируются лениво: lxml и selectolax — опциональные зависимости
+ENGINES = {
+    "bs4": ("app.article_parser.engines.bs4_engine", "SoupEngine"),
+    "lxml": ("app.article_parser.engines.lxml_engine", "LxmlEngine"),
+    "selectolax": (
+        "app.article_parser.engines.selectolax_engine",
+        "SelectolaxEngine",
+    ),
+}
+
+
+def get_engine(name: str) -> ParseEngine:
+    """Возвращает движок разбора HTML по имени"""
+    if name not in ENGINES:
+        raise ValueError(
+            f"Неизвестный движок парсинга '{name}', доступны: {', '.join(ENGINES)}"
+        )
+    module_name, class_name = ENGINES[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+__all__ = ["ENGINES", "HtmlNode", "ParseEngine", "get_engine"]
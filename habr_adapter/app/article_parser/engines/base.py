@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+
+class HtmlNode(ABC):
+    """
+    Минимальный интерфейс элемента DOM, которого достаточно парсеру статьи
+    Реализации оборачивают узлы конкретной HTML-библиотеки
+    """
+
+    __slots__ = ()
+
+    # Теги, текст которых не попадает в get_text (как в BeautifulSoup)
+    SKIP_TEXT_TAGS = ("script", "style", "template")
+
+    @property
+    @abstractmethod
+    def name(self) -> str: ...
+
+    @property
+    @abstractmethod
+    def classes(self) -> list[str]: ...
+
+    @abstractmethod
+    def get(self, attr: str) -> str | None: ...
+
+    @abstractmethod
+    def find(
+        self,
+        name: str | None = None,
+        class_: str | None = None,
+        id: str | None = None,
+    ) -> "HtmlNode | None": ...
+
+    @abstractmethod
+    def find_all(self, names: str | Iterable[str]) -> list["HtmlNode"]: ...
+
+    @abstractmethod
+    def get_text(self, strip: bool = False) -> str: ...
+
+    @abstractmethod
+    def children(self) -> Iterator["HtmlNode | str"]:
+        """
+        Прямые потомки в порядке документа: элементы как HtmlNode, текст как str
+        Комментарии и элементы из SKIP_TEXT_TAGS пропускаются
+        """
+
+    @abstractmethod
+    def leading_text(self) -> str:
+        """Текстовый узел, стоящий сразу после открывающего тега"""
+
+    def pre_text(self) -> str:
+        """
+        Текст блока <pre> по правилам HTML5: перевод строки сразу после
+        открывающего тега не является частью содержимого
+        """
+        text = self.get_text()
+        if self.leading_text().startswith("\n"):
+            return text[1:]
+        return text
+
+
+class ParseEngine(ABC):
+    """Строит дерево документа и возвращает его корень"""
+
+    name: str
+
+    @abstractmethod
+    def parse_document(self, html_content: str) -> HtmlNode: ...
+
+
+def tag_names(names: str | Iterable[str]) -> tuple[str, ...]:
+    """Приводит имя тега или набор имен к кортежу"""
+    return (names,) if isinstance(names, str) else tuple(names)
+
+
+def join_strings(strings: Iterable[str], strip: bool) -> str:
+    """Склеивает текстовые узлы так же, как Tag.get_text в BeautifulSoup"""
+    if not strip:
+        return "".join(strings)
+    return "".join(s for s in (s.strip() for s in strings) if s)
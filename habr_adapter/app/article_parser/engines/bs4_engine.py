@@ -0,0 +1,66 @@
+from typing import Iterable, Iterator
+
+from app.article_parser.engines.base import HtmlNode, ParseEngine, tag_names
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+# Типы строк, которые учитывает Tag.get_text
+_TEXT_TYPES = (NavigableString, CData)
+
+
+class SoupNode(HtmlNode):
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag: Tag) -> None:
+        self._tag = tag
+
+    @property
+    def name(self) -> str:
+        return self._tag.name
+
+    @property
+    def classes(self) -> list[str]:
+        return list(self._tag.get("class") or [])
+
+    def get(self, attr: str) -> str | None:
+        value = self._tag.get(attr)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    def find(self, name=None, class_=None, id=None) -> "SoupNode | None":
+        attrs = {}
+        if class_ is not None:
+            attrs["class_"] = class_
+        if id is not None:
+            attrs["id"] = id
+        found = self._tag.find(name, **attrs)
+        return SoupNode(found) if found is not None else None
+
+    def find_all(self, names: str | Iterable[str]) -> list["SoupNode"]:
+        return [SoupNode(tag) for tag in self._tag.find_all(list(tag_names(names)))]
+
+    def get_text(self, strip: bool = False) -> str:
+        return self._tag.get_text(strip=strip)
+
+    def children(self) -> Iterator["SoupNode | str"]:
+        for child in self._tag.children:
+            if isinstance(child, Tag):
+                if child.name not in self.SKIP_TEXT_TAGS:
+                    yield SoupNode(child)
+            elif type(child) in _TEXT_TYPES:
+                yield str(child)
+
+    def leading_text(self) -> str:
+        first = next(iter(self._tag.contents), None)
+        if type(first) is NavigableString:
+            return str(first)
+        return ""
+
+
+class SoupEngine(ParseEngine):
+    """Эталонная реализация на BeautifulSoup и html.parser"""
+
+    name = "bs4"
+
+    def parse_document(self, html_content: str) -> SoupNode:
+        return SoupNode(BeautifulSoup(html_content, "html.parser"))
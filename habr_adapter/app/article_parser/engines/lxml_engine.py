@@ -0,0 +1,78 @@
+from typing import Iterable, Iterator
+
+import lxml.html
+from app.article_parser.engines.base import (
+    HtmlNode,
+    ParseEngine,
+    join_strings,
+    tag_names,
+)
+from lxml import etree
+
+# Текстовые узлы поддерева без содержимого script/style/template и комментариев
+_TEXT_XPATH = etree.XPath(
+    "descendant::text()[not("
+    + " or ".join(f"ancestor::{tag}" for tag in HtmlNode.SKIP_TEXT_TAGS)
+    + ")]"
+)
+
+# huge_tree поднимает лимит libxml2 на глубину вложенности с 256 до 2048
+# уровней: глубже контент молча теряется, и паритет с bs4 не гарантирован
+_HTML_PARSER = lxml.html.HTMLParser(huge_tree=True)
+
+
+class LxmlNode(HtmlNode):
+    __slots__ = ("_el",)
+
+    def __init__(self, el: lxml.html.HtmlElement) -> None:
+        self._el = el
+
+    @property
+    def name(self) -> str:
+        return self._el.tag
+
+    @property
+    def classes(self) -> list[str]:
+        return (self._el.get("class") or "").split()
+
+    def get(self, attr: str) -> str | None:
+        return self._el.get(attr)
+
+    def find(self, name=None, class_=None, id=None) -> "LxmlNode | None":
+        for el in self._el.iterdescendants(name or etree.Element):
+            if id is not None and el.get("id") != id:
+                continue
+            if class_ is not None and class_ not in (el.get("class") or "").split():
+                continue
+            return LxmlNode(el)
+        return None
+
+    def find_all(self, names: str | Iterable[str]) -> list["LxmlNode"]:
+        return [LxmlNode(el) for el in self._el.iterdescendants(*tag_names(names))]
+
+    def get_text(self, strip: bool = False) -> str:
+        return join_strings(_TEXT_XPATH(self._el), strip)
+
+    def children(self) -> Iterator["LxmlNode | str"]:
+        if self._el.text:
+            yield self._el.text
+        for child in self._el:
+            # У комментариев tag — функция, а не строка
+            if isinstance(child.tag, str) and child.tag not in self.SKIP_TEXT_TAGS:
+                yield LxmlNode(child)
+            if child.tail:
+                yield child.tail
+
+    def leading_text(self) -> str:
+        return self._el.text or ""
+
+
+class LxmlEngine(ParseEngine):
+    """Дерево строит libxml2, обход и выборка — на стороне C"""
+
+    name = "lxml"
+
+    def parse_document(self, html_content: str) -> LxmlNode:
+        return LxmlNode(
+            lxml.html.document_fromstring(html_content, parser=_HTML_PARSER)
+        )
@@ -0,0 +1,76 @@
+from typing import Iterable, Iterator
+
+from app.article_parser.engines.base import (
+    HtmlNode,
+    ParseEngine,
+    join_strings,
+    tag_names,
+)
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+
+class SelectolaxNode(HtmlNode):
+    __slots__ = ("_node",)
+
+    def __init__(self, node: LexborNode) -> None:
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def classes(self) -> list[str]:
+        return (self._node.attributes.get("class") or "").split()
+
+    def get(self, attr: str) -> str | None:
+        attributes = self._node.attributes
+        if attr not in attributes:
+            return None
+        # Атрибут без значения lexbor отдает как None
+        return attributes[attr] or ""
+
+    def find(self, name=None, class_=None, id=None) -> "SelectolaxNode | None":
+        selector = name or "*"
+        if id is not None:
+            selector += f'[id="{id}"]'
+        if class_ is not None:
+            selector += f'[class~="{class_}"]'
+        found = self._node.css_first(selector)
+        return SelectolaxNode(found) if found is not None else None
+
+    def find_all(self, names: str | Iterable[str]) -> list["SelectolaxNode"]:
+        selector = ", ".join(tag_names(names))
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def get_text(self, strip: bool = False) -> str:
+        if not self._node.any_css_matches(self.SKIP_TEXT_TAGS):
+            return self._node.text(deep=True, separator="", strip=strip)
+        return join_strings(self._strings(self._node), strip)
+
+    def children(self) -> Iterator["SelectolaxNode | str"]:
+        for child in self._node.iter(include_text=True):
+            if child.is_text_node:
+                yield child.text_content or ""
+            elif child.is_element_node and child.tag not in self.SKIP_TEXT_TAGS:
+                yield SelectolaxNode(child)
+
+    def leading_text(self) -> str:
+        # lexbor уже отбрасывает перевод строки после <pre> при построении дерева
+        return ""
+
+    def _strings(self, node: LexborNode) -> Iterator[str]:
+        for child in node.iter(include_text=True):
+            if child.is_text_node:
+                yield child.text_content or ""
+            elif child.is_element_node and child.tag not in self.SKIP_TEXT_TAGS:
+                yield from self._strings(child)
+
+
+class SelectolaxEngine(ParseEngine):
+    """HTML5-парсер lexbor, самый быстрый из доступных движков"""
+
+    name = "selectolax"
+
+    def parse_document(self, html_content: str) -> SelectolaxNode:
+        return SelectolaxNode(LexborHTMLParser(html_content).root)
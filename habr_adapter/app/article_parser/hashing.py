@@ -0,0 +1,28 @@
+import hashlib
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_block(text: str) -> str:
+    """Текст блока без различий, не влияющих на смысл: Unicode NFC и пробелы"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def block_hash(text: str) -> str:
+    # 64 бит хватает, чтобы различать блоки одной статьи
+    return hashlib.blake2b(normalize_block(text).encode(), digest_size=8).hexdigest()
+
+
+def content_hashes(title: str, blocks: list[str]) -> dict:
+    """
+    Хэш содержимого статьи и хэши ее блоков по порядку
+    По списку хэшей блоков потребитель дешево оценивает долю правок,
+    не храня и не сравнивая сами тексты
+    """
+    hashes = [block_hash(block) for block in blocks]
+    digest = hashlib.sha256(normalize_block(title).encode())
+    for value in hashes:
+        digest.update(value.encode())
+    return {"content_hash": digest.hexdigest(), "block_hashes": hashes}
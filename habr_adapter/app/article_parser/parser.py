@@ -1,7 +1,16 @@
-from typing import Dict
+from typing import Dict, Iterator
 
+import httpx
+from app.article_parser.coalescer import RequestCoalescer
+from app.article_parser.engines import HtmlNode, ParseEngine, get_engine
+from app.article_parser.hashing import content_hashes
+from app.article_parser.streaming import PageReader
+from app.article_parser.urls import article_id, canonical_url
+from app.core.executor import ParseExecutor, ParseTimeoutError
 from app.core.http_client import HTTPXClient
-from bs4 import BeautifulSoup
+from app.fetch_cache import CachedPage, FetchCache
+from app.page_archive import PageArchive
+from app.rate_limit import CircuitOpenError, FetchGuard, RateLimitTimeoutError
 from config import settings
 from loguru import logger
 
@@ -15,24 +24,88 @@ DEFAULT_HEADERS = {
     ),
 }
 
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+LIST_TAGS = {"ul", "ol"}
+# Строчные элементы, текст которых внутри цитаты склеивается в абзац
+INLINE_TAGS = {
+    "a",
+    "abbr",
+    "b",
+    "br",
+    "code",
+    "em",
+    "i",
+    "kbd",
+    "mark",
+    "s",
+    "small",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "u",
+}
+
+
+def create_http_client() -> HTTPXClient:
+    """Создает клиент к Habr с пулом соединений по настройкам приложения"""
+    return HTTPXClient(
+        headers=DEFAULT_HEADERS,
+        proxy=settings.PROXY_URL,
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.HTTP2_ENABLED,
+    )
+
 
 class HabrParser:
-    def __init__(self, client: HTTPXClient | None = None) -> None:
-        self.client = client or HTTPXClient(
-            headers=DEFAULT_HEADERS, proxy=settings.PROXY_URL
-        )
+    def __init__(
+        self,
+        client: HTTPXClient | None = None,
+        engine: ParseEngine | None = None,
+        executor: ParseExecutor | None = None,
+        cache: FetchCache | None = None,
+        reader: PageReader | None = None,
+        coalescer: RequestCoalescer | None = None,
+        guard: FetchGuard | None = None,
+        archive: PageArchive | None = None,
+    ) -> None:
+        # Переданный клиент общий для приложения — закрывать его не нам
+        self._owns_client = client is None
+        self.client = client or create_http_client()
+        self.engine = engine or get_engine(settings.PARSE_ENGINE)
+        self.executor = executor
+        self.cache = cache
+        self.reader = reader or PageReader.from_settings()
+        self.coalescer = coalescer
+        self.guard = guard
+        self.archive = archive
 
     async def aclose(self):
-        await self.client.close()
+        if self._owns_client:
+            await self.client.close()
 
     async def get_article(self, url: str) -> Dict:
+        if self.coalescer is None:
+            return await self._load_article(url)
+        return await self.coalescer.run(url, self._load_article)
+
+    async def _load_article(self, url: str) -> Dict:
         logger.info(f"Начинаем обработку URL: {url}")
         try:
-            resp = await self.client.request("GET", url)
-            resp.raise_for_status()
-            html_content = resp.text
+            html_content = await self.fetch(url)
 
-            parsed_data = await self.parse(html_content, url)
+            # В результат попадает канонический URL: по нему статью ищет BFF
+            parsed_data = await self.parse(html_content, canonical_url(url))
 
             if parsed_data.get("title"):
                 logger.success(
@@ -42,129 +115,256 @@ class HabrParser:
                 logger.warning(f"Не удалось извлечь заголовок для URL: {url}")
 
             return parsed_data
+        except ParseTimeoutError as e:
+            logger.warning(f"Разбор {url} прерван по таймауту: {e}")
+            return {}
+        except (CircuitOpenError, RateLimitTimeoutError) as e:
+            logger.warning(f"Загрузка {url} отложена: {e}")
+            return {}
         except Exception as e:
             logger.error(
                 f"Непредвиденная ошибка при обработке {url}: {e}", exc_info=True
             )
             return {}
 
-    async def parse(self, html_content: str, url: str) -> Dict:
-        logger.debug("Начинаем парсинг HTML-контента страницы Хабра.")
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # Основной блок статьи
-        article_block = soup.find(
-            "article", class_="tm-article-presenter__content"
-        ) or soup.find("article")
-        if not article_block:
-            logger.warning("Не найден основной блок статьи ('article').")
-            return {}
+    async def fetch(self, url: str) -> str:
+        """Загружает страницу, по возможности ревалидируя копию из кэша"""
+        cached = None
+        if self.cache:
+            # Все формы ссылки на статью делят одну запись кэша; кэш
+            # вспомогательный: без него страница просто загружается целиком
+            try:
+                cached = await self.cache.get(canonical_url(url))
+            except Exception as e:
+                logger.error(f"Не удалось прочитать {url} из кэша страниц: {e}")
+        if self.guard is None:
+            return await self._fetch_once(url, cached)
+        return await self.guard.call(url, lambda: self._fetch_once(url, cached))
 
-        # Заголовок, автор, время публикации
-        title_tag = article_block.find("h1") or soup.find("h1")
-        title = title_tag.get_text(strip=True) if title_tag else ""
-
-        author_tag = article_block.find(
-            "a", class_="tm-user-info__username"
-        ) or soup.find("a", class_="tm-user-info__username")
-        author = author_tag.get_text(strip=True) if author_tag else ""
-
-        time_tag = article_block.find("time") or soup.find("time")
-        publish_time = time_tag.get("datetime") if time_tag else ""
-
-        # Контейнер с телом статьи
-        article_body = article_block.find(
-            "div", id="post-content-body"
-        ) or soup.select_one("#post-content-body")
-        if not article_body:
-            logger.warning("Не найден контент статьи ('post-content-body').")
-            return {
-                "title": title,
-                "author": author,
-                "publish_time": publish_time,
-                "url": url,
-                "text": "",
-            }
-
-        parsed_content = []
-        # Ищем основной контейнер, где лежит весь форматированный текст
-        content_container = (
-            article_body.find("div", class_="article-formatted-body")
-            or article_body
-        )
+    async def _fetch_once(self, url: str, cached: CachedPage | None) -> str:
+        headers = {**DEFAULT_HEADERS, **(cached.validators if cached else {})}
 
-        if not content_container:
-            logger.warning("Не найден контейнер 'article-formatted-body'.")
-            return {
-                "title": title,
-                "author": author,
-                "publish_time": publish_time,
-                "url": url,
-                "text": "",
-            }
-
-        # Итерация по всем основным тегам контента
-        tags_to_parse = [
-            "p",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-            "pre",
-            "ul",
-            "ol",
-            "figure",
-            "blockquote",
-        ]
-        for tag in content_container.find_all(tags_to_parse):
-            if tag.name.startswith("h"):
-                level = int(tag.name[1])
-                parsed_content.append(f"{'#' * level} {tag.get_text(strip=True)}")
-            elif tag.name == "p":
-                parsed_content.append(tag.get_text(strip=True))
-            elif tag.name == "pre":
-                code_text = tag.get_text()
-                lang = ""
-                code_tag = tag.find("code")
-                if code_tag and code_tag.has_attr("class"):
-                    # извлекаем язык из класса вида 'language-python'
-                    for cls in code_tag["class"]:
-                        if cls.startswith("language-"):
-                            lang = cls.split("-", 1)[-1]
-                            break
-                lang_suffix = lang if lang else ""
-                parsed_content.append(f"```{lang_suffix}\n{code_text}\n```")
-            elif tag.name in ["ul", "ol"]:
-                list_items = []
-                for i, li in enumerate(tag.find_all("li"), 1):
-                    prefix = f"{i}." if tag.name == "ol" else "*"
-                    list_items.append(f"  {prefix} {li.get_text(strip=True)}")
-                parsed_content.append("\n".join(list_items))
-            elif tag.name == "figure":
-                img = tag.find("img")
-                if img and img.has_attr("src"):
-                    caption_tag = tag.find("figcaption")
-                    caption = (
-                        caption_tag.get_text(strip=True)
-                        if caption_tag
-                        else "image"
+        async with self.client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304 and cached:
+                logger.debug(f"Страница не изменилась, берем из кэша: {url}")
+                self.cache.mark_not_modified()
+                return cached.body
+
+            resp.raise_for_status()
+            html_content = await self.reader.read(resp)
+
+        if self.archive:
+            # Архив вспомогательный: полный диск не должен ронять загрузку
+            try:
+                await self.archive.append(url, html_content)
+            except Exception as e:
+                logger.error(f"Не удалось записать {url} в архив страниц: {e}")
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        # Без валидаторов ревалидировать нечем — такую страницу не храним
+        if self.cache and (etag or last_modified):
+            try:
+                await self.cache.set(
+                    CachedPage(
+                        url=canonical_url(url),
+                        body=html_content,
+                        etag=etag,
+                        last_modified=last_modified,
                     )
-                    parsed_content.append(f"![{caption}]({img['src']})")
-            elif tag.name == "blockquote":
-                quoted_text = "\n".join(
-                    [f"> {line}" for line in tag.get_text(strip=True).split("\n")]
                 )
-                parsed_content.append(quoted_text)
+            except Exception as e:
+                logger.error(f"Не удалось записать {url} в кэш страниц: {e}")
+        return html_content
+
+    async def parse(self, html_content: str, url: str) -> Dict:
+        # Без пула разбор идет прямо в event loop (скрипты, бенчмарки)
+        if self.executor is None:
+            return parse_html(html_content, url, self.engine)
+        return await self.executor.submit(
+            parse_html, html_content, url, self.engine.name
+        )
+
+
+def parse_html(html_content: str, url: str, engine: ParseEngine | str) -> Dict:
+    """
+    Синхронный разбор страницы статьи в markdown
+    Выполняется в пуле парсинга, поэтому движок можно передать по имени
+    """
+    if isinstance(engine, str):
+        engine = get_engine(engine)
+    logger.debug(f"Начинаем парсинг HTML-контента страницы Хабра ({engine.name}).")
+    soup = engine.parse_document(html_content)
+
+    # Основной блок статьи
+    article_block = soup.find(
+        "article", class_="tm-article-presenter__content"
+    ) or soup.find("article")
+    if not article_block:
+        logger.warning("Не найден основной блок статьи ('article').")
+        return {}
+
+    # Заголовок, автор, время публикации
+    title_tag = article_block.find("h1") or soup.find("h1")
+    title = title_tag.get_text(strip=True) if title_tag else ""
 
-        final_text = "\n\n".join(filter(None, parsed_content))
+    author_tag = article_block.find(
+        "a", class_="tm-user-info__username"
+    ) or soup.find("a", class_="tm-user-info__username")
+    author = author_tag.get_text(strip=True) if author_tag else ""
 
-        logger.debug("Парсинг HTML-контента Хабра завершен.")
+    time_tag = article_block.find("time") or soup.find("time")
+    publish_time = time_tag.get("datetime") if time_tag else ""
+
+    # Контейнер с телом статьи
+    article_body = article_block.find(
+        "div", id="post-content-body"
+    ) or soup.find(id="post-content-body")
+    if not article_body:
+        logger.warning("Не найден контент статьи ('post-content-body').")
+        return {
+            "title": title,
+            "author": author,
+            "publish_time": publish_time,
+            "url": url,
+            "article_id": article_id(url),
+            "text": "",
+        }
+
+    # Ищем основной контейнер, где лежит весь форматированный текст
+    content_container = (
+        article_body.find("div", class_="article-formatted-body")
+        or article_body
+    )
+
+    if not content_container:
+        logger.warning("Не найден контейнер 'article-formatted-body'.")
         return {
             "title": title,
             "author": author,
             "publish_time": publish_time,
             "url": url,
-            "text": final_text,
+            "article_id": article_id(url),
+            "text": "",
         }
+
+    # Один проход по дереву контента: каждый узел посещается ровно раз
+    blocks = [block for block in iter_blocks(content_container) if block]
+    final_text = "\n\n".join(blocks)
+
+    logger.debug("Парсинг HTML-контента Хабра завершен.")
+    return {
+        "title": title,
+        "author": author,
+        "publish_time": publish_time,
+        "url": url,
+        "article_id": article_id(url),
+        "text": final_text,
+        **content_hashes(title, blocks),
+    }
+
+
+def iter_blocks(container: HtmlNode, keep_text: bool = False) -> Iterator[str]:
+    """
+    Обходит поддерево один раз и отдает markdown-блоки в порядке документа
+    Блочный элемент (абзац, заголовок, код, список, рисунок, цитата) выводится
+    целиком и внутрь него обход не спускается, поэтому вложенные абзацы
+    и списки не дублируются. Прочие контейнеры обходятся явным стеком,
+    чтобы глубокая вложенность не упиралась в лимит рекурсии.
+    keep_text склеивает свободный текст и строчные теги в абзацы (для цитат).
+    """
+    stack = [container.children()]
+    inline: list[str] = []
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            if inline:
+                yield "".join(inline)
+                inline = []
+            continue
+        if isinstance(child, str):
+            if keep_text:
+                inline.append(child.strip())
+            continue
+        name = child.name
+        if keep_text and name in INLINE_TAGS:
+            inline.append(child.get_text(strip=True))
+            continue
+        if inline:
+            yield "".join(inline)
+            inline = []
+
+        if name in HEADING_TAGS:
+            yield f"{'#' * int(name[1])} {child.get_text(strip=True)}"
+        elif name == "p":
+            yield child.get_text(strip=True)
+        elif name == "pre":
+            yield render_code(child)
+        elif name in LIST_TAGS:
+            yield "\n".join(render_list(child))
+        elif name == "figure":
+            yield render_figure(child)
+        elif name == "blockquote":
+            yield render_quote(child)
+        else:
+            stack.append(child.children())
+
+
+def render_code(pre: HtmlNode) -> str:
+    lang = ""
+    code_tag = pre.find("code")
+    if code_tag:
+        # извлекаем язык из класса вида 'language-python'
+        for cls in code_tag.classes:
+            if cls.startswith("language-"):
+                lang = cls.split("-", 1)[-1]
+                break
+    return f"```{lang}\n{pre.pre_text()}\n```"
+
+
+def render_list(list_tag: HtmlNode, depth: int = 0) -> list[str]:
+    """Строки markdown-списка; вложенные списки сдвигаются на уровень глубже"""
+    lines = []
+    indent = "  " * (depth + 1)
+    index = 0
+    for item in list_tag.children():
+        if isinstance(item, str):
+            continue
+        if item.name in LIST_TAGS:
+            lines.extend(render_list(item, depth + 1))
+            continue
+        index += 1
+        prefix = f"{index}." if list_tag.name == "ol" else "*"
+        text = []
+        nested = []
+        for part in item.children():
+            if isinstance(part, str):
+                text.append(part.strip())
+            elif part.name in LIST_TAGS:
+                nested.extend(render_list(part, depth + 1))
+            elif part.name == "pre":
+                # Код внутри пункта — отдельным блоком под текстом пункта
+                pad = " " * (len(indent) + len(prefix) + 1)
+                nested.extend(pad + line for line in render_code(part).split("\n"))
+            else:
+                text.append(part.get_text(strip=True))
+        lines.append(f"{indent}{prefix} {''.join(text)}")
+        lines.extend(nested)
+    return lines
+
+
+def render_figure(figure: HtmlNode) -> str:
+    img = figure.find("img")
+    if not img or img.get("src") is None:
+        return ""
+    caption_tag = figure.find("figcaption")
+    caption = caption_tag.get_text(strip=True) if caption_tag else "image"
+    return f"![{caption}]({img.get('src')})"
+
+
+def render_quote(quote: HtmlNode) -> str:
+    blocks = [block for block in iter_blocks(quote, keep_text=True) if block]
+    return "\n>\n".join(
+        "\n".join(f"> {line}" for line in block.split("\n")) for block in blocks
+    )
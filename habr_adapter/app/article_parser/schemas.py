@@ -13,4 +13,21 @@ class SArticleParsed(BaseModel):
     author: str | None = None
     publish_time: str | None = None
     url: AnyUrl
+    article_id: int | None = None
     text: str
+    content_hash: str | None = None
+    block_hashes: list[str] = Field(
+        default_factory=list, description="Хэши блоков текста по порядку"
+    )
+
+
+class SParseBatchRequest(BaseModel):
+    urls: list[AnyUrl] = Field(
+        ..., min_length=1, description="Список URL статей на Habr"
+    )
+
+
+class SParseBatchItem(BaseModel):
+    url: str
+    article: SArticleParsed | None = None
+    error: str | None = None
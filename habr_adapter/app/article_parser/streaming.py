@@ -0,0 +1,189 @@
+import re
+
+import httpx
+from config import settings
+from loguru import logger
+
+ARTICLE_CLASS = "tm-article-presenter__content"
+
+# Открывающие конструкции, которые сканер должен распознать в потоке.
+# Комментарии и <script> пропускаются целиком: внутри них тоже встречается <article
+# Разметка ASCII, поэтому сканер работает с байтами и не ждет декодирования
+_TOKEN_RE = re.compile(
+    rb"<!--|<script\b|<(/?)article\b([^>]*)(>)?", re.IGNORECASE
+)
+_SCRIPT_END_RE = re.compile(rb"</script\s*>", re.IGNORECASE)
+_CLASS_RE = re.compile(rb"""(?:^|\s)class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+# Сколько байт в конце буфера может занимать незавершенный токен
+_TAIL = len("</article")
+_COMMENT_END = b"-->"
+_SCRIPT_END_TAIL = len("</script>") + 16
+
+
+class PageTooLargeError(Exception):
+    """Страница больше допустимого размера"""
+
+
+class ArticleBoundaryScanner:
+    """
+    Инкрементально ищет в потоке HTML границы блока статьи
+    (article.tm-article-presenter__content), не строя дерево
+    """
+
+    def __init__(self) -> None:
+        # bytearray дописывается на месте: конкатенация копировала бы весь буфер
+        self.buffer = bytearray()
+        self.start: int | None = None
+        self.end: int | None = None
+        self._pos = 0
+        # Откуда продолжать поиск конца недочитанного комментария или <script>
+        self._close_from = 0
+        self._depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Добавляет кусок документа; True, когда блок статьи закрылся"""
+        self.buffer += chunk
+        while not self.done:
+            match = _TOKEN_RE.search(self.buffer, self._pos)
+            if not match:
+                self._pos = max(self._pos, len(self.buffer) - _TAIL)
+                break
+            token = match.group(0)
+            # Уже просмотренная часть комментария или скрипта не сканируется заново
+            close_from = max(match.end(), self._close_from)
+            if token == b"<!--":
+                close = self.buffer.find(_COMMENT_END, close_from)
+                if close == -1:
+                    self._wait_close(match, len(_COMMENT_END))
+                    break
+                self._pos = close + len(_COMMENT_END)
+                self._close_from = 0
+            elif token.lower().startswith(b"<script"):
+                close = _SCRIPT_END_RE.search(self.buffer, close_from)
+                if not close:
+                    self._wait_close(match, _SCRIPT_END_TAIL)
+                    break
+                self._pos = close.end()
+                self._close_from = 0
+            elif match.group(3) is None:
+                # Тег еще не дочитан до '>'
+                self._pos = match.start()
+                break
+            else:
+                self._pos = match.end()
+                self._on_article_tag(
+                    match.start(), match.end(), match.group(1), match.group(2)
+                )
+        return self.done
+
+    def article_html(self, encoding: str = "utf-8") -> str | None:
+        if not self.done:
+            return None
+        return self.buffer[self.start : self.end].decode(encoding, errors="replace")
+
+    def _wait_close(self, match: re.Match, marker_len: int) -> None:
+        self._pos = match.start()
+        self._close_from = max(match.end(), len(self.buffer) - marker_len)
+
+    def _on_article_tag(
+        self, start: int, end: int, slash: bytes, attrs: bytes
+    ) -> None:
+        if slash:
+            if self.start is not None:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = end
+            return
+        if self.start is not None:
+            self._depth += 1
+            return
+        class_match = _CLASS_RE.search(attrs)
+        classes = b""
+        if class_match:
+            classes = next((g for g in class_match.groups() if g), b"")
+        if ARTICLE_CLASS.encode() in classes.split():
+            self.start = start
+            self._depth = 1
+
+
+class PageReader:
+    """
+    Дочитывает тело ответа с ограничением размера
+    В режиме early_stop прекращает чтение, как только закрылся блок статьи,
+    и возвращает только его: парсер строит дерево лишь для этого поддерева
+    """
+
+    def __init__(self, max_bytes: int, early_stop: bool = False) -> None:
+        self.max_bytes = max_bytes
+        self.early_stop = early_stop
+
+        # Метрики
+        self._pages = 0
+        self._early_stops = 0
+        self._bytes_downloaded = 0
+        self._bytes_skipped = 0
+
+    @classmethod
+    def from_settings(cls) -> "PageReader":
+        early_stop = settings.FETCH_EARLY_STOP
+        if early_stop and settings.ARCHIVE_ENABLED:
+            # В архив попал бы только блок статьи, а перепарсинг ждет страницу целиком
+            logger.warning("FETCH_EARLY_STOP не действует вместе с ARCHIVE_ENABLED")
+            early_stop = False
+        return cls(max_bytes=settings.FETCH_MAX_BODY_BYTES, early_stop=early_stop)
+
+    async def read(self, resp: httpx.Response) -> str:
+        scanner = ArticleBoundaryScanner() if self.early_stop else None
+        chunks: list[bytes] = []
+        # Считаем распакованные байты: gzip/br страница по сети может быть
+        # во много раз меньше того, что окажется в памяти
+        received = 0
+        try:
+            async for chunk in resp.aiter_bytes():
+                received += len(chunk)
+                if received > self.max_bytes:
+                    raise PageTooLargeError(
+                        f"Страница {resp.url} больше {self.max_bytes} байт"
+                    )
+                if scanner is None:
+                    chunks.append(chunk)
+                elif scanner.feed(chunk):
+                    break
+        finally:
+            self._record(resp, stopped=bool(scanner and scanner.done))
+
+        encoding = resp.encoding or "utf-8"
+        if scanner is None:
+            return b"".join(chunks).decode(encoding, errors="replace")
+        if scanner.done:
+            return scanner.article_html(encoding)
+        # Блок статьи не нашелся — отдаем страницу целиком
+        return scanner.buffer.decode(encoding, errors="replace")
+
+    def stats(self) -> dict:
+        return {
+            "max_bytes": self.max_bytes,
+            "early_stop": self.early_stop,
+            "pages": self._pages,
+            "early_stops": self._early_stops,
+            "bytes_downloaded": self._bytes_downloaded,
+            "bytes_skipped": self._bytes_skipped,
+        }
+
+    def _record(self, resp: httpx.Response, stopped: bool) -> None:
+        self._pages += 1
+        self._bytes_downloaded += resp.num_bytes_downloaded
+        if not stopped:
+            return
+        self._early_stops += 1
+        # Сэкономленный объем известен, только если сервер прислал Content-Length
+        content_length = resp.headers.get("Content-Length")
+        if content_length and content_length.isdigit():
+            skipped = max(int(content_length) - resp.num_bytes_downloaded, 0)
+            self._bytes_skipped += skipped
+            logger.debug(f"Чтение {resp.url} остановлено, пропущено {skipped} байт")
@@ -0,0 +1,51 @@
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+# Хосты, на которых живут статьи Habr (включая старые домены)
+HABR_HOSTS = {"habr.com", "m.habr.com", "habrahabr.ru", "geektimes.ru", "geektimes.com"}
+
+# id статьи во всех формах ссылок: /ru/articles/1/, /en/articles/1/,
+# /ru/companies/x/articles/1/, /post/1/, /p/1/, /company/x/blog/1/, /news/t/1/
+_ARTICLE_ID_RE = re.compile(r"/(?:articles|post|p|blog|news(?:/t)?)/(\d+)(?:/|$)")
+
+CANONICAL_URL = "https://habr.com/ru/articles/{article_id}/"
+
+
+def _split(url: str) -> tuple[str, str]:
+    """Хост без www и путь; ссылка без схемы считается https"""
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url.lstrip('/')}"
+    parts = urlsplit(url)
+    return (parts.hostname or "").lower().removeprefix("www."), parts.path
+
+
+def normalize_url(url: str) -> str:
+    """
+    Приводит URL статьи к единому виду для дедупликации запросов:
+    https, хост в нижнем регистре, без www, query, фрагмента и завершающего '/'
+    """
+    host, path = _split(url)
+    path = path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, "", ""))
+
+
+def article_id(url: str) -> int | None:
+    """Стабильный id статьи Habr из любой формы ссылки; None для чужих URL"""
+    host, path = _split(url)
+    if host not in HABR_HOSTS:
+        return None
+    match = _ARTICLE_ID_RE.search(path)
+    return int(match.group(1)) if match else None
+
+
+def canonical_url(url: str) -> str:
+    """
+    Единый URL статьи, по которому ее ключуют кэши, архив и BFF
+    Язык, блог компании, utm-метки и завершающий '/' на него не влияют.
+    Ссылки без id статьи только нормализуются
+    """
+    found = article_id(url)
+    if found is None:
+        return normalize_url(url)
+    return CANONICAL_URL.format(article_id=found)
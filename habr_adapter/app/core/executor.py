@@ -0,0 +1,220 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from config import settings
+from loguru import logger
+
+
+class ParseTimeoutError(Exception):
+    """Разбор документа не уложился в отведенное время"""
+
+
+def _init_worker() -> None:
+    # В дочерних процессах пишем только в консоль: файл лога ротирует основной процесс
+    logger.remove()
+    logger.add(sys.stderr, level=settings.CONSOLE_LOG_LEVEL)
+
+
+def _noop() -> None:
+    return None
+
+
+def _discard_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+def _timed_call(func: Callable, *args: Any) -> tuple[Any, float, float]:
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic() - started
+
+
+class ParseExecutor:
+    """
+    Выносит CPU-bound разбор HTML из event loop в пул процессов или потоков
+    Ограничивает число одновременных разборов и время одного разбора.
+    В режиме thread таймаут отвечает вызывающему, но поток дорабатывает
+    сам, и до тех пор занимает слот в ограничении одновременных разборов
+    """
+
+    def __init__(
+        self,
+        mode: str = "process",
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Неизвестный режим пула парсинга: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Пока разборов не больше, чем воркеров, задачи не стоят в очереди
+        # самого пула и таймаут считает только время разбора
+        self.max_concurrency = max_concurrency or self.max_workers
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pool = self._create_pool()
+        self._warming: asyncio.Task | None = None
+
+        # Метрики
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._overrunning = 0
+        self._pool_restarts = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._duration_total = 0.0
+        self._duration_max = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "ParseExecutor":
+        return cls(
+            mode=settings.PARSE_EXECUTOR,
+            max_workers=settings.PARSE_WORKERS,
+            max_concurrency=settings.PARSE_MAX_CONCURRENCY,
+            timeout=settings.PARSE_TIMEOUT,
+        )
+
+    async def warm_up(self) -> None:
+        """Поднимает воркеры заранее, чтобы их старт не съедал таймаут разбора"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._pool, _noop)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    async def submit(self, func: Callable, *args: Any) -> Any:
+        """
+        Выполняет func(*args) в пуле и возвращает результат
+        В режиме process func и аргументы должны сериализоваться pickle
+        """
+        queued = time.monotonic()
+        await self._semaphore.acquire()
+        release = True
+        self._in_flight += 1
+        try:
+            # Вторая попытка нужна, если пул пересоздали из-за чужого таймаута
+            for attempt in (1, 2):
+                # Старт воркеров нового пула не входит в таймаут разбора
+                if self._warming is not None:
+                    await asyncio.shield(self._warming)
+                pool = self._pool
+                work = pool.submit(_timed_call, func, *args)
+                waiter = asyncio.wrap_future(work)
+                try:
+                    # shield: по таймауту ждать перестаем, но исход разбора
+                    # нужен, чтобы вовремя освободить слот
+                    result, started, duration = await asyncio.wait_for(
+                        asyncio.shield(waiter), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    self._timeouts += 1
+                    # Результат брошенного разбора никому не нужен
+                    waiter.add_done_callback(_discard_result)
+                    if self.mode == "thread":
+                        # Поток не остановить: слот остается занятым, пока
+                        # разбор на самом деле не закончится
+                        release = False
+                        self._release_when_done(work)
+                    else:
+                        self._restart_pool(pool)
+                    raise ParseTimeoutError(f"Разбор не уложился в {self.timeout} с")
+                except BrokenProcessPool:
+                    if attempt == 2:
+                        raise
+                    self._restart_pool(pool)
+                    continue
+                break
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            if release:
+                self._semaphore.release()
+
+        self._record(max(started - queued, 0.0), duration)
+        return result
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        completed = self._completed or 1
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "overrunning": self._overrunning,
+            "pool_restarts": self._pool_restarts,
+            "queue_wait_avg": self._queue_wait_total / completed,
+            "queue_wait_max": self._queue_wait_max,
+            "parse_duration_avg": self._duration_total / completed,
+            "parse_duration_max": self._duration_max,
+        }
+
+    def _create_pool(self) -> Executor:
+        if self.mode == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="parse"
+            )
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _release_when_done(self, work: Future) -> None:
+        """Отдает слот пула, когда зависший поток все-таки доработает"""
+        loop = asyncio.get_running_loop()
+        self._overrunning += 1
+
+        def done(_: Future) -> None:
+            self._overrunning -= 1
+            self._semaphore.release()
+
+        work.add_done_callback(lambda future: loop.call_soon_threadsafe(done, future))
+
+    def _restart_pool(self, pool: Executor) -> None:
+        """
+        Пересоздает пул процессов, убивая зависший разбор
+        Поток остановить нельзя, поэтому в режиме thread пул не трогаем
+        """
+        if self.mode == "thread" or pool is not self._pool:
+            return
+        logger.warning("Перезапуск пула парсинга после зависшего разбора")
+        self._pool = self._create_pool()
+        self._pool_restarts += 1
+        self._warming = asyncio.get_running_loop().create_task(self.warm_up())
+        # У ProcessPoolExecutor нет публичного способа убить воркеры
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, queue_wait: float, duration: float) -> None:
+        self._completed += 1
+        self._queue_wait_total += queue_wait
+        self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+        self._duration_total += duration
+        self._duration_max = max(self._duration_max, duration)
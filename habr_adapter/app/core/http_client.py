@@ -1,33 +1,56 @@
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import httpx
+from app.core.cassette import cassette_transport
 from config import settings
 
+# События httpcore, после которых запрос получил соединение из пула
+_CONNECTION_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
 
 class HTTPXClient:
     def __init__(
         self,
         headers: dict | None = None,
         proxy: str | None = None,
-        timeout: int = 60,
+        timeout: float | httpx.Timeout = 60,
         base_url: str | None = None,
         follow_redirects: bool = True,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
-        if proxy:
-            transport = httpx.AsyncHTTPTransport(proxy=proxy)
-            self._client = httpx.AsyncClient(
-                timeout=timeout,
-                transport=transport,
-                follow_redirects=follow_redirects,
-            )
-        else:
-            self._client = httpx.AsyncClient(
-                timeout=timeout, follow_redirects=follow_redirects
-            )
+        limits = limits or httpx.Limits()
+        # Свой транспорт подменяет сеть целиком (бенчмарки, тесты)
+        transport = transport or httpx.AsyncHTTPTransport(
+            proxy=proxy, limits=limits, http2=http2
+        )
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            # Кассета (HTTP_CASSETTE_MODE) пишет или подменяет ответы сети
+            transport=cassette_transport(transport),
+            follow_redirects=follow_redirects,
+        )
+        self._transport = transport
         self._headers = headers or {}
         self._proxy = proxy
         self._base_url = base_url
         self._follow_redirects = follow_redirects
+        self._limits = limits
+        self._http2 = http2
+
+        # Статистика пула
+        self._in_flight = 0
+        self._requests_total = 0
+        self._connections_opened = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
 
     async def __aenter__(self):
         return self
@@ -39,13 +62,76 @@ class HTTPXClient:
         self, method: str, path: str, **kwargs: Any
     ) -> httpx.Response:
         url = self._build_url(path)
-        if "headers" not in kwargs:
-            kwargs["headers"] = self._headers
-        return await self._client.request(method.upper(), url, **kwargs)
+        kwargs = self._prepare(kwargs)
+        self._in_flight += 1
+        try:
+            return await self._client.request(method.upper(), url, **kwargs)
+        finally:
+            self._in_flight -= 1
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, path: str, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """Запрос без чтения тела: его можно читать по кускам и бросить на середине"""
+        url = self._build_url(path)
+        kwargs = self._prepare(kwargs)
+        self._in_flight += 1
+        try:
+            async with self._client.stream(method.upper(), url, **kwargs) as resp:
+                yield resp
+        finally:
+            self._in_flight -= 1
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    def pool_stats(self) -> dict:
+        """Возвращает текущее состояние пула соединений"""
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        closed = sum(1 for conn in connections if conn.is_closed())
+        waited = self._requests_total or 1
+        return {
+            "http2": self._http2,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "connections": len(connections),
+            "connections_in_use": len(connections) - idle - closed,
+            "connections_idle": idle,
+            "connections_opened": self._connections_opened,
+            "requests_in_flight": self._in_flight,
+            "requests_total": self._requests_total,
+            "wait_time_avg": self._wait_time_total / waited,
+            "wait_time_max": self._wait_time_max,
+        }
+
+    def _prepare(self, kwargs: dict) -> dict:
+        if "headers" not in kwargs:
+            kwargs["headers"] = self._headers
+
+        started = time.perf_counter()
+        acquired = False
+
+        async def trace(event_name: str, info: dict) -> None:
+            nonlocal acquired
+            if event_name == "connection.connect_tcp.started":
+                self._connections_opened += 1
+            if not acquired and event_name in _CONNECTION_ACQUIRED_EVENTS:
+                acquired = True
+                self._record_wait(time.perf_counter() - started)
+
+        extensions = kwargs.pop("extensions", None) or {}
+        extensions.setdefault("trace", trace)
+        kwargs["extensions"] = extensions
+        self._requests_total += 1
+        return kwargs
+
+    def _record_wait(self, elapsed: float) -> None:
+        self._wait_time_total += elapsed
+        self._wait_time_max = max(self._wait_time_max, elapsed)
+
     def _build_url(self, path: str) -> str:
         # Если абсолютный URL — вернуть как есть
         if path.startswith("http://") or path.startswith("https://"):
@@ -0,0 +1,16 @@
+from app.crawler.crawler import HubCrawler
+from app.crawler.listing import ListingItem, parse_listing
+from app.crawler.sink import ArticleSink, MemorySink, PipelineSink
+from app.crawler.state import CrawlState, MemoryCrawlState, RedisCrawlState
+
+__all__ = [
+    "ArticleSink",
+    "CrawlState",
+    "HubCrawler",
+    "ListingItem",
+    "MemoryCrawlState",
+    "MemorySink",
+    "PipelineSink",
+    "RedisCrawlState",
+    "parse_listing",
+]
@@ -0,0 +1,210 @@
+import asyncio
+import time
+
+from app.article_parser.parser import DEFAULT_HEADERS, HabrParser
+from app.crawler.listing import ListingItem, parse_listing
+from app.crawler.sink import ArticleSink
+from app.crawler.state import CrawlState
+from config import settings
+from loguru import logger
+
+
+class HubCrawler:
+    """
+    Обходит ленты и хабы Habr и отдает новые статьи в разбор и суммаризацию
+    Для каждого источника помнит самый новый уже взятый id, поэтому листает
+    выдачу только до него. Найденные URL идут через ограниченную очередь:
+    если воркеры не успевают, обход ленты ждет, а не копит URL в памяти
+    """
+
+    def __init__(
+        self,
+        parser: HabrParser,
+        state: CrawlState,
+        sink: ArticleSink,
+        sources: list[str],
+        base_url: str = "https://habr.com/ru/",
+        max_pages: int = 5,
+        queue_size: int = 100,
+        workers: int = 4,
+        interval: float = 600.0,
+    ) -> None:
+        self.parser = parser
+        self.state = state
+        self.sink = sink
+        self.sources = sources
+        self.base_url = base_url.rstrip("/") + "/"
+        self.max_pages = max_pages
+        self.queue_size = queue_size
+        self.workers = workers
+        self.interval = interval
+
+        # Метрики
+        self._runs = 0
+        self._skipped_runs = 0
+        self._listing_pages = 0
+        self._discovered = 0
+        self._sent = 0
+        self._failed = 0
+        self._last_run_at: float | None = None
+
+    @classmethod
+    def from_settings(
+        cls, parser: HabrParser, state: CrawlState, sink: ArticleSink
+    ) -> "HubCrawler":
+        return cls(
+            parser=parser,
+            state=state,
+            sink=sink,
+            sources=settings.CRAWLER_SOURCES,
+            base_url=settings.CRAWLER_BASE_URL,
+            max_pages=settings.CRAWLER_MAX_PAGES,
+            queue_size=settings.CRAWLER_QUEUE_SIZE,
+            workers=settings.CRAWLER_WORKERS,
+            interval=settings.CRAWLER_INTERVAL,
+        )
+
+    def listing_url(self, source: str, page: int) -> str:
+        url = f"{self.base_url}{source.strip('/')}/"
+        return url if page == 1 else f"{url}page{page}/"
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Обход лент Habr завершился ошибкой: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> dict[str, int]:
+        """Один обход всех источников; возвращает новый последний id по каждому"""
+        if not await self.state.acquire_run(ttl=self.interval):
+            self._skipped_runs += 1
+            logger.debug("Обход лент уже идет на другой реплике")
+            return {}
+
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.queue_size)
+        failed: set[str] = set()
+        workers = [
+            asyncio.create_task(self._worker(queue, failed))
+            for _ in range(self.workers)
+        ]
+        enqueued: set[str] = set()
+        found: dict[str, list[ListingItem]] = {}
+        try:
+            for source in self.sources:
+                try:
+                    found[source] = await self._discover(source, queue, enqueued)
+                except Exception as e:
+                    logger.warning(f"Не удалось обойти источник {source}: {e}")
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await self.state.release_run()
+
+        # Отметку двигаем, только когда все найденное уже обработано, и только
+        # до первой неудачи: упавшие статьи возьмет следующий обход
+        newest: dict[str, int] = {}
+        for source, items in found.items():
+            article_id = self._processed_up_to(items, failed)
+            if article_id is not None:
+                await self.state.set_last_seen(source, article_id)
+                newest[source] = article_id
+        self._runs += 1
+        self._last_run_at = time.time()
+        logger.info(f"Обход лент завершен, новых статей: {len(enqueued)}")
+        return newest
+
+    def stats(self) -> dict:
+        return {
+            "sources": self.sources,
+            "runs": self._runs,
+            "skipped_runs": self._skipped_runs,
+            "listing_pages": self._listing_pages,
+            "discovered": self._discovered,
+            "sent": self._sent,
+            "failed": self._failed,
+            "last_run_at": self._last_run_at,
+        }
+
+    @staticmethod
+    def _processed_up_to(items: list[ListingItem], failed: set[str]) -> int | None:
+        """Самый новый id, все статьи источника не новее которого обработаны"""
+        failed_ids = [item.article_id for item in items if item.url in failed]
+        limit = min(failed_ids, default=None)
+        return max(
+            (
+                item.article_id
+                for item in items
+                if limit is None or item.article_id < limit
+            ),
+            default=None,
+        )
+
+    async def _discover(
+        self, source: str, queue: asyncio.Queue, enqueued: set[str]
+    ) -> list[ListingItem]:
+        """Новые статьи источника; все они уже поставлены в очередь"""
+        last_seen = await self.state.get_last_seen(source)
+        found: list[ListingItem] = []
+        for page in range(1, self.max_pages + 1):
+            items = await self._fetch_listing(self.listing_url(source, page))
+            if not items:
+                break
+            fresh = [
+                item
+                for item in items
+                if last_seen is None or item.article_id > last_seen
+            ]
+            for item in fresh:
+                found.append(item)
+                if item.url in enqueued:
+                    continue
+                enqueued.add(item.url)
+                self._discovered += 1
+                # Полная очередь притормаживает обход
+                await queue.put(item.url)
+            # Дошли до уже виденных статей — дальше листать незачем
+            if len(fresh) < len(items):
+                break
+        return found
+
+    async def _fetch_listing(self, url: str) -> list[ListingItem]:
+        async def get() -> str | None:
+            resp = await self.parser.client.request("GET", url, headers=DEFAULT_HEADERS)
+            # Страницы за концом выдачи Habr отдает как 404
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            return resp.text
+
+        guard = self.parser.guard
+        html_content = await (guard.call(url, get) if guard else get())
+        if html_content is None:
+            return []
+        self._listing_pages += 1
+        executor = self.parser.executor
+        if executor is None:
+            return parse_listing(html_content, url, self.parser.engine)
+        return await executor.submit(
+            parse_listing, html_content, url, self.parser.engine.name
+        )
+
+    async def _worker(self, queue: asyncio.Queue, failed: set[str]) -> None:
+        while True:
+            url = await queue.get()
+            try:
+                article = await self.parser.get_article(url)
+                if article:
+                    await self.sink.send(article)
+                    self._sent += 1
+                else:
+                    self._failed += 1
+                    failed.add(url)
+            except Exception as e:
+                self._failed += 1
+                failed.add(url)
+                logger.error(f"Не удалось отправить статью {url} в обработку: {e}")
+            finally:
+                queue.task_done()
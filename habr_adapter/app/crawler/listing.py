@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+from app.article_parser.engines import ParseEngine, get_engine
+from app.article_parser.urls import CANONICAL_URL, article_id
+
+
+@dataclass(frozen=True)
+class ListingItem:
+    article_id: int
+    url: str
+
+
+def parse_listing(
+    html_content: str, base_url: str, engine: ParseEngine | str
+) -> list[ListingItem]:
+    """
+    Статьи со страницы ленты или хаба в порядке выдачи (новые сверху)
+    Выполняется в пуле парсинга, поэтому движок можно передать по имени
+    """
+    if isinstance(engine, str):
+        engine = get_engine(engine)
+    root = engine.parse_document(html_content)
+    items: list[ListingItem] = []
+    seen: set[int] = set()
+    for article in root.find_all("article"):
+        if "tm-articles-list__item" not in article.classes:
+            continue
+        link = article.find("a", class_="tm-title__link")
+        href = link.get("href") if link else None
+        found = article_id(urljoin(base_url, href)) if href else None
+        if found is None or found in seen:
+            continue
+        seen.add(found)
+        items.append(
+            ListingItem(article_id=found, url=CANONICAL_URL.format(article_id=found))
+        )
+    return items
@@ -0,0 +1,106 @@
+import json
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from aio_pika import DeliveryMode, Message, connect_robust
+from config import settings
+from loguru import logger
+from redis import asyncio as aioredis
+
+# По этому ключу BFF находит задачу, уже поставленную обходчиком
+PREWARM_KEY = "habr:prewarm:{url}"
+
+
+class ArticleSink(ABC):
+    """Куда обходчик отдает разобранные статьи"""
+
+    @abstractmethod
+    async def send(self, article: Dict) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+
+class MemorySink(ArticleSink):
+    """Собирает статьи в список (прогон на сохраненных страницах)"""
+
+    def __init__(self) -> None:
+        self.articles: list[Dict] = []
+
+    async def send(self, article: Dict) -> None:
+        self.articles.append(article)
+
+
+class PipelineSink(ArticleSink):
+    """
+    Ставит статью в очередь суммаризации тем же сообщением, что и BFF,
+    и запоминает task_id в Redis, чтобы BFF не ставил ее повторно.
+    task_id запоминается только после подтверждения брокера: иначе BFF
+    ждал бы задачу, которой нет в очереди
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        queue_name: str,
+        redis_url: str,
+        prewarm_ttl: int,
+        confirm_timeout: float = 10.0,
+    ) -> None:
+        self.rabbitmq_url = rabbitmq_url
+        self.queue_name = queue_name
+        self.prewarm_ttl = prewarm_ttl
+        self.confirm_timeout = confirm_timeout
+        self._redis = aioredis.from_url(redis_url)
+        self._connection = None
+        self._channel = None
+
+    @classmethod
+    def from_settings(cls) -> "PipelineSink":
+        return cls(
+            rabbitmq_url=settings.RABBITMQ_URL,
+            queue_name=settings.ARTICLE_QUEUE_NAME,
+            redis_url=settings.REDIS_URL,
+            prewarm_ttl=settings.CRAWLER_PREWARM_TTL,
+            confirm_timeout=settings.RABBITMQ_CONFIRM_TIMEOUT,
+        )
+
+    async def send(self, article: Dict) -> None:
+        if self._connection is None or self._connection.is_closed:
+            self._connection = await connect_robust(self.rabbitmq_url)
+            self._channel = None
+        if self._channel is None or self._channel.is_closed:
+            # Канал с подтверждениями: publish возвращается после ack брокера
+            self._channel = await self._connection.channel(publisher_confirms=True)
+
+        task_id = str(uuid.uuid4())
+        body = json.dumps(
+            {
+                "task_id": task_id,
+                "title": article["title"],
+                "text": article["text"],
+                "url": article["url"],
+                "article_id": article.get("article_id"),
+            },
+            ensure_ascii=False,
+        )
+        # Очередь статей durable — сообщение тоже переживает рестарт брокера
+        await self._channel.default_exchange.publish(
+            Message(
+                body=body.encode(),
+                content_type="application/json",
+                delivery_mode=DeliveryMode.PERSISTENT,
+            ),
+            routing_key=self.queue_name,
+            timeout=self.confirm_timeout,
+        )
+        await self._redis.set(
+            PREWARM_KEY.format(url=article["url"]), task_id, ex=self.prewarm_ttl
+        )
+        logger.info(f"Статья поставлена в очередь обходчиком (task_id={task_id}): {article['url']}")
+
+    async def close(self) -> None:
+        if self._connection and not self._connection.is_closed:
+            await self._connection.close()
+        await self._redis.aclose()
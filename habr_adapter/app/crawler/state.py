@@ -0,0 +1,85 @@
+import secrets
+from abc import ABC, abstractmethod
+
+from redis import asyncio as aioredis
+
+
+class CrawlState(ABC):
+    """Самый новый id статьи, уже отданный в работу, по каждому источнику"""
+
+    @abstractmethod
+    async def get_last_seen(self, source: str) -> int | None: ...
+
+    @abstractmethod
+    async def set_last_seen(self, source: str, article_id: int) -> None: ...
+
+    async def acquire_run(self, ttl: float) -> bool:
+        """Захватывает право на обход; реплики не должны обходить ленты разом"""
+        return True
+
+    async def release_run(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryCrawlState(CrawlState):
+    """Состояние в памяти процесса (локальный запуск, прогон на сохраненных страницах)"""
+
+    def __init__(self) -> None:
+        self._last_seen: dict[str, int] = {}
+
+    async def get_last_seen(self, source: str) -> int | None:
+        return self._last_seen.get(source)
+
+    async def set_last_seen(self, source: str, article_id: int) -> None:
+        self._last_seen[source] = max(article_id, self._last_seen.get(source, 0))
+
+
+class RedisCrawlState(CrawlState):
+    """Состояние в Redis, общее для реплик, с блокировкой на время обхода"""
+
+    PREFIX = "habr:crawler"
+    # Снимаем блокировку, только если она все еще наша: обход мог пережить
+    # TTL, и тогда ключ уже принадлежит другой реплике
+    RELEASE_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis_url: str) -> None:
+        self._redis = aioredis.from_url(redis_url)
+        self._last_seen_key = f"{self.PREFIX}:last_seen"
+        self._lock_key = f"{self.PREFIX}:lock"
+        self._lock_token: str | None = None
+        self._release = self._redis.register_script(self.RELEASE_SCRIPT)
+
+    async def get_last_seen(self, source: str) -> int | None:
+        value = await self._redis.hget(self._last_seen_key, source)
+        return int(value) if value is not None else None
+
+    async def set_last_seen(self, source: str, article_id: int) -> None:
+        current = await self.get_last_seen(source)
+        if current is None or article_id > current:
+            await self._redis.hset(self._last_seen_key, source, article_id)
+
+    async def acquire_run(self, ttl: float) -> bool:
+        token = secrets.token_hex(16)
+        acquired = await self._redis.set(
+            self._lock_key, token, nx=True, px=int(ttl * 1000)
+        )
+        if acquired:
+            self._lock_token = token
+        return bool(acquired)
+
+    async def release_run(self) -> None:
+        if self._lock_token is None:
+            return
+        token, self._lock_token = self._lock_token, None
+        await self._release(keys=[self._lock_key], args=[token])
+
+    async def close(self) -> None:
+        await self._redis.aclose()
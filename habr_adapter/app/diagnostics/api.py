@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, Request
+
+router = APIRouter(prefix="/api/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/http-pool")
+async def http_pool_stats(request: Request):
+    """Статистика общего пула соединений к Habr"""
+    return request.app.state.http_client.pool_stats()
+
+
+@router.get("/parse-executor")
+async def parse_executor_stats(request: Request):
+    """Очередь и длительность разбора в пуле парсинга"""
+    return request.app.state.parse_executor.stats()
+
+
+@router.get("/page-reader")
+async def page_reader_stats(request: Request):
+    """Скачанные и сэкономленные ранней остановкой байты"""
+    return request.app.state.page_reader.stats()
+
+
+@router.get("/coalescer")
+async def coalescer_stats(request: Request):
+    """Сколько запросов склеено с уже идущими и отдано из кэша результатов"""
+    return request.app.state.coalescer.stats()
+
+
+@router.get("/rate-limit")
+async def rate_limit_stats(request: Request):
+    """Ожидание токенов, повторы и состояние предохранителя по хостам"""
+    return request.app.state.fetch_guard.stats()
+
+
+@router.get("/fetch-cache")
+async def fetch_cache_stats(request: Request):
+    """Попадания, ревалидации и размер кэша страниц"""
+    cache = request.app.state.fetch_cache
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Кэш страниц выключен")
+    return await cache.stats()
+
+
+@router.get("/page-archive")
+async def page_archive_stats(request: Request):
+    """Сколько страниц и байт записано в архив для перепарсинга"""
+    archive = request.app.state.page_archive
+    if archive is None:
+        raise HTTPException(status_code=404, detail="Архив страниц выключен")
+    return archive.stats()
+
+
+@router.get("/crawler")
+async def crawler_stats(request: Request):
+    """Обходы лент, найденные и отправленные в обработку статьи"""
+    crawler = request.app.state.crawler
+    if crawler is None:
+        raise HTTPException(status_code=404, detail="Обходчик лент выключен")
+    return crawler.stats()
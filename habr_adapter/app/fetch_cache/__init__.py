@@ -0,0 +1,29 @@
+from app.fetch_cache.base import CachedPage, FetchCache
+from config import settings
+
+
+def create_fetch_cache() -> FetchCache | None:
+    """Создает кэш страниц по настройкам; None, если кэш выключен"""
+    backend = settings.FETCH_CACHE_BACKEND
+    if not backend:
+        return None
+    if backend == "disk":
+        from app.fetch_cache.disk_cache import DiskFetchCache
+
+        return DiskFetchCache(
+            directory=settings.FETCH_CACHE_DIR,
+            max_bytes=settings.FETCH_CACHE_MAX_BYTES,
+            zstd_level=settings.FETCH_CACHE_ZSTD_LEVEL,
+        )
+    if backend == "redis":
+        from app.fetch_cache.redis_cache import RedisFetchCache
+
+        return RedisFetchCache(
+            redis_url=settings.REDIS_URL,
+            max_bytes=settings.FETCH_CACHE_MAX_BYTES,
+            zstd_level=settings.FETCH_CACHE_ZSTD_LEVEL,
+        )
+    raise ValueError(f"Неизвестный бэкенд кэша страниц: {backend}")
+
+
+__all__ = ["CachedPage", "FetchCache", "create_fetch_cache"]
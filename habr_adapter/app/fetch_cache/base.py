@@ -0,0 +1,83 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+
+import zstandard
+from pydantic import BaseModel, Field
+
+
+class CachedPage(BaseModel):
+    url: str
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = Field(default_factory=time.time)
+
+    @property
+    def validators(self) -> dict:
+        """Заголовки условного GET для повторной проверки страницы"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache(ABC):
+    """
+    Кэш загруженных страниц Habr для условных GET-запросов
+    Хранит тело и валидаторы (ETag, Last-Modified), сжатые zstd,
+    и вытесняет давно не использованные записи при превышении max_bytes
+    """
+
+    def __init__(self, max_bytes: int, zstd_level: int = 3) -> None:
+        self.max_bytes = max_bytes
+        self._compressor = zstandard.ZstdCompressor(level=zstd_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+        # Метрики
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+        self._stores = 0
+        self._evictions = 0
+
+    @abstractmethod
+    async def get(self, url: str) -> CachedPage | None: ...
+
+    @abstractmethod
+    async def set(self, page: CachedPage) -> None: ...
+
+    @abstractmethod
+    async def size(self) -> dict: ...
+
+    async def close(self) -> None:
+        return None
+
+    def mark_not_modified(self) -> None:
+        """Сервер ответил 304 и страница отдана из кэша"""
+        self._not_modified += 1
+
+    async def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "not_modified": self._not_modified,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            **await self.size(),
+        }
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _dump(self, page: CachedPage) -> bytes:
+        return self._compressor.compress(page.model_dump_json().encode())
+
+    def _load(self, blob: bytes) -> CachedPage:
+        return CachedPage(**json.loads(self._decompressor.decompress(blob)))
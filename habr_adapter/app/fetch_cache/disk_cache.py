@@ -0,0 +1,94 @@
+import asyncio
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from app.fetch_cache.base import CachedPage, FetchCache
+from loguru import logger
+
+
+class DiskFetchCache(FetchCache):
+    """
+    Кэш в локальном каталоге: по файлу на URL
+    Порядок LRU держится в памяти и восстанавливается по mtime при старте
+    """
+
+    SUFFIX = ".json.zst"
+
+    def __init__(self, directory: str, max_bytes: int, zstd_level: int = 3) -> None:
+        super().__init__(max_bytes=max_bytes, zstd_level=zstd_level)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = asyncio.Lock()
+        self._load_index()
+
+    async def get(self, url: str) -> CachedPage | None:
+        key = self.key(url)
+        if key not in self._index:
+            self._misses += 1
+            return None
+        try:
+            blob = await asyncio.to_thread(self._read, self._path(key))
+        except FileNotFoundError:
+            self._forget(key)
+            self._misses += 1
+            return None
+        self._index.move_to_end(key)
+        self._hits += 1
+        return self._load(blob)
+
+    async def set(self, page: CachedPage) -> None:
+        key = self.key(page.url)
+        blob = self._dump(page)
+        async with self._lock:
+            await asyncio.to_thread(self._write, self._path(key), blob)
+            self._forget(key)
+            self._index[key] = len(blob)
+            self._total_bytes += len(blob)
+            self._stores += 1
+            await self._evict()
+
+    async def size(self) -> dict:
+        return {"entries": len(self._index), "bytes": self._total_bytes}
+
+    async def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, _ = next(iter(self._index.items()))
+            self._forget(key)
+            self._evictions += 1
+            await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _load_index(self) -> None:
+        files = sorted(
+            self.directory.glob(f"*{self.SUFFIX}"), key=lambda p: p.stat().st_mtime
+        )
+        for path in files:
+            size = path.stat().st_size
+            self._index[path.name.removesuffix(self.SUFFIX)] = size
+            self._total_bytes += size
+        logger.info(
+            f"Кэш страниц на диске: {len(self._index)} записей, {self._total_bytes} байт"
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    @staticmethod
+    def _read(path: Path) -> bytes:
+        blob = path.read_bytes()
+        # mtime служит порядком LRU после перезапуска
+        os.utime(path)
+        return blob
+
+    @staticmethod
+    def _write(path: Path, blob: bytes) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, path)
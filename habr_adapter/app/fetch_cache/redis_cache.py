@@ -0,0 +1,81 @@
+import time
+
+from app.fetch_cache.base import CachedPage, FetchCache
+from redis import asyncio as aioredis
+
+# Атомарная запись страницы с вытеснением самых старых по времени доступа.
+# KEYS: lru (zset ключ -> время доступа), sizes (hash ключ -> размер),
+# total (счетчик байт), page (ключ страницы). ARGV: blob, now, max_bytes, prefix
+_SET_AND_EVICT = """
+local old = redis.call('HGET', KEYS[2], KEYS[4])
+if old then redis.call('DECRBY', KEYS[3], old) end
+redis.call('SET', KEYS[4], ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[2], KEYS[4])
+redis.call('HSET', KEYS[2], KEYS[4], string.len(ARGV[1]))
+local total = redis.call('INCRBY', KEYS[3], string.len(ARGV[1]))
+local evicted = 0
+while total > tonumber(ARGV[3]) and redis.call('ZCARD', KEYS[1]) > 1 do
+    local oldest = redis.call('ZPOPMIN', KEYS[1])[1]
+    local size = redis.call('HGET', KEYS[2], oldest)
+    redis.call('HDEL', KEYS[2], oldest)
+    redis.call('DEL', oldest)
+    if size then total = redis.call('DECRBY', KEYS[3], size) end
+    evicted = evicted + 1
+end
+return evicted
+"""
+
+
+class RedisFetchCache(FetchCache):
+    """
+    Общий для всех реплик адаптера кэш в Redis
+    Учет размера и порядок LRU хранятся рядом со страницами
+    """
+
+    PREFIX = "habr:fetch"
+
+    def __init__(self, redis_url: str, max_bytes: int, zstd_level: int = 3) -> None:
+        super().__init__(max_bytes=max_bytes, zstd_level=zstd_level)
+        self._redis = aioredis.from_url(redis_url)
+        self._set_and_evict = self._redis.register_script(_SET_AND_EVICT)
+        self._lru_key = f"{self.PREFIX}:lru"
+        self._sizes_key = f"{self.PREFIX}:sizes"
+        self._total_key = f"{self.PREFIX}:bytes"
+
+    async def get(self, url: str) -> CachedPage | None:
+        page_key = self._page_key(url)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.get(page_key)
+            pipe.zadd(self._lru_key, {page_key: time.time()}, xx=True)
+            blob, _ = await pipe.execute()
+        if blob is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return self._load(blob)
+
+    async def set(self, page: CachedPage) -> None:
+        evicted = await self._set_and_evict(
+            keys=[
+                self._lru_key,
+                self._sizes_key,
+                self._total_key,
+                self._page_key(page.url),
+            ],
+            args=[self._dump(page), time.time(), self.max_bytes],
+        )
+        self._stores += 1
+        self._evictions += int(evicted)
+
+    async def size(self) -> dict:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._lru_key)
+            pipe.get(self._total_key)
+            entries, total = await pipe.execute()
+        return {"entries": entries, "bytes": int(total or 0)}
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def _page_key(self, url: str) -> str:
+        return f"{self.PREFIX}:page:{self.key(url)}"
@@ -0,0 +1,27 @@
+from app.page_archive.archive import (
+    ArchivePosition,
+    ArchiveRecord,
+    PageArchive,
+    iter_archive,
+)
+from config import settings
+
+
+def create_page_archive() -> PageArchive | None:
+    """Создает архив страниц по настройкам; None, если он выключен"""
+    if not settings.ARCHIVE_ENABLED:
+        return None
+    return PageArchive(
+        directory=settings.ARCHIVE_DIR,
+        segment_bytes=settings.ARCHIVE_SEGMENT_BYTES,
+        zstd_level=settings.ARCHIVE_ZSTD_LEVEL,
+    )
+
+
+__all__ = [
+    "ArchivePosition",
+    "ArchiveRecord",
+    "PageArchive",
+    "create_page_archive",
+    "iter_archive",
+]
@@ -0,0 +1,194 @@
+import asyncio
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import zstandard
+from app.article_parser.urls import canonical_url
+from loguru import logger
+
+# Заголовок записи: длина сжатого тела, длина URL, время загрузки.
+# URL и время лежат вне сжатого тела, чтобы индекс строился без распаковки
+_HEADER = struct.Struct(">IHd")
+
+
+@dataclass(frozen=True, order=True)
+class ArchivePosition:
+    segment: str
+    offset: int
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    url: str
+    fetched_at: float
+    body_zst: bytes
+    position: ArchivePosition
+
+    @property
+    def end(self) -> ArchivePosition:
+        size = _HEADER.size + len(self.url.encode()) + len(self.body_zst)
+        return ArchivePosition(self.position.segment, self.position.offset + size)
+
+    def body(self) -> str:
+        return zstandard.ZstdDecompressor().decompress(self.body_zst).decode()
+
+
+class PageArchive:
+    """
+    Архив загруженных страниц только на дозапись: по записи на каждую загрузку,
+    ключ — канонический URL и время загрузки, тело сжато zstd отдельно,
+    чтобы оборванную при падении запись можно было просто отбросить.
+    Файлы-сегменты ротируются по размеру; у каждого процесса-писателя
+    (хост и pid: воркеры uvicorn на одном хосте — разные писатели) свои
+    сегменты, поэтому каталог можно делить между репликами и воркерами
+    """
+
+    PREFIX = "pages"
+    SUFFIX = ".arc"
+
+    def __init__(
+        self, directory: str, segment_bytes: int, zstd_level: int = 3
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._compressor = zstandard.ZstdCompressor(level=zstd_level)
+        self._writer_id = f"{socket.gethostname()}.{os.getpid()}"
+        self._lock = asyncio.Lock()
+        self._file = None
+        self._segment_size = 0
+
+        # Метрики
+        self._records = 0
+        self._bytes_raw = 0
+        self._bytes_written = 0
+        self._errors = 0
+
+    async def append(
+        self, url: str, body: str, fetched_at: float | None = None
+    ) -> None:
+        raw = body.encode()
+        # Сжатие — CPU-работа, поэтому вместе с записью уходит в поток
+        async with self._lock:
+            try:
+                written = await asyncio.to_thread(
+                    self._write, canonical_url(url), raw, fetched_at or time.time()
+                )
+            except Exception:
+                self._errors += 1
+                raise
+        self._records += 1
+        self._bytes_raw += len(raw)
+        self._bytes_written += written
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict:
+        return {
+            "directory": str(self.directory),
+            "records": self._records,
+            "bytes_raw": self._bytes_raw,
+            "bytes_written": self._bytes_written,
+            "compression_ratio": self._bytes_raw / (self._bytes_written or 1),
+            "errors": self._errors,
+        }
+
+    def _write(self, url: str, raw: bytes, fetched_at: float) -> int:
+        encoded_url = url.encode()
+        body = self._compressor.compress(raw)
+        record = _HEADER.pack(len(body), len(encoded_url), fetched_at) + encoded_url + body
+        if self._file is None or self._segment_size >= self.segment_bytes:
+            self._rotate()
+        try:
+            self._file.write(record)
+            self._file.flush()
+        except OSError:
+            # Обрезок записи посреди сегмента сломал бы чтение следующих:
+            # откатываем сегмент и начинаем новый при следующей записи
+            try:
+                self._file.truncate(self._segment_size)
+            finally:
+                self._file.close()
+                self._file = None
+            raise
+        self._segment_size += len(record)
+        return len(record)
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        existing = sorted(self.directory.glob(f"{self.PREFIX}-{self._writer_id}-*{self.SUFFIX}"))
+        number = int(existing[-1].stem.rsplit("-", 1)[-1]) if existing else 0
+        path = self._segment_path(number)
+        # Недописанный последний сегмент продолжаем, полный — закрываем
+        if not path.exists() or path.stat().st_size >= self.segment_bytes:
+            path = self._segment_path(number + 1)
+        self._file = path.open("ab")
+        self._segment_size = self._file.tell()
+        logger.debug(f"Запись архива страниц в сегмент {path.name}")
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{self.PREFIX}-{self._writer_id}-{number:06d}{self.SUFFIX}"
+
+
+def list_segments(directory: str | Path) -> list[Path]:
+    return sorted(Path(directory).glob(f"{PageArchive.PREFIX}-*{PageArchive.SUFFIX}"))
+
+
+def segment_writer(segment: str) -> str:
+    """Писатель сегмента по имени pages-<писатель>-<номер>.arc"""
+    stem = segment[len(PageArchive.PREFIX) + 1 : -len(PageArchive.SUFFIX)]
+    return stem.rsplit("-", 1)[0]
+
+
+def iter_archive(
+    directory: str | Path,
+    start: dict[str, ArchivePosition] | None = None,
+    with_body: bool = True,
+) -> Iterator[ArchiveRecord]:
+    """
+    Последовательно читает записи всех сегментов
+    start — позиция, до которой уже прочитан каждый писатель: номера сегментов
+    сравнимы только у одного писателя, писатели без позиции читаются с начала.
+    Без with_body тела пропускаются через seek (для построения индекса)
+    """
+    start = start or {}
+    for path in list_segments(directory):
+        position = start.get(segment_writer(path.name))
+        if position is not None and path.name < position.segment:
+            continue
+        offset = position.offset if position and path.name == position.segment else 0
+        with path.open("rb") as file:
+            file.seek(offset)
+            while True:
+                header = file.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    if header:
+                        logger.warning(f"Оборванная запись в конце {path.name}")
+                    break
+                body_len, url_len, fetched_at = _HEADER.unpack(header)
+                url = file.read(url_len)
+                if with_body:
+                    body = file.read(body_len)
+                else:
+                    file.seek(body_len, 1)
+                    body = b""
+                if len(url) < url_len or (with_body and len(body) < body_len):
+                    logger.warning(f"Оборванная запись в конце {path.name}")
+                    break
+                yield ArchiveRecord(
+                    url=url.decode(),
+                    fetched_at=fetched_at,
+                    body_zst=body,
+                    position=ArchivePosition(path.name, offset),
+                )
+                offset = file.tell()
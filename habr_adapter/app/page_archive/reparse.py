@@ -0,0 +1,234 @@
+"""
+Офлайн-перепарсинг архива страниц после изменения парсера
+
+Читает архив потоком, разбирает страницы в пуле процессов и дописывает
+результаты (SParseBatchItem) в NDJSON-файл. Воркерам уходят сжатые тела:
+распаковка тоже идет параллельно. Прогресс сохраняется в checkpoint отдельно
+по каждому писателю архива, и при повторном запуске работа продолжается с
+него; вывод обрезается до размера на момент checkpoint, поэтому записи не
+дублируются.
+
+Запуск из каталога habr_adapter:
+    python -m app.page_archive.reparse --out archive/reparsed.ndjson --latest-only
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import zstandard
+from app.article_parser.parser import parse_html
+from app.article_parser.schemas import SArticleParsed, SParseBatchItem
+from app.core.executor import _init_worker
+from app.page_archive.archive import ArchivePosition, iter_archive, segment_writer
+from config import settings
+from loguru import logger
+
+
+def _parse_record(task: tuple) -> tuple[str, bool, ArchivePosition, int]:
+    """Выполняется в воркере: распаковывает и разбирает одну страницу"""
+    url, body_zst, engine, end = task
+    try:
+        html = zstandard.ZstdDecompressor().decompress(body_zst).decode()
+        data = parse_html(html, url, engine)
+        if not data:
+            item = SParseBatchItem(url=url, error="Не удалось распарсить статью")
+        else:
+            item = SParseBatchItem(url=url, article=SArticleParsed(**data))
+    except Exception as e:
+        item = SParseBatchItem(url=url, error=f"{type(e).__name__}: {e}")
+    return item.model_dump_json(), item.error is None, end, len(body_zst)
+
+
+def latest_positions(directory: Path) -> set[ArchivePosition]:
+    """Позиции последних загрузок каждого URL; тела не читаются"""
+    latest: dict[str, tuple[float, ArchivePosition]] = {}
+    for record in iter_archive(directory, with_body=False):
+        current = latest.get(record.url)
+        if current is None or record.fetched_at >= current[0]:
+            latest[record.url] = (record.fetched_at, record.position)
+    return {position for _, position in latest.values()}
+
+
+class Checkpoint:
+    """Позиции по писателям архива и размер вывода, до которых работа сделана"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        state = json.loads(path.read_text()) if path.exists() else {}
+        if "segment" in state:
+            # Прежний формат: одна позиция на весь архив
+            state["writers"] = {
+                segment_writer(state["segment"]): [state["segment"], state["offset"]]
+            }
+        self.positions = {
+            writer: ArchivePosition(segment, offset)
+            for writer, (segment, offset) in state.get("writers", {}).items()
+        }
+        self.output_bytes = state.get("output_bytes", 0)
+        self.processed = state.get("processed", 0)
+        self.failed = state.get("failed", 0)
+
+    def advance(self, position: ArchivePosition) -> None:
+        self.positions[segment_writer(position.segment)] = position
+
+    def save(self, output_bytes: int, progress: "Progress") -> None:
+        self.output_bytes = output_bytes
+        self.processed = progress.processed
+        self.failed = progress.failed
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "writers": {
+                        writer: [position.segment, position.offset]
+                        for writer, position in self.positions.items()
+                    },
+                    "output_bytes": output_bytes,
+                    "processed": self.processed,
+                    "failed": self.failed,
+                }
+            )
+        )
+        os.replace(tmp, self.path)
+
+
+def reparse(
+    archive_dir: Path,
+    out: Path,
+    checkpoint_path: Path,
+    engine: str,
+    workers: int,
+    latest_only: bool,
+    checkpoint_every: int,
+    report_every: float,
+) -> dict:
+    checkpoint = Checkpoint(checkpoint_path)
+    if checkpoint.positions:
+        logger.info(
+            f"Продолжаем с {checkpoint.positions}, "
+            f"уже обработано {checkpoint.processed}"
+        )
+    keep = latest_positions(archive_dir) if latest_only else None
+    # Конец последней прочитанной записи каждого писателя
+    last_seen: dict[str, ArchivePosition] = {}
+    # Пул забирает задачи в своем потоке без ограничений — держим окно вручную,
+    # иначе архив целиком окажется в памяти
+    window = threading.Semaphore(workers * 16)
+
+    def tasks():
+        for record in iter_archive(archive_dir, start=checkpoint.positions):
+            last_seen[segment_writer(record.end.segment)] = record.end
+            if keep is not None and record.position not in keep:
+                continue
+            window.acquire()
+            yield (record.url, record.body_zst, engine, record.end)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    progress = Progress(checkpoint.processed, checkpoint.failed)
+    ctx = multiprocessing.get_context("spawn")
+    with out.open("r+b" if out.exists() else "wb") as output, ctx.Pool(
+        workers, initializer=_init_worker
+    ) as pool:
+        # Все, что записано после последнего checkpoint, будет сделано заново
+        output.truncate(checkpoint.output_bytes)
+        output.seek(checkpoint.output_bytes)
+        for line, ok, end, size in pool.imap(_parse_record, tasks(), chunksize=4):
+            window.release()
+            output.write(line.encode() + b"\n")
+            progress.add(ok, size)
+            # imap отдает результаты в порядке архива: все до end уже записано
+            checkpoint.advance(end)
+            if progress.run_processed % checkpoint_every == 0:
+                output.flush()
+                checkpoint.save(output.tell(), progress)
+            progress.maybe_report(report_every)
+        output.flush()
+        # Пропущенные устаревшие записи тоже считаются пройденными
+        for position in last_seen.values():
+            checkpoint.advance(position)
+        checkpoint.save(output.tell(), progress)
+
+    return progress.report()
+
+
+class Progress:
+    """Счетчики и пропускная способность текущего запуска"""
+
+    def __init__(self, processed: int, failed: int) -> None:
+        self.processed = processed
+        self.failed = failed
+        self.run_processed = 0
+        self.bytes_in = 0
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    def add(self, ok: bool, size: int) -> None:
+        self.processed += 1
+        self.run_processed += 1
+        self.failed += not ok
+        self.bytes_in += size
+
+    def maybe_report(self, every: float) -> None:
+        now = time.monotonic()
+        if now - self._last_report >= every:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> dict:
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        stats = {
+            "processed": self.processed,
+            "failed": self.failed,
+            "run_processed": self.run_processed,
+            "elapsed_s": round(elapsed, 2),
+            "articles_per_sec": round(self.run_processed / elapsed, 1),
+            "mb_per_sec": round(self.bytes_in / elapsed / 1024 / 1024, 2),
+        }
+        logger.info(
+            f"Перепарсинг: {stats['run_processed']} статей за {stats['elapsed_s']} с, "
+            f"{stats['articles_per_sec']} статей/сек, {stats['mb_per_sec']} МБ/с "
+            f"(сжатых), ошибок всего {stats['failed']}"
+        )
+        return stats
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--archive", type=Path, default=Path(settings.ARCHIVE_DIR))
+    arg_parser.add_argument("--out", type=Path, required=True)
+    arg_parser.add_argument(
+        "--checkpoint", type=Path, help="по умолчанию <out>.checkpoint"
+    )
+    arg_parser.add_argument("--engine", default=settings.PARSE_ENGINE)
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument(
+        "--latest-only",
+        action="store_true",
+        help="разбирать только последнюю загрузку каждого URL",
+    )
+    arg_parser.add_argument("--checkpoint-every", type=int, default=500)
+    arg_parser.add_argument("--report-every", type=float, default=10.0)
+    args = arg_parser.parse_args()
+
+    stats = reparse(
+        archive_dir=args.archive,
+        out=args.out,
+        checkpoint_path=args.checkpoint or args.out.with_name(args.out.name + ".checkpoint"),
+        engine=args.engine,
+        workers=args.workers,
+        latest_only=args.latest_only,
+        checkpoint_every=args.checkpoint_every,
+        report_every=args.report_every,
+    )
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
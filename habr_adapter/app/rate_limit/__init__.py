@@ -0,0 +1,39 @@
+from app.rate_limit.base import RateLimiter, RateLimitTimeoutError
+from app.rate_limit.breaker import CircuitBreaker, CircuitOpenError
+from app.rate_limit.guard import FetchGuard
+from config import settings
+
+
+def create_rate_limiter() -> RateLimiter | None:
+    """Создает ограничитель частоты по настройкам; None, если он выключен"""
+    backend = settings.RATE_LIMIT_BACKEND
+    if not backend:
+        return None
+    if backend == "memory":
+        from app.rate_limit.memory_limiter import MemoryRateLimiter
+
+        return MemoryRateLimiter(
+            rate=settings.RATE_LIMIT_RPS,
+            burst=settings.RATE_LIMIT_BURST,
+            max_wait=settings.RATE_LIMIT_MAX_WAIT,
+        )
+    if backend == "redis":
+        from app.rate_limit.redis_limiter import RedisRateLimiter
+
+        return RedisRateLimiter(
+            redis_url=settings.REDIS_URL,
+            rate=settings.RATE_LIMIT_RPS,
+            burst=settings.RATE_LIMIT_BURST,
+            max_wait=settings.RATE_LIMIT_MAX_WAIT,
+        )
+    raise ValueError(f"Неизвестный бэкенд ограничителя частоты: {backend}")
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FetchGuard",
+    "RateLimiter",
+    "RateLimitTimeoutError",
+    "create_rate_limiter",
+]
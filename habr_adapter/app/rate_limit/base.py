@@ -0,0 +1,82 @@
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+
+
+class RateLimitTimeoutError(Exception):
+    """Токен не получен за отведенное время ожидания"""
+
+
+class RateLimiter(ABC):
+    """
+    Token bucket на каждый хост: rate запросов в секунду, всплеск до burst
+    Запрос без свободного токена не отклоняется, а ждет его до max_wait секунд
+    """
+
+    def __init__(self, rate: float, burst: int, max_wait: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+
+        # Метрики
+        self._acquired = 0
+        self._waited = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._blocks = 0
+
+    async def acquire(self, host: str) -> float:
+        """Дожидается токена для хоста и возвращает время ожидания"""
+        started = time.monotonic()
+        slept = False
+        while True:
+            wait = await self._take(host)
+            elapsed = time.monotonic() - started
+            if wait <= 0:
+                self._record(elapsed, slept)
+                return elapsed
+            if elapsed + wait > self.max_wait:
+                self._timeouts += 1
+                raise RateLimitTimeoutError(
+                    f"Нет свободного токена для {host} дольше {self.max_wait} с"
+                )
+            # Небольшой разброс, чтобы ожидающие не просыпались разом
+            await asyncio.sleep(wait * random.uniform(1.0, 1.1))
+            slept = True
+
+    async def block(self, host: str, seconds: float) -> None:
+        """Приостанавливает выдачу токенов хосту (например, по Retry-After)"""
+        self._blocks += 1
+        await self._block(host, seconds)
+
+    async def close(self) -> None:
+        return None
+
+    def stats(self) -> dict:
+        acquired = self._acquired or 1
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self._acquired,
+            "waited": self._waited,
+            "wait_time_avg": self._wait_time_total / acquired,
+            "wait_time_max": self._wait_time_max,
+            "timeouts": self._timeouts,
+            "blocks": self._blocks,
+        }
+
+    @abstractmethod
+    async def _take(self, host: str) -> float:
+        """Забирает токен; 0, если получилось, иначе сколько секунд подождать"""
+
+    @abstractmethod
+    async def _block(self, host: str, seconds: float) -> None: ...
+
+    def _record(self, elapsed: float, slept: bool) -> None:
+        self._acquired += 1
+        if slept:
+            self._waited += 1
+        self._wait_time_total += elapsed
+        self._wait_time_max = max(self._wait_time_max, elapsed)
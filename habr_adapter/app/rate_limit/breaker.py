@@ -0,0 +1,90 @@
+import time
+
+
+class CircuitOpenError(Exception):
+    """Хост временно не опрашивается: предохранитель разомкнут"""
+
+
+class CircuitBreaker:
+    """
+    Предохранитель на каждый хост
+    После failure_threshold неудач подряд запросы к хосту сразу отклоняются
+    reset_timeout секунд, затем пропускается одна пробная попытка:
+    успех замыкает цепь, неудача снова размыкает ее
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # host -> (неудач подряд, разомкнут до, идет ли пробная попытка)
+        self._hosts: dict[str, tuple[int, float, bool]] = {}
+
+        # Метрики
+        self._opened = 0
+        self._rejected = 0
+
+    def check(self, host: str) -> None:
+        """Бросает CircuitOpenError, если запрос к хосту сейчас не пройдет"""
+        failures, open_until, probing = self._hosts.get(host, (0, 0.0, False))
+        state = self._state(failures, open_until)
+        if state == self.OPEN or (state == self.HALF_OPEN and probing):
+            self._rejected += 1
+            raise CircuitOpenError(
+                f"Запросы к {host} приостановлены еще на "
+                f"{max(open_until - time.monotonic(), 0):.1f} с"
+            )
+
+    def before_call(self, host: str) -> None:
+        """Пропускает запрос к хосту или бросает CircuitOpenError"""
+        self.check(host)
+        failures, open_until, _ = self._hosts.get(host, (0, 0.0, False))
+        if self._state(failures, open_until) == self.HALF_OPEN:
+            self._hosts[host] = (failures, open_until, True)
+
+    def release_probe(self, host: str) -> None:
+        """
+        Снимает отметку пробной попытки, если она не закончилась ни успехом,
+        ни неудачей хоста (отмена, слишком большая страница и т.п.)
+        """
+        entry = self._hosts.get(host)
+        if entry and entry[2]:
+            self._hosts[host] = (entry[0], entry[1], False)
+
+    def record_success(self, host: str) -> None:
+        self._hosts.pop(host, None)
+
+    def record_failure(self, host: str, open_for: float | None = None) -> None:
+        """Учитывает неудачу; open_for продлевает размыкание (Retry-After)"""
+        failures, open_until, _ = self._hosts.get(host, (0, 0.0, False))
+        failures += 1
+        if failures >= self.failure_threshold:
+            if self._state(failures - 1, open_until) != self.OPEN:
+                self._opened += 1
+            open_until = time.monotonic() + max(self.reset_timeout, open_for or 0)
+        self._hosts[host] = (failures, open_until, False)
+
+    def stats(self) -> dict:
+        return {
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "opened": self._opened,
+            "rejected": self._rejected,
+            "hosts": {
+                host: {
+                    "state": self._state(failures, open_until),
+                    "failures": failures,
+                }
+                for host, (failures, open_until, _) in self._hosts.items()
+            },
+        }
+
+    def _state(self, failures: int, open_until: float) -> str:
+        if failures < self.failure_threshold:
+            return self.CLOSED
+        if open_until > time.monotonic():
+            return self.OPEN
+        return self.HALF_OPEN
@@ -0,0 +1,142 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+from app.rate_limit.base import RateLimiter
+from app.rate_limit.breaker import CircuitBreaker
+from config import settings
+from loguru import logger
+
+T = TypeVar("T")
+
+# Ответы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Секунды из заголовка Retry-After (число или HTTP-дата)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class FetchGuard:
+    """
+    Вежливая загрузка с Habr: перед каждой попыткой берется токен хоста,
+    429/5xx и сетевые ошибки повторяются с экспоненциальной задержкой
+    со случайным разбросом, Retry-After приостанавливает выдачу токенов хосту,
+    а предохранитель отклоняет запросы сразу, пока Habr нас ограничивает
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter | None,
+        breaker: CircuitBreaker,
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_after_max: float = 300.0,
+    ) -> None:
+        self.limiter = limiter
+        self.breaker = breaker
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+
+        # Метрики
+        self._retries = 0
+        self._throttled = 0
+        self._gave_up = 0
+
+    @classmethod
+    def from_settings(cls, limiter: RateLimiter | None) -> "FetchGuard":
+        return cls(
+            limiter=limiter,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+            ),
+            retries=settings.FETCH_RETRIES,
+            backoff_base=settings.FETCH_BACKOFF_BASE,
+            backoff_max=settings.FETCH_BACKOFF_MAX,
+            retry_after_max=settings.FETCH_RETRY_AFTER_MAX,
+        )
+
+    async def call(self, url: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        host = urlsplit(url).hostname or ""
+        for attempt in range(self.retries + 1):
+            # Разомкнутая цепь отклоняет сразу, не дожидаясь токена
+            self.breaker.check(host)
+            if self.limiter:
+                await self.limiter.acquire(host)
+            # Пробная попытка отмечается, только когда запрос точно уйдет
+            self.breaker.before_call(host)
+
+            retry_after = None
+            try:
+                result = await fetch()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES:
+                    # Хост отвечает, просто такой страницы нет
+                    self.breaker.record_success(host)
+                    raise
+                retry_after = await self._on_throttled(host, e.response)
+                error: Exception = e
+            except httpx.TransportError as e:
+                self.breaker.record_failure(host)
+                error = e
+            else:
+                self.breaker.record_success(host)
+                return result
+            finally:
+                # Любой другой исход (отмена, ошибка разбора) не держит пробу вечно
+                self.breaker.release_probe(host)
+
+            if attempt == self.retries:
+                self._gave_up += 1
+                raise error
+            delay = max(self._backoff(attempt), retry_after or 0.0)
+            self._retries += 1
+            logger.warning(
+                f"Попытка {attempt + 1} загрузки {url} не удалась ({error!r}), "
+                f"повтор через {delay:.1f} с"
+            )
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict:
+        return {
+            "retries": self._retries,
+            "throttled": self._throttled,
+            "gave_up": self._gave_up,
+            "rate_limiter": self.limiter.stats() if self.limiter else None,
+            "circuit_breaker": self.breaker.stats(),
+        }
+
+    async def _on_throttled(self, host: str, resp: httpx.Response) -> float | None:
+        self._throttled += 1
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is not None:
+            retry_after = min(retry_after, self.retry_after_max)
+            # Пауза общая: остальные запросы к хосту тоже ее дождутся
+            if self.limiter and retry_after > 0:
+                await self.limiter.block(host, retry_after)
+        self.breaker.record_failure(host, open_for=retry_after)
+        return retry_after
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: случайная задержка до экспоненциального потолка
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
@@ -0,0 +1,35 @@
+import time
+
+from app.rate_limit.base import RateLimiter
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Ведра в памяти процесса: лимит действует на одну реплику адаптера"""
+
+    def __init__(self, rate: float, burst: int, max_wait: float) -> None:
+        super().__init__(rate=rate, burst=burst, max_wait=max_wait)
+        # host -> (токены, время пополнения, заблокирован до)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    async def _take(self, host: str) -> float:
+        now = time.monotonic()
+        tokens, updated, blocked_until = self._buckets.get(
+            host, (float(self.burst), now, 0.0)
+        )
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if blocked_until > now:
+            wait = blocked_until - now
+        elif tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[host] = (tokens, now, blocked_until)
+        return wait
+
+    async def _block(self, host: str, seconds: float) -> None:
+        now = time.monotonic()
+        tokens, updated, blocked_until = self._buckets.get(
+            host, (float(self.burst), now, 0.0)
+        )
+        self._buckets[host] = (tokens, updated, max(blocked_until, now + seconds))
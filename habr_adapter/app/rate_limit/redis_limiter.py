@@ -0,0 +1,79 @@
+from app.rate_limit.base import RateLimiter
+from redis import asyncio as aioredis
+
+# Ведро хранится в hash: tokens, ts (время пополнения), blocked_until.
+# Время берется у Redis, чтобы часы реплик не влияли на лимит.
+# KEYS: ведро. ARGV: rate, burst, ttl. Возвращает секунды ожидания строкой:
+# целые числа Lua отдал бы как есть, а дробные Redis обрезает
+_TAKE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if blocked_until > now then
+    wait = blocked_until - now
+elseif tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return tostring(wait)
+"""
+
+# KEYS: ведро. ARGV: seconds, ttl
+_BLOCK = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local blocked_until = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if blocked_until > current then
+    redis.call('HSET', KEYS[1], 'blocked_until', tostring(blocked_until))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Ведра в Redis, общие для всех реплик адаптера
+    Проверка и списание токена выполняются одним Lua-скриптом
+    """
+
+    PREFIX = "habr:ratelimit"
+    # Ведро без обращений дольше часа можно забыть: оно давно полное
+    TTL = 3600
+
+    def __init__(
+        self, redis_url: str, rate: float, burst: int, max_wait: float
+    ) -> None:
+        super().__init__(rate=rate, burst=burst, max_wait=max_wait)
+        self._redis = aioredis.from_url(redis_url)
+        self._take_script = self._redis.register_script(_TAKE)
+        self._block_script = self._redis.register_script(_BLOCK)
+
+    async def _take(self, host: str) -> float:
+        wait = await self._take_script(
+            keys=[self._bucket_key(host)], args=[self.rate, self.burst, self.TTL]
+        )
+        return float(wait)
+
+    async def _block(self, host: str, seconds: float) -> None:
+        ttl = max(self.TTL, int(seconds) + 1)
+        await self._block_script(
+            keys=[self._bucket_key(host)], args=[seconds, ttl]
+        )
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def _bucket_key(self, host: str) -> str:
+        return f"{self.PREFIX}:{host}"
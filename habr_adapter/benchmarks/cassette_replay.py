@@ -0,0 +1,149 @@
+"""
+Пропускная способность разбора статей при ответах из HTTP-кассеты
+
+Кассета пишется один раз в режиме record (HTTP_CASSETTE_MODE=record при
+обычной работе сервиса или --record-corpus для страниц корпуса) и затем
+воспроизводится без сети: задержка ответов берется из записи или из
+заданного распределения, поэтому прогоны повторяемы.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.cassette_replay --record-corpus benchmarks/corpus --cassette /tmp/habr.jsonl
+    python -m benchmarks.cassette_replay --cassette /tmp/habr.jsonl --requests 500 --concurrency 32 --latency lognormal:0.12,0.5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from app.article_parser.engines import ENGINES, get_engine
+from app.article_parser.parser import DEFAULT_HEADERS, HabrParser
+from app.core.cassette import Cassette, CassetteTransport
+from app.core.http_client import HTTPXClient
+from loguru import logger
+
+
+async def record_corpus(corpus: Path, cassette: Cassette) -> int:
+    """Записывает страницы корпуса в кассету как ответы habr.com"""
+    pages = {
+        f"https://habr.com/ru/articles/{index}/": path.read_bytes()
+        for index, path in enumerate(sorted(corpus.glob("**/*.html")), start=1)
+    }
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html; charset=utf-8"},
+            content=pages[str(request.url)],
+        )
+
+    transport = CassetteTransport(
+        cassette, mode="record", inner=httpx.MockTransport(handler)
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        for url in pages:
+            await client.get(url)
+    return len(pages)
+
+
+async def replay(
+    cassette: Cassette,
+    engine: str,
+    requests: int,
+    concurrency: int,
+    latency: str,
+    seed: int,
+) -> dict:
+    transport = CassetteTransport(cassette, mode="replay", latency=latency, seed=seed)
+    client = HTTPXClient(headers=DEFAULT_HEADERS, transport=transport)
+    parser = HabrParser(client=client, engine=get_engine(engine))
+    urls = sorted(set(_urls(cassette.path)))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failed = 0
+
+    async def one(url: str) -> None:
+        nonlocal failed
+        async with semaphore:
+            started = time.perf_counter()
+            result = await parser.get_article(url)
+            latencies.append(time.perf_counter() - started)
+            failed += not result
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(urls[i % len(urls)]) for i in range(requests)))
+    finally:
+        await client.close()
+    return {
+        "elapsed": time.perf_counter() - started,
+        "latencies": latencies,
+        "failed": failed,
+    }
+
+
+def _urls(path: Path) -> list[str]:
+    with path.open(encoding="utf-8") as file:
+        return [
+            entry["url"]
+            for entry in map(json.loads, filter(str.strip, file))
+            if entry["method"] == "GET"
+        ]
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--cassette", type=Path, required=True)
+    arg_parser.add_argument(
+        "--record-corpus",
+        type=Path,
+        help="Записать страницы корпуса в кассету и выйти",
+    )
+    arg_parser.add_argument("--engine", default="bs4", choices=list(ENGINES))
+    arg_parser.add_argument("--requests", type=int, default=200)
+    arg_parser.add_argument("--concurrency", type=int, default=16)
+    arg_parser.add_argument(
+        "--latency",
+        default="recorded",
+        help="recorded, none, fixed:x, uniform:a,b, normal:m,s, lognormal:median,sigma",
+    )
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+    logger.remove()
+
+    cassette = Cassette(args.cassette)
+    if args.record_corpus:
+        count = asyncio.run(record_corpus(args.record_corpus, cassette))
+        print(f"Записано {count} страниц в {args.cassette}")
+        return 0
+    if not len(cassette):
+        raise SystemExit(f"Кассета {args.cassette} пуста")
+
+    report = asyncio.run(
+        replay(
+            cassette,
+            args.engine,
+            args.requests,
+            args.concurrency,
+            args.latency,
+            args.seed,
+        )
+    )
+    latencies = sorted(report["latencies"])
+    print(
+        f"Запросов: {args.requests}, параллельно {args.concurrency}, "
+        f"задержка {args.latency}, движок {args.engine}"
+    )
+    print(f"статей/с: {args.requests / report['elapsed']:.1f}")
+    print(f"p50, мс: {statistics.median(latencies) * 1000:.2f}")
+    print(f"p99, мс: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}")
+    print(f"ошибок: {report['failed']}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
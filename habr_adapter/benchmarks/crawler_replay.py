@@ -0,0 +1,142 @@
+"""
+Прогон обходчика лент на сохраненных страницах выдачи Habr
+
+benchmarks/listings/<снимок>/<источник>/pageN.html — выдача в два момента:
+before и after (сверху появились новые статьи). Первый обход по before
+должен взять все статьи, второй по after — только новые. Статьи отдаются
+страницей из корпуса через httpx.MockTransport, сеть не нужна.
+Завершается с кодом 1, если найденное не совпало с ожидаемым.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.crawler_replay
+    python -m benchmarks.crawler_replay --regenerate   # пересобрать снимки
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+import httpx
+from app.article_parser.parser import HabrParser
+from app.core.http_client import HTTPXClient
+from app.crawler import HubCrawler, MemoryCrawlState, MemorySink, parse_listing
+from benchmarks.synthetic import listing_page, translation
+from loguru import logger
+
+LISTINGS_DIR = Path(__file__).parent / "listings"
+BASE_URL = "https://habr.com/ru/"
+PAGE_SIZE = 20
+
+# Источник -> id статей сверху вниз; статьи с id, кратным 3, — из блога компании
+SOURCES = {
+    "articles": list(range(900060, 900000, -1)),
+    "hubs/python/articles": list(range(900058, 900000, -6)),
+}
+NEW_IDS = {
+    "articles": [900063, 900062, 900061],
+    "hubs/python/articles": [900062],
+}
+
+
+def source_dir(snapshot: str, source: str) -> Path:
+    return LISTINGS_DIR / snapshot / source.replace("/", "_")
+
+
+def regenerate() -> None:
+    for snapshot in ("before", "after"):
+        for source, ids in SOURCES.items():
+            if snapshot == "after":
+                ids = NEW_IDS[source] + ids
+            directory = source_dir(snapshot, source)
+            directory.mkdir(parents=True, exist_ok=True)
+            for page, start in enumerate(range(0, len(ids), PAGE_SIZE), 1):
+                items = [
+                    (article_id, "acme" if article_id % 3 == 0 else None)
+                    for article_id in ids[start : start + PAGE_SIZE]
+                ]
+                html = listing_page(items, f"{source} {snapshot} {page}")
+                (directory / f"page{page}.html").write_text(html, encoding="utf-8")
+            print(f"{directory}: {page} стр.")
+
+
+def make_handler(snapshot: str):
+    article_html = translation()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if re.search(r"/articles/\d+/$", path):
+            return httpx.Response(200, text=article_html)
+        match = re.fullmatch(r"/ru/(.+?)/(?:page(\d+)/)?", path)
+        if match:
+            page = source_dir(snapshot, match.group(1)) / f"page{match.group(2) or 1}.html"
+            if page.exists():
+                return httpx.Response(200, text=page.read_text(encoding="utf-8"))
+        return httpx.Response(404)
+
+    return handler
+
+
+def expected_urls(snapshot: str, only_ids: set[int] | None = None) -> set[str]:
+    urls = set()
+    for source in SOURCES:
+        for page in sorted(source_dir(snapshot, source).glob("page*.html")):
+            for item in parse_listing(page.read_text(encoding="utf-8"), BASE_URL, "bs4"):
+                if only_ids is None or item.article_id in only_ids:
+                    urls.add(item.url)
+    return urls
+
+
+async def crawl(snapshot: str, state: MemoryCrawlState, max_pages: int) -> set[str]:
+    client = HTTPXClient(transport=httpx.MockTransport(make_handler(snapshot)))
+    sink = MemorySink()
+    parser = HabrParser(client=client)
+    crawler = HubCrawler(
+        parser=parser,
+        state=state,
+        sink=sink,
+        sources=list(SOURCES),
+        base_url=BASE_URL,
+        max_pages=max_pages,
+        queue_size=8,
+        workers=4,
+    )
+    try:
+        await crawler.run_once()
+    finally:
+        await client.close()
+    print(f"{snapshot}: {crawler.stats()}")
+    return {article["url"] for article in sink.articles}
+
+
+async def replay(max_pages: int) -> int:
+    state = MemoryCrawlState()
+    failures = 0
+    first = await crawl("before", state, max_pages)
+    if first != expected_urls("before"):
+        failures += 1
+        print(f"before: ожидалось {len(expected_urls('before'))}, найдено {len(first)}")
+    new_ids = {article_id for ids in NEW_IDS.values() for article_id in ids}
+    second = await crawl("after", state, max_pages)
+    if second != expected_urls("after", new_ids):
+        failures += 1
+        print(f"after: найдено {sorted(second)}, ожидались только новые {sorted(new_ids)}")
+    print("ok" if not failures else "найдены расхождения")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--max-pages", type=int, default=5)
+    arg_parser.add_argument("--regenerate", action="store_true")
+    args = arg_parser.parse_args()
+    if args.regenerate:
+        regenerate()
+        return 0
+    logger.remove()
+    return asyncio.run(replay(args.max_pages))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
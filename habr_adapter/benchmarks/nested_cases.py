@@ -0,0 +1,146 @@
+"""
+Проверка обхода вложенных структур статьи на всех движках разбора
+
+Для каждого случая сверяет вывод iter_blocks, render_list, render_code
+и render_quote с ожидаемым markdown: отступы вложенных ul/ol, абзацы
+в цитатах, код внутри пунктов списка и отсутствие повторов текста
+вложенных блоков. При любом расхождении код выхода 1.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.nested_cases
+"""
+
+import argparse
+import re
+import sys
+
+from app.article_parser.engines import ENGINES, HtmlNode, get_engine
+from app.article_parser.parser import (
+    iter_blocks,
+    render_code,
+    render_list,
+    render_quote,
+)
+
+# Случай: фрагмент содержимого статьи, функция и ожидаемый результат
+CASES = {
+    "nested_lists": (
+        "<ul><li>alpha<ul><li>beta<ol><li>gamma</li><li>delta</li></ol></li>"
+        "</ul></li><li>epsilon</li></ul>",
+        "blocks",
+        ["  * alpha\n    * beta\n      1. gamma\n      2. delta\n  * epsilon"],
+    ),
+    "list_in_list_without_item": (
+        "<ol><li>one</li><ul><li>inner</li></ul><li>two</li></ol>",
+        "list",
+        ["  1. one", "    * inner", "  2. two"],
+    ),
+    "quote_paragraphs": (
+        "<blockquote><p>first</p><p>second <b>bold</b></p>tail <i>text</i>"
+        "</blockquote>",
+        "quote",
+        "> first\n>\n> secondbold\n>\n> tailtext",
+    ),
+    "list_in_quote": (
+        "<blockquote><p>intro</p><ul><li>point</li></ul></blockquote>",
+        "blocks",
+        ["> intro\n>\n>   * point"],
+    ),
+    "code_language": (
+        '<pre><code class="hljs language-python">a = 1\nb = 2</code></pre>',
+        "code",
+        "```python\na = 1\nb = 2\n```",
+    ),
+    "code_in_list": (
+        '<ol><li>step<pre><code class="language-bash">make\nmake test</code>'
+        "</pre></li><li>next</li></ol>",
+        "blocks",
+        [
+            "  1. step\n     ```bash\n     make\n     make test\n     ```\n"
+            "  2. next"
+        ],
+    ),
+    "no_duplicates": (
+        "<div><p>para<span>span</span></p><div><ul><li><p>item</p></li></ul>"
+        "</div><blockquote><p>quoted</p><ol><li>qitem</li></ol></blockquote>"
+        "<div><div><h2>head</h2><figure><img src='/i.png'><figcaption>cap"
+        "</figcaption></figure></div></div></div>",
+        "blocks",
+        [
+            "paraspan",
+            "  * item",
+            "> quoted\n>\n>   1. qitem",
+            "## head",
+            "![cap](/i.png)",
+        ],
+    ),
+}
+
+WORD_RE = re.compile(r"[a-z]+")
+
+
+def content_root(engine_name: str, fragment: str) -> HtmlNode:
+    html = (
+        "<html><body><div class='article-formatted-body'>"
+        f"{fragment}</div></body></html>"
+    )
+    root = get_engine(engine_name).parse_document(html)
+    return root.find("div", class_="article-formatted-body")
+
+
+def first_tag(container: HtmlNode) -> HtmlNode:
+    return next(child for child in container.children() if not isinstance(child, str))
+
+
+def render(kind: str, container: HtmlNode):
+    if kind == "blocks":
+        return list(iter_blocks(container))
+    if kind == "list":
+        return render_list(first_tag(container))
+    if kind == "code":
+        return render_code(first_tag(container))
+    if kind == "quote":
+        return render_quote(first_tag(container))
+    raise ValueError(kind)
+
+
+def duplicated_words(fragment: str, output) -> list[str]:
+    """Слова из текста фрагмента, которые в выводе встречаются больше одного раза"""
+    text = "\n".join(output) if isinstance(output, list) else output
+    source = re.sub(r"<[^>]*>", " ", fragment)
+    return sorted(
+        word
+        for word in set(WORD_RE.findall(source))
+        if text.count(word) > source.count(word)
+    )
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES)
+    )
+    args = arg_parser.parse_args()
+
+    failures = 0
+    for engine_name in args.engines:
+        for name, (fragment, kind, expected) in CASES.items():
+            output = render(kind, content_root(engine_name, fragment))
+            problems = []
+            if output != expected:
+                problems.append(f"ожидалось {expected!r}, получено {output!r}")
+            duplicates = duplicated_words(fragment, output)
+            if duplicates:
+                problems.append(f"повторы текста: {', '.join(duplicates)}")
+            status = "ok" if not problems else "FAIL"
+            print(f"{engine_name:<12}{name:<28}{status}")
+            for problem in problems:
+                print(f"  {problem}")
+            failures += bool(problems)
+
+    print(f"Случаев: {len(CASES) * len(args.engines)}, ошибок: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Обход контента статьи на синтетических страницах с глубокой вложенностью
+
+Сравнивает прежний алгоритм (find_all по блочным тегам + get_text на каждом
+совпадении) с однопроходным iter_blocks: время разбора и объем текста.
+Прежний алгоритм посещает вложенные узлы многократно и дублирует их текст.
+Корректность вывода на вложенных структурах проверяет benchmarks.nested_cases.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.nested_walker --depth 6 --breadth 4 --engine lxml
+"""
+
+import argparse
+import sys
+import time
+
+from app.article_parser.engines import ENGINES, HtmlNode, get_engine
+from app.article_parser.parser import iter_blocks, render_code, render_figure
+from benchmarks.synthetic import synthetic_page
+
+LEGACY_TAGS = [
+    "p",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "pre",
+    "ul",
+    "ol",
+    "figure",
+    "blockquote",
+]
+
+
+def legacy_blocks(container: HtmlNode) -> list[str]:
+    """Цикл из HabrParser.parse до перехода на iter_blocks"""
+    blocks = []
+    for tag in container.find_all(LEGACY_TAGS):
+        if tag.name.startswith("h"):
+            blocks.append(f"{'#' * int(tag.name[1])} {tag.get_text(strip=True)}")
+        elif tag.name == "p":
+            blocks.append(tag.get_text(strip=True))
+        elif tag.name == "pre":
+            blocks.append(render_code(tag))
+        elif tag.name in ("ul", "ol"):
+            blocks.append(
+                "\n".join(
+                    f"  {f'{i}.' if tag.name == 'ol' else '*'} {li.get_text(strip=True)}"
+                    for i, li in enumerate(tag.find_all("li"), 1)
+                )
+            )
+        elif tag.name == "figure":
+            blocks.append(render_figure(tag))
+        elif tag.name == "blockquote":
+            blocks.append(f"> {tag.get_text(strip=True)}")
+    return blocks
+
+
+def measure(func, rounds: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        size = sum(len(block) for block in func())
+    return (time.perf_counter() - started) / rounds, size
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--depth", type=int, default=5)
+    arg_parser.add_argument("--breadth", type=int, default=4)
+    arg_parser.add_argument("--div-depth", type=int, default=200)
+    arg_parser.add_argument("--rounds", type=int, default=5)
+    arg_parser.add_argument("--engine", default="bs4", choices=list(ENGINES))
+    args = arg_parser.parse_args()
+
+    html = synthetic_page(args.depth, args.breadth, args.div_depth)
+    engine = get_engine(args.engine)
+    root = engine.parse_document(html)
+    container = root.find("div", class_="article-formatted-body")
+
+    legacy_time, legacy_size = measure(lambda: legacy_blocks(container), args.rounds)
+    walker_time, walker_size = measure(lambda: iter_blocks(container), args.rounds)
+
+    print(f"Страница: {len(html)} символов, движок {args.engine}")
+    print(f"{'алгоритм':<12}{'время, мс':>12}{'текст, симв.':>16}")
+    print(f"{'find_all':<12}{legacy_time * 1000:>12.2f}{legacy_size:>16}")
+    print(f"{'iter_blocks':<12}{walker_time * 1000:>12.2f}{walker_size:>16}")
+    print(f"ускорение: x{legacy_time / walker_time:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
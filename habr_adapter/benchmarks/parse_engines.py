@@ -0,0 +1,168 @@
+"""
+Сравнение движков разбора HTML на сохраненных страницах Habr
+
+Проверяет, что lxml и selectolax дают побайтно тот же результат, что и
+эталонный BeautifulSoup, и печатает статей/сек и пиковый RSS по движкам.
+Каждый движок меряется в отдельном процессе, чтобы RSS не смешивался.
+С --check замеров нет: только паритет на корпусе и синтетических страницах
+с глубокой вложенностью. При любом расхождении, ошибке разбора или падении
+дочернего процесса код выхода 1.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.parse_engines --corpus benchmarks/corpus --rounds 5
+    python -m benchmarks.parse_engines --check
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import queue as queue_module
+import resource
+import sys
+import time
+from pathlib import Path
+
+from app.article_parser.engines import ENGINES, get_engine
+from app.article_parser.parser import HabrParser, parse_html
+from benchmarks.synthetic import synthetic_page
+from loguru import logger
+
+REFERENCE_ENGINE = "bs4"
+
+
+def load_corpus(corpus_dir: Path) -> dict[str, str]:
+    return {
+        path.relative_to(corpus_dir).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(corpus_dir.glob("**/*.html"))
+    }
+
+
+def check_parity(pages: dict[str, str], engines: list[str]) -> int:
+    """Число страниц, на которых движок разошелся с эталоном или упал"""
+    mismatches = 0
+    for name, html in pages.items():
+        reference = parse_html(html, name, REFERENCE_ENGINE)
+        for engine_name in engines:
+            try:
+                result = parse_html(html, name, engine_name)
+            except Exception as e:
+                print(f"  {engine_name}: ошибка разбора {name}: {e!r}")
+                mismatches += 1
+                continue
+            if result != reference:
+                print(f"  {engine_name}: расхождение с {REFERENCE_ENGINE}: {name}")
+                mismatches += 1
+    return mismatches
+
+
+async def parse_pages(parser: HabrParser, pages: dict[str, str]) -> dict[str, dict]:
+    return {name: await parser.parse(html, name) for name, html in pages.items()}
+
+
+async def bench_engine(engine_name: str, pages: dict[str, str], rounds: int):
+    parser = HabrParser(engine=get_engine(engine_name))
+    try:
+        results = await parse_pages(parser, pages)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await parse_pages(parser, pages)
+        return results, time.perf_counter() - started
+    finally:
+        await parser.aclose()
+
+
+def run_engine(engine_name: str, pages: dict[str, str], rounds: int, queue):
+    """Выполняется в дочернем процессе: меряет скорость и пиковый RSS"""
+    logger.remove()
+    results, elapsed = asyncio.run(bench_engine(engine_name, pages, rounds))
+    # ru_maxrss в Linux — килобайты, в macOS — байты
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    queue.put(
+        {
+            "engine": engine_name,
+            "results": results,
+            "articles_per_sec": rounds * len(pages) / elapsed,
+            "peak_rss_mb": peak_rss / 1024,
+        }
+    )
+
+
+def measure(engine_name: str, pages: dict[str, str], rounds: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(
+        target=run_engine, args=(engine_name, pages, rounds, queue)
+    )
+    process.start()
+    while True:
+        try:
+            report = queue.get(timeout=1.0)
+            break
+        except queue_module.Empty:
+            if not process.is_alive():
+                raise SystemExit(
+                    f"Замер {engine_name} упал с кодом {process.exitcode}"
+                )
+    process.join()
+    return report
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--corpus", type=Path, default=Path(__file__).parent / "corpus"
+    )
+    arg_parser.add_argument("--rounds", type=int, default=5)
+    arg_parser.add_argument(
+        "--check", action="store_true", help="только паритет, без замеров"
+    )
+    arg_parser.add_argument(
+        "--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES)
+    )
+    args = arg_parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    engines = [REFERENCE_ENGINE] + [
+        name for name in args.engines if name != REFERENCE_ENGINE
+    ]
+
+    if args.check:
+        pages["synthetic/nested"] = synthetic_page(6, 4, 200)
+        logger.remove()
+        mismatches = check_parity(pages, engines[1:])
+        print(
+            f"Страниц: {len(pages)}, движков: {len(engines) - 1}, "
+            f"расхождений: {mismatches}"
+        )
+        return 1 if mismatches else 0
+
+    if not pages:
+        raise SystemExit(f"В {args.corpus} нет сохраненных страниц (*.html)")
+    reports = {name: measure(name, pages, args.rounds) for name in engines}
+    reference = reports[REFERENCE_ENGINE]["results"]
+
+    mismatches = 0
+    print(f"Страниц в корпусе: {len(pages)}, повторов: {args.rounds}")
+    print(f"{'движок':<12}{'статей/сек':>12}{'пик RSS, МБ':>14}{'паритет':>10}")
+    for name, report in reports.items():
+        diff = [
+            page
+            for page, result in report["results"].items()
+            if result != reference[page]
+        ]
+        mismatches += len(diff)
+        print(
+            f"{name:<12}{report['articles_per_sec']:>12.1f}"
+            f"{report['peak_rss_mb']:>14.1f}"
+            f"{'ok' if not diff else len(diff):>10}"
+        )
+        for page in diff:
+            print(f"  расхождение с {REFERENCE_ENGINE}: {page}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Регрессионный замер разбора статей: корпус Habr и синтетические страницы
+
+Для каждой страницы печатает p50/p99 задержки разбора, пик памяти по
+tracemalloc и общую скорость в статьях/сек. Результат разбора страниц
+корпуса сверяется с эталоном из manifest.json, а замеры — с сохраненной
+базой: если p50, пик памяти или статей/сек хуже базы больше чем на порог,
+скрипт завершается с кодом 1. Базу стоит снимать на той же машине.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.parse_suite --save-baseline      # снять базу
+    python -m benchmarks.parse_suite --threshold 0.15     # сравнить с ней
+    python -m benchmarks.parse_suite --update-golden      # принять новый вывод
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.article_parser.engines import ENGINES, get_engine
+from app.article_parser.parser import parse_html
+from benchmarks.synthetic import huge_page, sha256, synthetic_page
+from loguru import logger
+
+BENCH_DIR = Path(__file__).parent
+MANIFEST = "manifest.json"
+
+
+def load_corpus(corpus_dir: Path) -> dict[str, str]:
+    """Страницы корпуса по относительному пути, например v1/longread.html"""
+    return {
+        path.relative_to(corpus_dir).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(corpus_dir.glob("**/*.html"))
+    }
+
+
+def synthetic_pages(huge_mb: list[int], div_depth: int) -> dict[str, str]:
+    pages = {
+        f"synthetic/huge_{mb}mb": huge_page(mb * 1024 * 1024) for mb in huge_mb
+    }
+    pages[f"synthetic/deep_{div_depth}"] = synthetic_page(6, 4, div_depth)
+    return pages
+
+
+def output_hash(result: dict) -> str:
+    return sha256(json.dumps(result, ensure_ascii=False, sort_keys=True))
+
+
+def check_golden(corpus_dir: Path, pages: dict[str, str], engine, update: bool) -> int:
+    """Сверяет вывод парсера с manifest.json каждой версии корпуса"""
+    mismatches = 0
+    manifests: dict[Path, dict] = {}
+    for name, html in pages.items():
+        path = corpus_dir / name
+        manifest_path = path.parent / MANIFEST
+        if manifest_path not in manifests:
+            manifests[manifest_path] = (
+                json.loads(manifest_path.read_text(encoding="utf-8"))
+                if manifest_path.exists()
+                else {"pages": {}}
+            )
+        entries = manifests[manifest_path]["pages"]
+        actual = {
+            "sha256": sha256(html),
+            "output_sha256": output_hash(parse_html(html, path.stem, engine)),
+        }
+        if update:
+            entries[path.name] = actual
+            continue
+        expected = entries.get(path.name)
+        if expected != actual:
+            mismatches += 1
+            reason = "нет в эталоне" if expected is None else (
+                "страница изменилась"
+                if expected["sha256"] != actual["sha256"]
+                else "изменился результат разбора"
+            )
+            print(f"  эталон не совпал: {name} ({reason})")
+
+    if update:
+        for manifest_path, manifest in manifests.items():
+            manifest_path.write_text(
+                json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+                + "\n",
+                encoding="utf-8",
+            )
+            print(f"Эталон обновлен: {manifest_path}")
+    return mismatches
+
+
+def measure_page(html: str, engine, rounds: int) -> dict:
+    parse_html(html, "bench", engine)  # прогрев
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        parse_html(html, "bench", engine)
+        timings.append(time.perf_counter() - started)
+
+    # Память меряется отдельным проходом: tracemalloc замедляет разбор
+    tracemalloc.start()
+    parse_html(html, "bench", engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    percentiles = (
+        statistics.quantiles(timings, n=100, method="inclusive")
+        if len(timings) > 1
+        else timings * 99
+    )
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "total_s": sum(timings),
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float, mem_threshold: float) -> list[str]:
+    regressions = []
+    for name, current in report["pages"].items():
+        base = baseline["pages"].get(name)
+        if base is None:
+            continue
+        if current["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p50 {base['p50_ms']:.2f} -> {current['p50_ms']:.2f} мс"
+            )
+        if current["peak_kb"] > base["peak_kb"] * (1 + mem_threshold):
+            regressions.append(
+                f"{name}: пик памяти {base['peak_kb']:.0f} -> {current['peak_kb']:.0f} КБ"
+            )
+    if report["articles_per_sec"] < baseline["articles_per_sec"] / (1 + threshold):
+        regressions.append(
+            f"статей/сек {baseline['articles_per_sec']:.1f} -> "
+            f"{report['articles_per_sec']:.1f}"
+        )
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--corpus", type=Path, default=BENCH_DIR / "corpus")
+    arg_parser.add_argument("--engine", default="bs4", choices=list(ENGINES))
+    arg_parser.add_argument("--rounds", type=int, default=20)
+    arg_parser.add_argument("--huge-mb", type=int, nargs="*", default=[2, 8])
+    arg_parser.add_argument("--div-depth", type=int, default=500)
+    arg_parser.add_argument(
+        "--baseline", type=Path, default=BENCH_DIR / "results" / "baseline.json"
+    )
+    arg_parser.add_argument("--save-baseline", action="store_true")
+    arg_parser.add_argument("--update-golden", action="store_true")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="допустимое замедление"
+    )
+    arg_parser.add_argument(
+        "--mem-threshold", type=float, default=0.1, help="допустимый рост памяти"
+    )
+    args = arg_parser.parse_args()
+    logger.remove()
+
+    engine = get_engine(args.engine)
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        raise SystemExit(f"В {args.corpus} нет сохраненных страниц (*.html)")
+
+    # Эталон снимается движком bs4: остальные обязаны с ним совпадать
+    mismatches = check_golden(
+        args.corpus, corpus, get_engine("bs4"), args.update_golden
+    )
+    if args.update_golden:
+        return 0
+
+    pages = {**corpus, **synthetic_pages(args.huge_mb, args.div_depth)}
+    report = {"engine": args.engine, "rounds": args.rounds, "pages": {}}
+    print(f"Движок {args.engine}, повторов: {args.rounds}")
+    print(f"{'страница':<28}{'КБ':>8}{'p50, мс':>10}{'p99, мс':>10}{'пик, КБ':>10}")
+    for name, html in pages.items():
+        stats = measure_page(html, engine, args.rounds)
+        report["pages"][name] = stats
+        print(
+            f"{name:<28}{len(html.encode('utf-8')) / 1024:>8.0f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['peak_kb']:>10.0f}"
+        )
+    corpus_time = sum(report["pages"][name]["total_s"] for name in corpus)
+    report["articles_per_sec"] = len(corpus) * args.rounds / corpus_time
+    print(f"Корпус: {report['articles_per_sec']:.1f} статей/сек")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"База сохранена: {args.baseline}")
+        return 1 if mismatches else 0
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("engine") != args.engine:
+            raise SystemExit(
+                f"База снята движком {baseline.get('engine')}, а не {args.engine}"
+            )
+        regressions = compare(report, baseline, args.threshold, args.mem_threshold)
+        for line in regressions:
+            print(f"  регрессия: {line}")
+        if not regressions:
+            print(f"Регрессий относительно {args.baseline} нет")
+    else:
+        print(f"База {args.baseline} не найдена, сравнение пропущено")
+
+    return 1 if mismatches or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
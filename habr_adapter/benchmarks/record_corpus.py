@@ -0,0 +1,54 @@
+"""
+Сохраняет живые страницы Habr в корпус для parse_suite и parse_engines
+
+Страница пишется как есть, без ранней остановки чтения, в файл по id статьи.
+После записи нужно принять эталон: python -m benchmarks.parse_suite --update-golden
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.record_corpus --out benchmarks/corpus/v2 https://habr.com/ru/articles/123456/
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+from app.article_parser.parser import HabrParser
+from app.article_parser.streaming import PageReader
+from config import settings
+
+
+def page_name(url: str) -> str:
+    ids = re.findall(r"\d+", url)
+    return f"{ids[-1] if ids else re.sub(r'[^a-z0-9]+', '_', url.lower())}.html"
+
+
+async def record(urls: list[str], out: Path) -> None:
+    parser = HabrParser(
+        reader=PageReader(max_bytes=settings.FETCH_MAX_BODY_BYTES, early_stop=False)
+    )
+    try:
+        for url in urls:
+            html = await parser.fetch(url)
+            path = out / page_name(url)
+            path.write_text(html, encoding="utf-8")
+            print(f"{url} -> {path} ({len(html)} символов)")
+    finally:
+        await parser.aclose()
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("urls", nargs="+")
+    arg_parser.add_argument(
+        "--out", type=Path, default=Path(__file__).parent / "corpus" / "v2"
+    )
+    args = arg_parser.parse_args()
+    args.out.mkdir(parents=True, exist_ok=True)
+    asyncio.run(record(args.urls, args.out))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
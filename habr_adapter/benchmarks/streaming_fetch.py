@@ -0,0 +1,125 @@
+"""
+Сравнение полной загрузки страницы и чтения с ранней остановкой
+
+Страницы корпуса отдаются через httpx.MockTransport кусками с заданной
+пропускной способностью, поэтому замер не зависит от сети и от habr.com.
+Печатает скачанные и сэкономленные байты и задержку загрузки с разбором.
+
+Запуск из каталога habr_adapter:
+    python -m benchmarks.streaming_fetch --corpus benchmarks/corpus --bandwidth-kbps 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from app.article_parser.engines import ENGINES, get_engine
+from app.article_parser.parser import DEFAULT_HEADERS, HabrParser
+from app.article_parser.streaming import PageReader
+from app.core.http_client import HTTPXClient
+from loguru import logger
+
+CHUNK_SIZE = 16 * 1024
+
+
+def make_transport(pages: dict[str, bytes], bandwidth_kbps: int) -> httpx.MockTransport:
+    delay = CHUNK_SIZE / (bandwidth_kbps * 1024) if bandwidth_kbps else 0
+
+    async def body(data: bytes):
+        for offset in range(0, len(data), CHUNK_SIZE):
+            if delay:
+                await asyncio.sleep(delay)
+            yield data[offset : offset + CHUNK_SIZE]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        data = pages[request.url.path.lstrip("/")]
+        return httpx.Response(
+            200,
+            headers={
+                "Content-Type": "text/html; charset=utf-8",
+                "Content-Length": str(len(data)),
+            },
+            content=body(data),
+        )
+
+    return httpx.MockTransport(handler)
+
+
+async def run(
+    pages: dict[str, bytes], early_stop: bool, engine: str, bandwidth_kbps: int
+) -> dict:
+    reader = PageReader(max_bytes=sys.maxsize, early_stop=early_stop)
+    client = HTTPXClient(
+        headers=DEFAULT_HEADERS,
+        transport=make_transport(pages, bandwidth_kbps),
+    )
+    parser = HabrParser(client=client, engine=get_engine(engine), reader=reader)
+    latencies = []
+    results = {}
+    try:
+        for name in pages:
+            started = time.perf_counter()
+            results[name] = await parser.get_article(f"http://corpus/{name}")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await client.close()
+    return {"latencies": latencies, "results": results, **reader.stats()}
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--corpus", type=Path, default=Path(__file__).parent / "corpus"
+    )
+    arg_parser.add_argument("--engine", default="bs4", choices=list(ENGINES))
+    arg_parser.add_argument(
+        "--bandwidth-kbps",
+        type=int,
+        default=0,
+        help="Скорость отдачи страниц, 0 — без ограничения",
+    )
+    args = arg_parser.parse_args()
+    logger.remove()
+
+    pages = {
+        path.name: path.read_bytes()
+        for path in sorted(args.corpus.glob("**/*.html"))
+    }
+    if not pages:
+        raise SystemExit(f"В {args.corpus} нет сохраненных страниц (*.html)")
+
+    reports = {
+        mode: asyncio.run(
+            run(pages, mode == "early-stop", args.engine, args.bandwidth_kbps)
+        )
+        for mode in ("full", "early-stop")
+    }
+
+    total = sum(len(data) for data in pages.values())
+    print(f"Страниц: {len(pages)}, всего {total} байт, движок {args.engine}")
+    print(
+        f"{'режим':<12}{'скачано, Б':>14}{'сэкономлено, Б':>17}"
+        f"{'p50, мс':>10}{'среднее, мс':>14}"
+    )
+    for mode, report in reports.items():
+        latencies = report["latencies"]
+        print(
+            f"{mode:<12}{report['bytes_downloaded']:>14}{report['bytes_skipped']:>17}"
+            f"{statistics.median(latencies) * 1000:>10.2f}"
+            f"{statistics.mean(latencies) * 1000:>14.2f}"
+        )
+
+    # Ранняя остановка не должна менять результат разбора
+    full, early = reports["full"]["results"], reports["early-stop"]["results"]
+    diff = [name for name in pages if not full[name] or full[name] != early[name]]
+    for name in diff:
+        print(f"  расхождение с полной загрузкой: {name}")
+    return 1 if diff else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
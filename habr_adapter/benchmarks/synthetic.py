@@ -0,0 +1,313 @@
+"""
+Генератор страниц в разметке Habr для корпуса и нагрузочных замеров
+
+Раскладки повторяют типичные статьи: много кода, много картинок, лонгрид,
+перевод и блог компании. Все страницы детерминированы (фиксированный seed),
+поэтому корпус можно пересобрать побайтно. Отдельно есть многомегабайтные
+и глубоко вложенные страницы, которые в корпус не сохраняются.
+
+Пересобрать корпус из каталога habr_adapter:
+    python -m benchmarks.synthetic --out benchmarks/corpus/v1
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+from html import escape
+from pathlib import Path
+from typing import Callable
+
+WORDS = (
+    "данные запрос сервер клиент очередь кэш индекс таблица поток процесс "
+    "память задержка пропускная способность нагрузка реплика шард ключ "
+    "значение ответ ошибка повтор лимит пул соединение транзакция схема "
+    "миграция сервис контейнер оркестратор метрика трассировка журнал "
+    "парсер дерево узел документ разметка стиль скрипт браузер движок"
+).split()
+
+LANGUAGES = ["python", "go", "sql", "bash", "javascript", "rust", ""]
+
+
+def sentence(rnd: random.Random, words: int = 12) -> str:
+    text = " ".join(rnd.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rnd: random.Random, sentences: int = 4) -> str:
+    body = " ".join(sentence(rnd, rnd.randint(6, 18)) for _ in range(sentences))
+    # Строчная разметка внутри абзаца, как в редакторе Habr
+    word = rnd.choice(WORDS)
+    return f"<p>{escape(body)} <strong>{word}</strong> <a href=\"/ru/hubs/{word}/\">{word}</a></p>"
+
+
+def code_block(rnd: random.Random, lines: int = 20) -> str:
+    lang = rnd.choice(LANGUAGES)
+    code = "\n".join(
+        f"{'    ' * rnd.randint(0, 3)}{rnd.choice(WORDS)}_{i} = {rnd.choice(WORDS)}({i}) < {i * 2}"
+        for i in range(lines)
+    )
+    cls = f' class="{lang}"' if lang else ""
+    lang_cls = f"language-{lang}" if lang else ""
+    return f'<pre{cls}><code class="{lang_cls}">{escape(code)}</code></pre>'
+
+
+def figure(rnd: random.Random, index: int) -> str:
+    caption = f"<figcaption>{escape(sentence(rnd, 5))}</figcaption>" if index % 2 else ""
+    src = f"https://habrastorage.org/r/w1560/getpro/habr/upload_files/{index:03d}/{rnd.getrandbits(64):016x}.png"
+    return (
+        f'<figure class="full-width"><img src="{src}" alt="image" '
+        f'width="1200" height="800" data-src="{src}"/>{caption}</figure>'
+    )
+
+
+def bullet_list(rnd: random.Random, items: int = 5, ordered: bool = False) -> str:
+    tag = "ol" if ordered else "ul"
+    body = "".join(f"<li><p>{escape(sentence(rnd, 6))}</p></li>" for _ in range(items))
+    return f"<{tag}>{body}</{tag}>"
+
+
+def quote(rnd: random.Random) -> str:
+    return f"<blockquote><p>{escape(sentence(rnd, 20))}</p></blockquote>"
+
+
+def heading(rnd: random.Random, level: int = 2) -> str:
+    return f"<h{level}>{escape(sentence(rnd, 4))}</h{level}>"
+
+
+def page(
+    title: str,
+    body: str,
+    author: str = "habrauser",
+    header_extra: str = "",
+    comments: int = 30,
+) -> str:
+    """Страница целиком: шапка, статья, комментарии и скрипты, как на habr.com"""
+    rnd = random.Random(title)
+    comment_items = "".join(
+        '<article class="tm-comment-thread__comment"><div class="tm-comment__body-content">'
+        f"<p>{escape(sentence(rnd, 15))}</p></div></article>"
+        for _ in range(comments)
+    )
+    return (
+        '<!DOCTYPE html><html lang="ru"><head><meta charset="UTF-8">'
+        f"<title>{escape(title)} / Хабр</title>"
+        '<script>window.__INITIAL_STATE__={"articlesList":{"articlesList":{}}};'
+        'var tpl = "<article class=\\"tm-article-presenter__content\\">";</script>'
+        '</head><body><div id="app"><header class="tm-header"><nav>'
+        + "".join(f'<a href="/ru/flows/{w}/">{w}</a>' for w in WORDS[:12])
+        + "</nav></header><main><div class=\"tm-article-presenter\">"
+        '<article class="tm-article-presenter__content tm-article-presenter__content_narrow">'
+        '<div class="tm-article-presenter__header"><div class="tm-article-snippet__meta">'
+        f'<span class="tm-user-info"><a class="tm-user-info__username" href="/ru/users/{author}/">{author}</a></span>'
+        '<span class="tm-article-datetime-published">'
+        '<time datetime="2024-03-14T09:30:00.000Z" title="2024-03-14, 12:30">14 мар 2024 в 12:30</time>'
+        "</span></div>"
+        f'<h1 class="tm-title tm-title_h1"><span>{escape(title)}</span></h1>'
+        f"{header_extra}</div>"
+        '<div id="post-content-body"><div><div class="article-formatted-body '
+        'article-formatted-body article-formatted-body_version-2">'
+        f"<div>{body}</div></div></div></div>"
+        "</article></div>"
+        f'<section class="tm-article-comments">{comment_items}</section>'
+        "</main></div>"
+        '<script src="https://assets.habr.com/habr-web/js/app.js"></script>'
+        "</body></html>"
+    )
+
+
+def code_heavy(seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    parts = []
+    for i in range(40):
+        parts.append(heading(rnd) if i % 8 == 0 else paragraph(rnd, 2))
+        parts.append(code_block(rnd, rnd.randint(10, 60)))
+    return page("Разбираем асинхронный парсер по шагам", "".join(parts))
+
+
+def image_heavy(seed: int = 2) -> str:
+    rnd = random.Random(seed)
+    parts = []
+    for i in range(60):
+        parts.append(figure(rnd, i))
+        if i % 3 == 0:
+            parts.append(paragraph(rnd, 1))
+    return page("Как мы рисовали схемы инфраструктуры", "".join(parts))
+
+
+def longread(seed: int = 3) -> str:
+    rnd = random.Random(seed)
+    parts = []
+    for section in range(25):
+        parts.append(heading(rnd, 2 + section % 3))
+        parts.extend(paragraph(rnd, rnd.randint(3, 7)) for _ in range(8))
+        parts.append(bullet_list(rnd, rnd.randint(3, 8), ordered=section % 2 == 0))
+        if section % 4 == 0:
+            parts.append(quote(rnd))
+            parts.append(code_block(rnd, 8))
+            parts.append(figure(rnd, section))
+    return page("История одной миграции: полгода в продакшене", "".join(parts))
+
+
+def translation(seed: int = 4) -> str:
+    rnd = random.Random(seed)
+    header = (
+        '<div class="tm-article-presenter__origin">'
+        '<span class="tm-article-presenter__origin-label">Перевод</span> '
+        '<a class="tm-article-presenter__origin-link" '
+        'href="https://example.com/original-post">Автор оригинала: John Doe</a></div>'
+    )
+    parts = []
+    for i in range(30):
+        parts.append(paragraph(rnd, 4))
+        if i % 5 == 0:
+            parts.append(heading(rnd, 3))
+            parts.append(quote(rnd))
+    # Примечание переводчика в конце
+    parts.append(f"<p><em>Прим. пер.: {escape(sentence(rnd, 10))}</em></p>")
+    return page(
+        "Перевод: что на самом деле делает сборщик мусора",
+        "".join(parts),
+        author="translator",
+        header_extra=header,
+    )
+
+
+def corporate_blog(seed: int = 5) -> str:
+    rnd = random.Random(seed)
+    header = (
+        '<div class="tm-article-snippet__hubs">'
+        '<a class="tm-article-snippet__hubs-item-link" href="/ru/companies/acme/articles/">'
+        "Блог компании ACME</a></div>"
+    )
+    parts = []
+    for i in range(20):
+        parts.append(paragraph(rnd, 3))
+        if i % 4 == 0:
+            parts.append(figure(rnd, i))
+        if i % 6 == 0:
+            parts.append(bullet_list(rnd, 4))
+    parts.append(
+        '<div class="tm-article-body__cta"><p>Приходите к нам работать: '
+        '<a href="https://career.example.com">career.example.com</a></p></div>'
+    )
+    return page(
+        "Как ACME ускорила поиск в три раза",
+        "".join(parts),
+        author="acme_team",
+        header_extra=header,
+    )
+
+
+# Раскладки корпуса: имя файла -> генератор
+LAYOUTS: dict[str, Callable[[], str]] = {
+    "code_heavy": code_heavy,
+    "image_heavy": image_heavy,
+    "longread": longread,
+    "translation": translation,
+    "corporate_blog": corporate_blog,
+}
+
+
+def nested_list(depth: int, breadth: int) -> str:
+    if depth == 0:
+        return ""
+    items = "".join(
+        f"<li><p>пункт {depth}.{i}</p>{nested_list(depth - 1, breadth)}</li>"
+        for i in range(breadth)
+    )
+    return f"<ul>{items}</ul>"
+
+
+def nested_quote(depth: int) -> str:
+    if depth == 0:
+        return "<p>дно цитаты</p>"
+    return f"<blockquote><p>уровень {depth}</p>{nested_quote(depth - 1)}</blockquote>"
+
+
+def nested_divs(depth: int) -> str:
+    return "<div>" * depth + "<p>глубокий абзац</p>" + "</div>" * depth
+
+
+def synthetic_page(depth: int, breadth: int, div_depth: int) -> str:
+    """Глубокая вложенность: списки, цитаты и div'ы"""
+    body = nested_list(depth, breadth) + nested_quote(depth * 4) + nested_divs(div_depth)
+    return (
+        '<html><body><article class="tm-article-presenter__content">'
+        '<div id="post-content-body"><div class="article-formatted-body">'
+        f"{body}</div></div></article></body></html>"
+    )
+
+
+def huge_page(target_bytes: int, seed: int = 6) -> str:
+    """Лонгрид примерно заданного размера в байтах (UTF-8)"""
+    rnd = random.Random(seed)
+    parts: list[str] = []
+    size = 0
+    while size < target_bytes:
+        block = heading(rnd) + paragraph(rnd, 6) + code_block(rnd, 30) + bullet_list(rnd, 6)
+        parts.append(block)
+        size += len(block.encode("utf-8"))
+    return page("Очень длинная статья", "".join(parts), comments=0)
+
+
+def listing_page(items: list[tuple[int, str | None]], title: str) -> str:
+    """
+    Страница ленты или хаба: карточки статей (id, компания или None),
+    между ними рекламный блок без ссылки на статью
+    """
+    rnd = random.Random(title)
+    cards = []
+    for index, (article_id, company) in enumerate(items):
+        path = (
+            f"/ru/companies/{company}/articles/{article_id}/"
+            if company
+            else f"/ru/articles/{article_id}/"
+        )
+        cards.append(
+            f'<article id="{article_id}" data-navigatable="" tabindex="0" '
+            'class="tm-articles-list__item"><div class="tm-article-snippet">'
+            '<div class="tm-article-snippet__meta-container">'
+            f'<a class="tm-user-info__username" href="/ru/users/u{article_id}/">u{article_id}</a>'
+            '<time datetime="2024-03-14T09:30:00.000Z">14 мар 2024</time></div>'
+            '<h2 class="tm-title tm-title_h2">'
+            f'<a href="{path}" data-article-link="" class="tm-title__link">'
+            f"<span>{escape(sentence(rnd, 5))}</span></a></h2>"
+            f'<div class="article-formatted-body"><p>{escape(sentence(rnd, 20))}</p></div>'
+            "</div></article>"
+        )
+        if index == 3:
+            cards.append(
+                '<article class="tm-articles-list__item tm-articles-list__item_promo">'
+                '<a href="https://example.com/promo">Реклама</a></article>'
+            )
+    return (
+        f'<!DOCTYPE html><html lang="ru"><head><title>{escape(title)} / Хабр</title>'
+        '</head><body><div id="app"><main><div class="tm-articles-list">'
+        f"{''.join(cards)}</div></main></div></body></html>"
+    )
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--out", type=Path, default=Path(__file__).parent / "corpus" / "v1"
+    )
+    args = arg_parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for name, build in LAYOUTS.items():
+        html = build()
+        (args.out / f"{name}.html").write_text(html, encoding="utf-8")
+        print(f"{name}.html: {len(html.encode('utf-8'))} байт, sha256 {sha256(html)[:12]}")
+    print("Обновите эталон: python -m benchmarks.parse_suite --update-golden")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
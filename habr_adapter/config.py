@@ -21,8 +21,109 @@ class Settings(BaseSettings):
     PROXY_URL: str | None = None
     DEV_MODE: bool = False
 
+    # HTTP-клиент к Habr
+    HTTP2_ENABLED: bool = False
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_READ_TIMEOUT: float = 60.0
+    HTTP_WRITE_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 10.0
+
+    # Движок разбора HTML: bs4 (эталон), lxml или selectolax
+    PARSE_ENGINE: str = "bs4"
+
+    # Пул парсинга: process или thread (для lxml, который отпускает GIL)
+    PARSE_EXECUTOR: str = "process"
+    PARSE_WORKERS: int | None = None
+    PARSE_MAX_CONCURRENCY: int | None = None
+    PARSE_TIMEOUT: float = 30.0
+
+    # Склейка одновременных запросов одной статьи и кэш результатов
+    COALESCE_RESULT_TTL: float = 60.0
+    COALESCE_MAX_ENTRIES: int = 1024
+
+    # Пакетный парсинг: сколько URL одного запроса обрабатываются одновременно
+    BATCH_CONCURRENCY: int = 16
+    BATCH_MAX_URLS: int = 10_000
+
+    # Загрузка страниц: лимит размера тела после распаковки и остановка чтения
+    # после блока статьи. По HTTP/1.1 брошенный ответ закрывает соединение,
+    # так что early stop выгоднее всего вместе с HTTP2_ENABLED. С ARCHIVE_ENABLED
+    # early stop выключается: архиву для перепарсинга нужна страница целиком
+    FETCH_MAX_BODY_BYTES: int = 10 * 1024 * 1024
+    FETCH_EARLY_STOP: bool = False
+
+    # Кэш страниц для условных GET: disk, redis или пусто (выключен)
+    FETCH_CACHE_BACKEND: str | None = None
+    FETCH_CACHE_DIR: str = "cache/pages"
+    FETCH_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    FETCH_CACHE_ZSTD_LEVEL: int = 3
+
+    # Архив сырых страниц для офлайн-перепарсинга (app.page_archive.reparse)
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_DIR: str = "archive/pages"
+    ARCHIVE_SEGMENT_BYTES: int = 256 * 1024 * 1024
+    ARCHIVE_ZSTD_LEVEL: int = 3
+
+    # Вежливость к Habr: token bucket на хост (memory, redis или пусто),
+    # повторы 429/5xx с экспоненциальной задержкой и предохранитель
+    RATE_LIMIT_BACKEND: str | None = "memory"
+    RATE_LIMIT_RPS: float = 5.0
+    RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_MAX_WAIT: float = 60.0
+    FETCH_RETRIES: int = 3
+    FETCH_BACKOFF_BASE: float = 0.5
+    FETCH_BACKOFF_MAX: float = 30.0
+    FETCH_RETRY_AFTER_MAX: float = 300.0
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_TIMEOUT: float = 30.0
+
+    # Обходчик лент и хабов: источники — пути относительно CRAWLER_BASE_URL,
+    # например "articles" (все статьи) или "hubs/python/articles"
+    CRAWLER_ENABLED: bool = False
+    CRAWLER_BASE_URL: str = "https://habr.com/ru/"
+    CRAWLER_SOURCES: list[str] = ["articles"]
+    CRAWLER_INTERVAL: float = 600.0
+    CRAWLER_MAX_PAGES: int = 5
+    CRAWLER_QUEUE_SIZE: int = 100
+    CRAWLER_WORKERS: int = 4
+    # Результат суммаризации живет в Redis LLM-сервиса час — столько же
+    # имеет смысл помнить и поставленную обходчиком задачу
+    CRAWLER_PREWARM_TTL: int = 3600
+
+    # RabbitMQ (очередь суммаризации)
+    RABBITMQ_USER: str = "user"
+    RABBITMQ_PASSWORD: str = "password"
+    RABBITMQ_HOST: str = "rabbitmq"
+    RABBITMQ_PORT: int = 5672
+    ARTICLE_QUEUE_NAME: str = "article_queue"
+    # Сколько обходчик ждет подтверждения публикации от брокера
+    RABBITMQ_CONFIRM_TIMEOUT: float = 10.0
+
+    # Redis
+    REDIS_HOST: str = "redis"
+    REDIS_PORT: int = 6379
+
+    # Запись и воспроизведение HTTP-обменов (app.core.cassette): record, replay
+    # или пусто. Задержка при воспроизведении: recorded, none, fixed:0.05,
+    # uniform:a,b, normal:mean,std, lognormal:median,sigma
+    HTTP_CASSETTE_MODE: str | None = None
+    HTTP_CASSETTE_PATH: str = "cassettes/habr_adapter.jsonl"
+    HTTP_CASSETTE_LATENCY: str = "recorded"
+    HTTP_CASSETTE_SEED: int | None = None
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
+    @property
+    def RABBITMQ_URL(self) -> str:
+        return f"amqp://{self.RABBITMQ_USER}:{self.RABBITMQ_PASSWORD}@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/"
+
+    @property
+    def REDIS_URL(self) -> str:
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
+
     @property
     def CONSOLE_LOG_LEVEL(self):
         return ELogLevel.DEBUG if self.DEV_MODE else ELogLevel.WARNING
@@ -1,11 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from app.article_parser.api import parser_from_state
 from app.article_parser.api import router as habr_router
+from app.article_parser.coalescer import RequestCoalescer
+from app.article_parser.parser import create_http_client
+from app.article_parser.streaming import PageReader
+from app.core.executor import ParseExecutor
 from app.core.logging_config import setup_logging
+from app.crawler import HubCrawler, PipelineSink, RedisCrawlState
+from app.diagnostics.api import router as diagnostics_router
+from app.fetch_cache import create_fetch_cache
+from app.page_archive import create_page_archive
+from app.rate_limit import FetchGuard, create_rate_limiter
+from config import settings
 from fastapi import FastAPI
 
 setup_logging()
-app = FastAPI(title="Habr Adapter")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = create_http_client()
+    app.state.parse_executor = ParseExecutor.from_settings()
+    await app.state.parse_executor.warm_up()
+    app.state.fetch_cache = create_fetch_cache()
+    app.state.page_reader = PageReader.from_settings()
+    app.state.coalescer = RequestCoalescer.from_settings()
+    app.state.rate_limiter = create_rate_limiter()
+    app.state.fetch_guard = FetchGuard.from_settings(app.state.rate_limiter)
+    app.state.page_archive = create_page_archive()
+    app.state.crawler = None
+    if settings.CRAWLER_ENABLED:
+        app.state.crawler = HubCrawler.from_settings(
+            parser=parser_from_state(app.state),
+            state=RedisCrawlState(settings.REDIS_URL),
+            sink=PipelineSink.from_settings(),
+        )
+        crawler_task = asyncio.create_task(app.state.crawler.run_forever())
+    yield
+    if app.state.crawler:
+        crawler_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await crawler_task
+        await app.state.crawler.sink.close()
+        await app.state.crawler.state.close()
+    if app.state.page_archive:
+        await app.state.page_archive.close()
+    if app.state.rate_limiter:
+        await app.state.rate_limiter.close()
+    if app.state.fetch_cache:
+        await app.state.fetch_cache.close()
+    app.state.parse_executor.shutdown()
+    await app.state.http_client.close()
+
+
+app = FastAPI(title="Habr Adapter", lifespan=lifespan)
 
 app.include_router(habr_router)
+app.include_router(diagnostics_router)
 
 
 @app.get("/health")
@@ -15,4 +68,4 @@ async def health():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=7000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=7000)
@@ -0,0 +1,217 @@
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from config import settings
+from loguru import logger
+
+# Секреты не должны попадать в кассету
+_SECRET_PARAMS = {"key", "api_key", "apikey", "token", "access_token"}
+_DROP_RESPONSE_HEADERS = {"set-cookie"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """В кассете нет ответа на такой запрос"""
+
+
+def _scrub_url(url: httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in _SECRET_PARAMS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query), fragment=""))
+
+
+def parse_latency(spec: str, seed: int | None = None) -> Callable[[float], float]:
+    """
+    Задержка ответа при воспроизведении по записанной:
+    recorded — как при записи, none — без задержки, fixed:0.05,
+    uniform:0.01,0.2, normal:среднее,отклонение, lognormal:медиана,sigma
+    """
+    rnd = random.Random(seed)
+    name, _, raw_args = spec.partition(":")
+    args = [float(arg) for arg in raw_args.split(",")] if raw_args else []
+    if name == "recorded":
+        return lambda recorded: recorded
+    if name == "none":
+        return lambda recorded: 0.0
+    if name == "fixed":
+        return lambda recorded: args[0]
+    if name == "uniform":
+        return lambda recorded: rnd.uniform(args[0], args[1])
+    if name == "normal":
+        return lambda recorded: max(rnd.gauss(args[0], args[1]), 0.0)
+    if name == "lognormal":
+        return lambda recorded: rnd.lognormvariate(math.log(args[0]), args[1])
+    raise ValueError(f"Неизвестное распределение задержки: {spec}")
+
+
+class Cassette:
+    """
+    Файл с парами запрос-ответ, по JSON-строке на обмен
+    Ответ ищется по методу, URL и хэшу тела запроса, а если такого нет —
+    по методу и URL. Повторные запросы получают записанные ответы по кругу,
+    так что короткая запись выдерживает длинный нагрузочный прогон
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._exact: dict[tuple, list[dict]] = {}
+        self._by_url: dict[tuple, list[dict]] = {}
+        self._cursors: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._exact.values())
+
+    def find(self, method: str, url: str, body_hash: str) -> dict | None:
+        for key, index in (
+            ((method, url, body_hash), self._exact),
+            ((method, url), self._by_url),
+        ):
+            entries = index.get(key)
+            if entries:
+                with self._lock:
+                    cursor = self._cursors.get(key, 0)
+                    self._cursors[key] = cursor + 1
+                return entries[cursor % len(entries)]
+        return None
+
+    async def append(self, entry: dict) -> None:
+        """Дописывает обмен в файл в потоке, не блокируя event loop"""
+        await asyncio.to_thread(self._write, entry)
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(line)
+            self._index(entry)
+
+    def _index(self, entry: dict) -> None:
+        method, url = entry["method"], entry["url"]
+        self._exact.setdefault((method, url, entry["body_sha256"]), []).append(entry)
+        self._by_url.setdefault((method, url), []).append(entry)
+
+
+# Кассета одна на файл: клиенты процесса пишут в нее через общий индекс и замок
+_cassettes: dict[Path, Cassette] = {}
+
+
+def get_cassette(path: str | Path) -> Cassette:
+    path = Path(path).resolve()
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path)
+    return _cassettes[path]
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Транспорт для HTTPXClient: в режиме record пропускает запросы в сеть
+    и пишет обмены в кассету, в режиме replay отвечает из кассеты без сети
+    с записанной или заданной задержкой
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str,
+        inner: httpx.AsyncBaseTransport | None = None,
+        latency: str = "recorded",
+        seed: int | None = None,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Для записи нужен транспорт, который ходит в сеть")
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self._latency = parse_latency(latency, seed)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        method = request.method
+        url = _scrub_url(request.url)
+        body_hash = hashlib.sha256(body).hexdigest()
+        if self.mode == "replay":
+            return await self._replay(method, url, body_hash)
+
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            # Тело пишется как пришло по сети, до распаковки gzip/br
+            raw = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _DROP_RESPONSE_HEADERS
+        ]
+        await self.cassette.append(
+            {
+                "method": method,
+                "url": url,
+                "body_sha256": body_hash,
+                "status": response.status_code,
+                "headers": headers,
+                "body_b64": base64.b64encode(raw).decode(),
+                "latency": time.perf_counter() - started,
+            }
+        )
+        return httpx.Response(
+            response.status_code, headers=headers, stream=httpx.ByteStream(raw)
+        )
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+
+    async def _replay(self, method: str, url: str, body_hash: str) -> httpx.Response:
+        entry = self.cassette.find(method, url, body_hash)
+        if entry is None:
+            raise CassetteMissError(f"Нет записи для {method} {url} в {self.cassette.path}")
+        delay = self._latency(entry["latency"])
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            stream=httpx.ByteStream(base64.b64decode(entry["body_b64"])),
+        )
+
+
+def cassette_transport(
+    inner: httpx.AsyncBaseTransport,
+) -> httpx.AsyncBaseTransport:
+    """Оборачивает транспорт кассетой, если она включена в настройках"""
+    mode = settings.HTTP_CASSETTE_MODE
+    if not mode:
+        return inner
+    cassette = get_cassette(settings.HTTP_CASSETTE_PATH)
+    logger.debug(f"HTTP-кассета {cassette.path}: режим {mode}, записей {len(cassette)}")
+    return CassetteTransport(
+        cassette,
+        mode=mode,
+        inner=inner,
+        latency=settings.HTTP_CASSETTE_LATENCY,
+        seed=settings.HTTP_CASSETTE_SEED,
+    )
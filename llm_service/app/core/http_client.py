@@ -1,6 +1,7 @@
 from typing import Any
 
 import httpx
+from app.core.cassette import cassette_transport
 from config import settings
 
 
@@ -11,12 +12,13 @@ class HTTPXClient:
         proxy: str | None = None,
         timeout: int = 60,
         base_url: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
-        if proxy:
-            transport = httpx.AsyncHTTPTransport(proxy=proxy)
-            self._client = httpx.AsyncClient(timeout=timeout, transport=transport)
-        else:
-            self._client = httpx.AsyncClient(timeout=timeout)
+        # Кассета (HTTP_CASSETTE_MODE) пишет или подменяет ответы сети
+        transport = cassette_transport(
+            transport or httpx.AsyncHTTPTransport(proxy=proxy)
+        )
+        self._client = httpx.AsyncClient(timeout=timeout, transport=transport)
         self._headers = headers or {}
         self._proxy = proxy
         self._base_url = base_url
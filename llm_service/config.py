@@ -38,6 +38,16 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
 
     ARTICLE_QUEUE_NAME: str = "article_queue"
+    # Канал Redis pub/sub, куда публикуется каждый переход статуса задачи
+    TASK_STATUS_CHANNEL: str = "habr:task_status"
+
+    # Запись и воспроизведение HTTP-обменов (app.core.cassette): record, replay
+    # или пусто. Задержка при воспроизведении: recorded, none, fixed:0.05,
+    # uniform:a,b, normal:mean,std, lognormal:median,sigma
+    HTTP_CASSETTE_MODE: str | None = None
+    HTTP_CASSETTE_PATH: str = "cassettes/llm_service.jsonl"
+    HTTP_CASSETTE_LATENCY: str = "recorded"
+    HTTP_CASSETTE_SEED: int | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
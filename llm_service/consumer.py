@@ -13,6 +13,19 @@ from redis import asyncio as aioredis
 redis = aioredis.from_url(f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}")
 
 
+async def set_status(task_id: str, status: dict) -> None:
+    """
+    Сохраняет статус задачи и оповещает о переходе подписчиков BFF
+    Запись и публикация уходят в Redis одним запросом
+    """
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(task_id, json.dumps(status), ex=3600)
+        pipe.publish(
+            settings.TASK_STATUS_CHANNEL, json.dumps({"task_id": task_id, **status})
+        )
+        await pipe.execute()
+
+
 async def process_message(message: AbstractIncomingMessage):
     try:
         body = message.body.decode()
@@ -21,24 +34,16 @@ async def process_message(message: AbstractIncomingMessage):
         title = data.get("title", "")
         text = data.get("text", "")
 
-        await redis.set(
-            task_id,
-            json.dumps({"status": "in_progress"}),
-            ex=3600,
-        )
-
         if not task_id:
             logger.warning("В сообщении отсутствует task_id, пропускаем")
             await message.ack()
             return
 
+        await set_status(task_id, {"status": "in_progress"})
+
         if not text:
             logger.warning("Пустой текст в сообщении, помечаем задачу как failed")
-            await redis.set(
-                task_id,
-                json.dumps({"status": "failed", "reason": "empty_text"}),
-                ex=3600,
-            )
+            await set_status(task_id, {"status": "failed", "reason": "empty_text"})
             await message.ack()
             return
 
@@ -62,11 +67,7 @@ async def process_message(message: AbstractIncomingMessage):
 
         if resp is None:
             logger.error("GeminiService вернул None")
-            await redis.set(
-                task_id,
-                json.dumps({"status": "failed", "reason": "llm_none"}),
-                ex=3600,
-            )
+            await set_status(task_id, {"status": "failed", "reason": "llm_none"})
             await message.ack()
             return
 
@@ -81,20 +82,16 @@ async def process_message(message: AbstractIncomingMessage):
             structured = json.loads(raw_json)
             summary = SHabrArticleSummary.model_validate(structured)
 
-            await redis.set(
-                task_id,
-                json.dumps({"status": "done", "summary": summary.model_dump()}),
-                ex=3600,
+            await set_status(
+                task_id, {"status": "done", "summary": summary.model_dump()}
             )
             logger.info(
                 "Обработана статья (task_id={}): {}", task_id, summary.title
             )
         except Exception as e:
             logger.error("Ошибка парсинга ответа LLM: {}", e)
-            await redis.set(
-                task_id,
-                json.dumps({"status": "failed", "reason": f"parse_error: {e}"}),
-                ex=3600,
+            await set_status(
+                task_id, {"status": "failed", "reason": f"parse_error: {e}"}
             )
 
         await message.ack()